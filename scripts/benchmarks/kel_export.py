@@ -0,0 +1,63 @@
+# -*- encoding: utf-8 -*-
+"""
+KERIA
+KEL export benchmark for the JSON and raw CESR response formats
+
+Builds a KEL of an inception and a number of interaction events in a temporary Habery and streams
+it the way GET /events does in each response format, reporting bytes and events per second.
+
+    python scripts/benchmarks/kel_export.py --events 5000 --rounds 5
+"""
+
+import argparse
+import time
+
+from keri.app import habbing
+
+from keria.app.agenting import KeyEventCollectionEnd
+
+parser = argparse.ArgumentParser(
+    description="Bytes per second of the KEL export response formats"
+)
+parser.add_argument(
+    "--events", type=int, default=5000, help="number of interaction events in the KEL"
+)
+parser.add_argument(
+    "--rounds", type=int, default=5, help="number of exports timed per format"
+)
+
+
+def measure(db, preb, kind, rounds):
+    size = count = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for chunk in KeyEventCollectionEnd.stream(db, preb, kind=kind):
+            size += len(chunk)
+            count += 1
+    elapsed = time.perf_counter() - start
+    return dict(bytes=size // rounds, chunks=count // rounds, elapsed=elapsed / rounds)
+
+
+def main():
+    args = parser.parse_args()
+    with habbing.openHab(name="bench", salt=b"0123456789abcdef", temp=True) as (
+        hby,
+        hab,
+    ):
+        for _ in range(args.events):
+            hab.interact()
+
+        events = args.events + 1
+        print(f"KEL of {events} events")
+        preb = hab.pre.encode("utf-8")
+        for kind in ("json", "ndjson", "cesr"):
+            result = measure(hby.db, preb, kind, args.rounds)
+            print(
+                f"{kind:>7}: {result['bytes'] / result['elapsed'] / 1e6:8.2f} MB/s"
+                f"  {events / result['elapsed']:10.0f} events/s"
+                f"  {result['bytes']:>10} bytes in {result['chunks']} chunks"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+# -*- encoding: utf-8 -*-
+"""
+KERIA
+Noisy neighbour benchmark for the Agency fair scheduler
+
+Runs an Agency and its admin HTTP server in one Doist loop, like `keria start`, with a number of
+quiet agents doing their usual background work, one noisy agent whose escrow, like a huge escrow
+that never drains, takes far longer than a tick and one agent whose controller sends signed admin
+requests from a client thread.  Reports the latency percentiles of the admin requests with the
+scheduler off and on.
+
+    python scripts/benchmarks/noisy_neighbor.py --tenants 20 --noisy-cost 0.1 --tick-budget 0.02
+"""
+
+import argparse
+import http.client
+import statistics
+import threading
+import time
+
+from hio.base import doing
+from hio.core import http as hiohttp
+from hio.help import Hict
+from keri.app import habbing
+from keri.core import eventing, parsing, signing
+from keri.end import ending
+from keri.help import helping
+
+from keria.app import agenting
+from keria.core import authing
+
+parser = argparse.ArgumentParser(
+    description="Admin request latency under a noisy neighbour agent"
+)
+parser.add_argument("--tenants", type=int, default=20, help="number of quiet agents")
+parser.add_argument(
+    "--noisy-cost",
+    type=float,
+    default=0.1,
+    help="seconds of work per run of the noisy agent's escrow",
+)
+parser.add_argument(
+    "--tick-budget",
+    type=float,
+    default=0.02,
+    help="scheduler time budget in seconds of a tick",
+)
+parser.add_argument(
+    "--requests", type=int, default=200, help="number of admin requests to measure"
+)
+parser.add_argument(
+    "--port", type=int, default=5741, help="port the admin server listens on in turn"
+)
+
+
+def spin(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def signed(controller, method, path):
+    """Returns the headers of a request signed by the controller the way Signify does"""
+    headers = Hict(
+        [
+            ("Signify-Resource", controller.pre),
+            ("Signify-Timestamp", helping.nowIso8601()),
+        ]
+    )
+    header, qsig = ending.siginput(
+        "signify",
+        method,
+        path,
+        headers,
+        fields=authing.SignedHeaderAuthenticator.DefaultFields,
+        hab=controller,
+        alg="ed25519",
+        keyid=controller.pre,
+    )
+    headers.extend(header)
+    signage = ending.Signage(
+        markers=dict(signify=qsig),
+        indexed=False,
+        signer=None,
+        ordinal=None,
+        digest=None,
+        kind=None,
+    )
+    headers.extend(ending.signature([signage]))
+    return dict(headers)
+
+
+def client(controller, port, count, latencies):
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    for _ in range(count):
+        headers = signed(controller, "GET", "/identifiers")
+        start = time.perf_counter()
+        conn.request("GET", "/identifiers", headers=headers)
+        rep = conn.getresponse()
+        rep.read()
+        latencies.append(time.perf_counter() - start)
+        if rep.status != 200:
+            raise RuntimeError(f"admin request failed with {rep.status}")
+        if rep.getheader("connection", "").lower() == "close":
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port)
+    conn.close()
+
+
+def measure(args, controller, port, tickBudget=0.0):
+    agency = agenting.Agency(name="noisy", bran=None, temp=True, tickBudget=tickBudget)
+    config = agenting.KERIAServerConfig(adminPort=port, cors=False)
+    server = hiohttp.Server(port=port, app=agenting.createAdminApp(config, agency))
+    if not server.reopen():
+        raise RuntimeError(f"cannot create admin HTTP server on port {port}")
+
+    doist = doing.Doist(
+        limit=0.0,
+        tock=0.0,
+        real=True,
+        doers=[agency, hiohttp.ServerDoer(server=server)],
+    )
+    doist.enter()
+    try:
+        for _ in range(args.tenants):
+            agency.create(caid=signing.Signer(transferable=True).verfer.qb64)
+
+        noisy = agency.create(caid=signing.Signer(transferable=True).verfer.qb64)
+        noisy.escrower.escrows.append(
+            agenting.Escrow("noisy", lambda: spin(args.noisy_cost))
+        )
+
+        admin = agency.create(caid=controller.pre)
+        icp = controller.makeOwnInception()
+        parsing.Parser().parse(
+            ims=bytearray(icp),
+            kvy=eventing.Kevery(db=admin.agentHab.db, lax=True, local=False),
+        )
+
+        latencies = []
+        thread = threading.Thread(
+            target=client,
+            args=(controller, port, args.requests, latencies),
+            daemon=True,
+        )
+        thread.start()
+        while thread.is_alive():
+            doist.recur()
+    finally:
+        doist.exit()
+        agency.keystores.close()
+        agency.offloader.close()
+        agency.waker.close()
+
+    if len(latencies) < args.requests:
+        raise RuntimeError("admin client failed before completing its requests")
+
+    latencies.sort()
+    return dict(
+        p50=statistics.median(latencies),
+        p99=latencies[int(len(latencies) * 0.99) - 1],
+    )
+
+
+def main():
+    args = parser.parse_args()
+    print(
+        f"{args.tenants} quiet agents, 1 noisy agent with a {args.noisy_cost * 1000:.1f}ms escrow, "
+        f"{args.requests} signed admin requests"
+    )
+
+    with habbing.openHab(name="controller", salt=b"0123456789abcdef", temp=True) as (
+        _,
+        controller,
+    ):
+        off = measure(args, controller, args.port)
+        on = measure(args, controller, args.port + 1, tickBudget=args.tick_budget)
+
+    for name, result in (("scheduler off", off), ("scheduler on", on)):
+        print(
+            f"{name:>14}: p50 {result['p50'] * 1000:8.2f}ms  p99 {result['p99'] * 1000:8.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
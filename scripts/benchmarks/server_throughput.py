@@ -0,0 +1,148 @@
+# -*- encoding: utf-8 -*-
+"""
+KERIA
+HTTP server benchmark for the hio and asyncio server modes
+
+Serves the same falcon app from the hio HTTP server driven by a Doist, like `keria start`, and from
+the asyncio server of `keria start --server asyncio`, then drives each with concurrent keep-alive
+clients and reports requests per second and latency percentiles.
+
+    python scripts/benchmarks/server_throughput.py --clients 16 --requests 500
+"""
+
+import argparse
+import asyncio
+import http.client
+import statistics
+import threading
+import time
+
+import falcon
+from hio.base import doing
+from hio.core import http as hiohttp
+
+from keria.core import asgiing
+
+parser = argparse.ArgumentParser(
+    description="Requests per second and latency of the KERIA HTTP server modes"
+)
+parser.add_argument(
+    "--clients", type=int, default=16, help="number of concurrent keep-alive clients"
+)
+parser.add_argument(
+    "--requests", type=int, default=500, help="number of requests per client"
+)
+parser.add_argument(
+    "--size", type=int, default=1024, help="size in bytes of each response body"
+)
+parser.add_argument(
+    "--port", type=int, default=5731, help="port the servers listen on in turn"
+)
+
+
+class Payload:
+    def __init__(self, size):
+        self.body = b"x" * size
+
+    def on_get(self, req, rep):
+        rep.content_type = "application/octet-stream"
+        rep.data = self.body
+
+
+def application(size):
+    app = falcon.App()
+    app.add_route("/payload", Payload(size))
+    return app
+
+
+def runHio(app, port, stop):
+    server = hiohttp.Server(port=port, app=app)
+    server.reopen()
+    doist = doing.Doist(limit=0.0, tock=0.03125, real=True)
+    doist.doers = [hiohttp.ServerDoer(server=server)]
+    doist.enter()
+    try:
+        while not stop.is_set():
+            doist.recur()
+            time.sleep(doist.tock)
+    finally:
+        doist.exit()
+
+
+def runAsyncio(app, port, stop):
+    async def serve():
+        server = asgiing.AsgiServer(
+            app=asgiing.WsgiAsgi(app), host="127.0.0.1", port=port
+        )
+        await server.start()
+        while not stop.is_set():
+            await asyncio.sleep(0.05)
+        await server.close()
+
+    asyncio.run(serve())
+
+
+def client(port, count, latencies):
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    for _ in range(count):
+        start = time.perf_counter()
+        conn.request("GET", "/payload")
+        rep = conn.getresponse()
+        rep.read()
+        latencies.append(time.perf_counter() - start)
+        if rep.getheader("connection", "").lower() == "close":
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port)
+    conn.close()
+
+
+def measure(args, run, port):
+    stop = threading.Event()
+    server = threading.Thread(
+        target=run, args=(application(args.size), port, stop), daemon=True
+    )
+    server.start()
+    time.sleep(0.5)
+
+    latencies = []
+    clients = [
+        threading.Thread(target=client, args=(port, args.requests, latencies))
+        for _ in range(args.clients)
+    ]
+    start = time.perf_counter()
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    server.join(timeout=5.0)
+
+    latencies.sort()
+    return dict(
+        rps=len(latencies) / elapsed,
+        p50=statistics.median(latencies),
+        p99=latencies[int(len(latencies) * 0.99) - 1],
+    )
+
+
+def main():
+    args = parser.parse_args()
+    print(
+        f"{args.clients} keep-alive clients, {args.requests} requests each, {args.size} byte bodies"
+    )
+
+    results = (
+        ("hio", measure(args, runHio, args.port)),
+        ("asyncio", measure(args, runAsyncio, args.port + 1)),
+    )
+    for name, result in results:
+        print(
+            f"{name:>8}: {result['rps']:9.1f} req/s  p50 {result['p50'] * 1000:8.2f}ms"
+            f"  p99 {result['p99'] * 1000:8.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
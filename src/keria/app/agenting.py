@@ -5,11 +5,15 @@ keria.app.agenting module
 
 """
 
+import asyncio
+import itertools
 import logging
 import os
 from base64 import b64decode
 import json
-import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, dataclass, field
 from typing import List, Union
 from urllib.parse import urlparse, urljoin
@@ -60,13 +64,23 @@ from keri.app import challenging
 from keria.utils.openapi import dataclassFromFielddom
 
 from . import aiding, notifying, indirecting, credentialing, ipexing, delegating
+from . import batching
 from . import grouping as keriagrouping
-from .serving import GracefulShutdownDoer
+from .serving import GracefulShutdownDoer, IdleDoist, Waker, WakingDeck
 from .. import log_name, ogler, set_log_level
-from ..core.httping import falconApp, createHttpServer
+from ..core.httping import falconApp, createHttpServer, etag, kelParts, notModified
 from ..peer import exchanging as keriaexchanging
 from .specing import AgentSpecResource
-from ..core import authing, longrunning, httping
+from ..core import (
+    asgiing,
+    authing,
+    caching,
+    longrunning,
+    httping,
+    offloading,
+    pooling,
+    scheduling,
+)
 from ..core.authing import SignedHeaderAuthenticator
 from ..core.keeping import RemoteManager
 from ..db import basing
@@ -104,6 +118,8 @@ class KERIAServerConfig:
     # WARNING: This port needs to be secured.
     # Default is 3903. KERIA_BOOT_PORT also sets this.
     bootPort: int = 3903
+    # Interface the HTTP servers listen on. Default is all interfaces.
+    host: str = ""
 
     # Agency master controller information and configuration
     # Name of controller. Default is 'keria'.
@@ -139,6 +155,34 @@ class KERIAServerConfig:
     cors: bool = True
     # Timeout for releasing agents. Default is 86400 seconds (24 hours)
     releaseTimeout: int = 86400
+    # Maximum number of resident agents, least recently used agents are evicted beyond it. Default is 0 (unbounded)
+    maxAgents: int = 0
+    # Approximate memory budget in bytes for resident agents, least recently used agents are evicted beyond it. Default is 0 (unbounded)
+    maxAgentMemory: int = 0
+    # Keep the KERIA owned stores of all agents in one shared agency database instead of one database each. Default is False
+    consolidated: bool = False
+    # Number of Agency worker processes each owning a consistent hash shard of agents behind a front router. Default is 1 (no sharding)
+    workers: int = 1
+    # Time budget in seconds per loop tick shared fairly between agents' background work. Default is 0.0 (unbounded)
+    tickBudget: float = 0.0
+    # Number of threads provisioning agents for boot requests sent with Prefer: respond-async. Default is 4, 0 boots synchronously
+    bootWorkers: int = 4
+    # Number of pre-created agent keystores kept ready in the background to speed up boot. Default is 0 (no pool)
+    keystorePool: int = 0
+    # Number of threads running heavy read-only admin requests off the HTTP server loop. Default is 4, 0 runs them inline
+    readWorkers: int = 4
+    # HTTP server running the apps, "hio" or "asyncio" serving them from an asyncio event loop with keep-alive. Default is "hio"
+    server: str = "hio"
+    # Seconds idle keep-alive connections stay open in the asyncio server mode. Default is 75.0
+    keepAlive: float = 75.0
+    # Smallest response body in bytes compressed with gzip, or zstd when installed, for clients accepting it. Default is 1024, 0 disables compression
+    compressMinSize: int = 1024
+    # Seconds done long running operations are kept before they are garbage collected. Default is 604800 (7 days), 0 keeps them until deleted
+    operationTtl: int = 604800
+    # Seconds long running operations may stay pending before they fail with a time out. Default is 0, never
+    operationPendingTtl: int = 0
+    # Longest wait in seconds of the run loop when no agent has work, it wakes on requests and queued work. Default is 1.0, 0 cycles every tock
+    idleWait: float = 1.0
     # Controller Service Endpoint Location OOBI URLs to resolve at startup of each Agent. Makes a 'controller' EndRole and LocScheme in the database for each URL
     curls: List[str] = field(default_factory=list)
     # General Introduction OOBI URLs to resolve at startup of each Agent. For things like witnesses, watchers, mailboxes, and TEL observers.
@@ -185,16 +229,40 @@ def runAgency(config: KERIAServerConfig, temp=False):
         else None
     )
     agency = createAgency(config, temp=temp, cf=cf)
-    doist = agencyDoist(setupDoers(agency, config))
+    if config.server == "asyncio":
+        servers = setupServers(agency, config)
+        doist = agencyDoist([agency])
+        logger.info("The Agency is loaded and waiting for requests...")
+        asyncio.run(asgiing.serve(doist, servers, waker=agency.waker))
+        return
+
+    doist = agencyDoist(setupDoers(agency, config), idle=config.idleWait)
     logger.info("The Agency is loaded and waiting for requests...")
     doist.do()
 
 
-def agencyDoist(doers: List[Doer]):
-    """Creates a Doist for the Agency doers and adds a graceful shutdown handler. Useful for testing."""
+def agencyDoist(doers: List[Doer], idle=0.0):
+    """
+    Creates a Doist for the Agency doers and adds a graceful shutdown handler. Useful for testing.
+
+    With idle > 0 the Doist waits on the sockets of the HTTP servers and the agency waker instead of
+    cycling every tock when there is no work, waiting at most idle seconds, see serving.IdleDoist.
+    """
     tock = 0.03125
-    doist = doing.Doist(limit=0.0, tock=tock, real=True)
-    doers.append(GracefulShutdownDoer(agency=getAgency(doers)))
+    agency = getAgency(doers)
+    if idle and agency is not None:
+        servers = [doer.server for doer in doers if isinstance(doer, http.ServerDoer)]
+        doist = IdleDoist(
+            waker=agency.waker,
+            servers=servers,
+            idle=idle,
+            limit=0.0,
+            tock=tock,
+            real=True,
+        )
+    else:
+        doist = doing.Doist(limit=0.0, tock=tock, real=True)
+    doers.append(GracefulShutdownDoer(agency=agency))
     doist.doers = doers
     return doist
 
@@ -207,6 +275,30 @@ def getAgency(doers):
     return None
 
 
+def stretch(bran, temp=False):
+    """
+    Stretch the agency passcode into the seed and AID encrypting agent keystores the same way Habery
+    does for a bran so the costly stretch happens once per agency rather than once per agent.
+
+    Parameters:
+        bran (str | None): 21 character passcode of the agency
+        temp (bool): True means use the quick stretch for testing
+
+    Returns:
+        tuple: (seed, aeid) qb64 or (None, None) when there is no passcode
+    """
+    if not bran:
+        return None, None
+
+    if len(bran) < 21:
+        raise ValueError("Bran (passcode seed material) too short.")
+
+    signer = Salter(qb64=coring.MtrDex.Salt_128 + "A" + bran[:21]).signer(
+        transferable=False, temp=temp
+    )
+    return signer.qb64, signer.verfer.qb64
+
+
 class Agency(doing.DoDoer):
     """
     An Agency manages a collection of agents by using a set of subtasks to handle
@@ -229,6 +321,15 @@ class Agency(doing.DoDoer):
         iurls=None,
         durls=None,
         cf=None,
+        maxAgents=0,
+        maxAgentMemory=0,
+        consolidated=False,
+        tickBudget=0.0,
+        bootWorkers=0,
+        keystorePool=0,
+        readWorkers=0,
+        operationTtl=0,
+        operationPendingTtl=0,
     ):
         """
         Initialize the Agency with the given parameters.
@@ -237,7 +338,7 @@ class Agency(doing.DoDoer):
             name (str): Name of the agency.
             bran (str | None): Passcode for the agency's keystore.
             base (str): Base directory for the agency's keystore.
-            releaseTimeout (int | None): Timeout for releasing agents.
+            releaseTimeout (int | None): Timeout in seconds for releasing idle agents, None means 86400.
             configFile (str | None): Configuration file name for the agency.
             configDir (str | None): Directory for configuration files.
             adb (AgencyBaser | None): Optional AgencyBaser instance for database access.
@@ -246,12 +347,33 @@ class Agency(doing.DoDoer):
             iurls (list | None): General Introduction OOBI URLs to resolve at startup of each Agent.
             durls (list | None): Data OOBI URLs resolved at startup of each Agent.
             cf (configing.Configer | None): Optional Configer instance for configuration data.
+            maxAgents (int): Maximum number of resident agents, 0 means unbounded.
+            maxAgentMemory (int): Approximate memory budget in bytes for resident agents, 0 means unbounded.
+            consolidated (bool): True means keep the KERIA owned stores of all agents in one shared
+                agency database, see basing.AgencyStore.
+            tickBudget (float): Time budget in seconds per loop tick shared fairly between agents by the
+                FairScheduler, 0.0 means unbounded and runs every agent every tick.
+            bootWorkers (int): Number of threads provisioning agents for asynchronous boot requests,
+                0 means provision every agent synchronously on the main loop.
+            keystorePool (int): Number of pre-created agent keystores kept ready for boot requests,
+                0 disables the warm pool.
+            readWorkers (int): Number of threads running heavy read-only admin requests off the HTTP
+                server loop, 0 means run them inline.  Per route limits come from the "readLimits"
+                object of the configuration file.
+            operationTtl (int): Seconds done long running operations of each agent are kept before
+                they are garbage collected, 0 means keep them until the client deletes them.
+            operationPendingTtl (int): Seconds long running operations of each agent may stay pending
+                before they fail with a time out, 0 means they stay pending until done.
         """
         self.name = name
         self.base = base
         self.bran = bran
+        # Stretch the passcode into the keystore encryption seed once instead of for every agent
+        self.seed, self.aeid = stretch(bran, temp=temp)
         self.temp = temp
         self.configFile = configFile
+        self.operationTtl = operationTtl
+        self.operationPendingTtl = operationPendingTtl
         self.shouldShutdown = False
         self.configDir = configDir
         self.cf = None
@@ -271,17 +393,80 @@ class Agency(doing.DoDoer):
         else:
             self.cf = cf
 
-        self.agents = dict()
+        self.agents = caching.AgentCache(
+            maxAgents=maxAgents,
+            maxMemory=maxAgentMemory,
+            evict=self.evict,
+            pinned=self.pinned,
+        )
+        self.views = dict()
+        # Number of offloaded requests still reading each agent or view, keyed by controller AID
+        self.pins = dict()
+        self.pinLock = threading.Lock()
+        # Idle expiry of resident agents and views with per tenant class timeouts from the config file
+        self.releaseTimeout = releaseTimeout if releaseTimeout is not None else 86400
+        self.idle = caching.IdleTimer(timeout=self.releaseTimeout)
+        self.releaseTimeouts = (
+            dict(self.cf.get().get("releaseTimeouts", {}))
+            if self.cf is not None
+            else dict()
+        )
+        self.scheduler = scheduling.FairScheduler(budget=tickBudget)
+        # Wakes an IdleDoist run loop when agents get work, see agencyDoist
+        self.waker = Waker()
+        self.boots = dict()
+        self.bootWorkers = bootWorkers
+        self.pool = (
+            ThreadPoolExecutor(max_workers=bootWorkers, thread_name_prefix="keria-boot")
+            if bootWorkers
+            else None
+        )
+        self.keystores = pooling.KeystorePool(
+            size=keystorePool, base=base, temp=temp, executor=self.pool
+        )
+        self.offloader = offloading.Offloader(
+            workers=readWorkers,
+            limits=self.cf.get().get("readLimits") if self.cf is not None else None,
+            waker=self.waker,
+        )
 
         self.adb = (
             adb
             if adb is not None
             else basing.AgencyBaser(name="TheAgency", base=base, reopen=True, temp=temp)
         )
+        # In memory routing of managed and agent AIDs to their controller AID
+        self.routes = basing.RoutingIndex(self.adb)
+        self.store = (
+            basing.AgencyStore(name="TheAgency", base=base, reopen=True, temp=temp)
+            if consolidated
+            else None
+        )
         super(Agency, self).__init__(
-            doers=[Releaser(self, releaseTimeout=releaseTimeout)]
+            doers=[
+                Releaser(self, releaseTimeout=self.releaseTimeout),
+                Provisioner(self),
+                self.keystores,
+            ]
         )
 
+    def releaseTimeoutFor(self, caid):
+        """
+        Returns the idle release timeout in seconds of the agent for caid.  The agency configuration
+        file may give classes of tenants their own timeout, for example:
+
+            "releaseTimeouts": {
+                "classes": {"interactive": 3600, "archive": 300},
+                "tenants": {"EK35JRNdfVkO4JwhXaSTdV4qzB_ibk_tGJmSVcY4pZqx": "archive"}
+            }
+
+        Tenants not listed use the agency release timeout.
+        """
+        tclass = self.releaseTimeouts.get("tenants", {}).get(caid)
+        if tclass is None:
+            return self.releaseTimeout
+        return self.releaseTimeouts.get("classes", {}).get(tclass, self.releaseTimeout)
+
     def _loadConfigForAgent(self, caid):
         """
         Loads configuration data for an agent by looking up the Agency's configuration and copying
@@ -347,19 +532,41 @@ class Agency(doing.DoDoer):
         Returns:
             Agent: The newly created agent.
 
+        Parameters:
+            caid (str): The controller AID (Agent Identifier) for the new agent.
+            salt (str): Optional QB64 salt for the agent's Habery. If not provided, a random salt will be used.
+        """
+        return self.install(self.provision(caid=caid, salt=salt))
+
+    def provision(self, caid, salt=None):
+        """
+        Provision the keystore, Habery, Regery and Agent of a new agent without registering it with
+        the agency.  Does not touch the agency's state so it may run on the boot worker pool.
+
+        Returns:
+            Agent: The provisioned agent, not yet running.
+
         Parameters:
             caid (str): The controller AID (Agent Identifier) for the new agent.
             salt (str): Optional QB64 salt for the agent's Habery. If not provided, a random salt will be used.
         """
         habName = f"agent-{caid}"
-        ks = keeping.Keeper(name=caid, base=self.base, temp=self.temp, reopen=True)
+        # Bind a pre-created keystore from the warm pool if one is ready
+        bound = keystore.bind(caid) if (keystore := self.keystores.take()) else None
+        if bound is not None:
+            ks, db = bound
+        else:
+            ks = keeping.Keeper(name=caid, base=self.base, temp=self.temp, reopen=True)
+            db = None
         agent_cf = self._writeAgentConfig(caid)
         # Create the Hab for the Agent with only 2 AIDs
         agentHby = habbing.Habery(
             name=caid,
             base=self.base,
-            bran=self.bran,
+            seed=self.seed,
+            aeid=self.aeid,
             ks=ks,
+            db=db,
             cf=agent_cf,
             temp=self.temp,
             salt=salt,
@@ -369,30 +576,78 @@ class Agency(doing.DoDoer):
             hby=agentHby, name=agentHab.name, base=self.base, temp=self.temp
         )
 
-        agent = Agent(
+        return Agent(
             hby=agentHby, rgy=agentRgy, agentHab=agentHab, caid=caid, agency=self
         )
 
-        self.adb.agnt.pin(keys=(caid,), val=coring.Prefixer(qb64=agent.pre))
+    def install(self, agent):
+        """
+        Register a provisioned agent with the agency and start it running.  Must run on the main loop.
+
+        Returns:
+            Agent: The installed agent.
+        """
+        self.adb.agnt.pin(keys=(agent.caid,), val=coring.Prefixer(qb64=agent.pre))
 
-        self.adb.ctrl.pin(keys=(agent.pre,), val=coring.Prefixer(qb64=caid))
+        self.adb.ctrl.pin(keys=(agent.pre,), val=coring.Prefixer(qb64=agent.caid))
+        self.routes.add(agent.pre, agent.caid)
 
         # add agent to cache
-        self.agents[caid] = agent
+        self.agents[agent.caid] = agent
         # start agents processes running
         self.extend([agent])
+        self.idle.track(agent.caid, timeout=self.releaseTimeoutFor(agent.caid))
 
         return agent
 
+    def discard(self, agent):
+        """Closes and clears the databases of a provisioned agent that failed to boot and was never installed."""
+        to_close = [
+            agent.seeker,
+            agent.exnseeker,
+            agent.monitor.opr,
+            agent.notifier.noter,
+            agent.rep.mbx,
+            agent.rgy.reger,
+            agent.mgr.rb,
+            agent.hby.ks,
+            agent.hby,
+        ]
+        for db in to_close:
+            try:
+                db.close(clear=True)
+            except (
+                lmdb.Error
+            ) as ex:  # Sometimes LMDB will throw an error if the DB is already closed
+                logger.error(
+                    f"Error closing database {db.__class__.__name__} for agent {agent.caid}: {ex}"
+                )
+
+    def boot(self, caid, fn, *args):
+        """
+        Run agent provisioning function fn with args on the boot worker pool.  The Provisioner
+        installs the agent it returns from the main loop once done.
+
+        Returns:
+            Boot: Tracks the provisioning of the agent for caid.
+        """
+        boot = Boot(caid=caid, future=self.pool.submit(fn, *args))
+        boot.future.add_done_callback(lambda future: self.waker.wake())
+        self.boots[caid] = boot
+        return boot
+
     def delete(self, agent):
         """Deletes the agent from the agency and cleans up its resources."""
         self.adb.agnt.rem(key=agent.caid)
+        self.adb.ctrl.rem(keys=(agent.pre,))
+        self.routes.remove(agent.pre)
         # TODO call the agent's shutdown method to clean up resources instead of manually closing them below
         agent.hby.deleteHab(agent.caid)
         agent.hby.ks.close(clear=True)
         agent.hby.close(clear=True)
 
         del self.agents[agent.caid]
+        self.idle.discard(agent.caid)
 
     @deprecated(
         deprecated_in="0.2.0-rc2",
@@ -425,16 +680,81 @@ class Agency(doing.DoDoer):
 
     def get(self, caid):
         """
-        Retrieve an agent from the agency's agent list by controller AID (caid).
+        Retrieve a fully active agent by controller AID (caid), loading it from disk or upgrading
+        its read-only view if it is not already running.
 
         Returns:
             Agent: The agent associated with the given caid, or None if not found.
         """
-        if caid in self.agents:
-            agent = self.agents[caid]
+        if (agent := self.agents.lookup(caid)) is not None:
             agent.last = helping.nowUTC()
+            self.idle.touch(caid)
             return agent
 
+        if (view := self.views.pop(caid, None)) is not None:
+            agent = Agent(
+                hby=view.hby,
+                rgy=view.rgy,
+                agentHab=view.agentHab,
+                agency=self,
+                caid=caid,
+                **view.stores(),
+            )
+            # handlers still holding the view must reach the stores of the agent from now on
+            view._agent = agent
+        else:
+            if (opened := self._open(caid)) is None:
+                return None
+
+            agentHby, agentHab = opened
+            agentRgy = Regery(
+                hby=agentHby, name=agentHab.name, base=self.base, temp=self.temp
+            )
+            agent = Agent(
+                hby=agentHby, rgy=agentRgy, agentHab=agentHab, agency=self, caid=caid
+            )
+
+        self.agents[caid] = agent
+        self.extend([agent])
+        self.idle.track(caid, timeout=self.releaseTimeoutFor(caid))
+
+        return agent
+
+    def view(self, caid):
+        """
+        Retrieve an agent for read-only use by controller AID (caid).  A running agent is returned
+        as is, otherwise a cold agent is opened as an AgentView over its LMDB stores without
+        starting any of the agent's doers.
+
+        Returns:
+            Agent | AgentView: The agent or agent view for the given caid, or None if not found.
+        """
+        if caid in self.agents:
+            return self.get(caid)
+
+        if caid in self.views:
+            view = self.views[caid]
+            view.last = helping.nowUTC()
+            self.idle.touch(caid)
+            return view
+
+        if (opened := self._open(caid)) is None:
+            return None
+
+        agentHby, agentHab = opened
+        view = AgentView(hby=agentHby, agentHab=agentHab, agency=self, caid=caid)
+        self.views[caid] = view
+        self.idle.track(caid, timeout=self.releaseTimeoutFor(caid))
+
+        return view
+
+    def _open(self, caid):
+        """
+        Open the keystore and Habery of an existing agent from disk.
+
+        Returns:
+            tuple: (Habery, Hab) of the agent for the given caid, or None if not found.
+        """
         aaid = self.adb.agnt.get(keys=(caid,))
         if aaid is None:
             return None
@@ -442,7 +762,12 @@ class Agency(doing.DoDoer):
         ks = keeping.Keeper(name=caid, base=self.base, temp=self.temp, reopen=True)
 
         agentHby = habbing.Habery(
-            name=caid, base=self.base, bran=self.bran, ks=ks, temp=self.temp
+            name=caid,
+            base=self.base,
+            seed=self.seed,
+            aeid=self.aeid,
+            ks=ks,
+            temp=self.temp,
         )
 
         agentHab = agentHby.habByName(f"agent-{caid}", ns="agent")
@@ -451,45 +776,85 @@ class Agency(doing.DoDoer):
                 f"invalid agent aid={aaid.qb64}/{agentHab.pre} to controller aid={caid}"
             )
 
-        agentRgy = Regery(
-            hby=agentHby, name=agentHab.name, base=self.base, temp=self.temp
-        )
-        agent = Agent(
-            hby=agentHby, rgy=agentRgy, agentHab=agentHab, agency=self, caid=caid
-        )
+        return agentHby, agentHab
 
-        self.agents[caid] = agent
-        self.extend([agent])
+    def evict(self, agent):
+        """
+        Removes a resident agent from the agency and shuts it down, closing all of its databases.
+        Used by the agent cache when it goes over its bounds and by the Releaser for idle agents.
+        """
+        logger.info(f"Evicting agent {agent.caid}")
+        self.agents.pop(agent.caid)
+        self.idle.discard(agent.caid)
+        agent.shutdownAgent()
+        self.remove([agent])
+        try:
+            agent.hby.ks.close(clear=False)
+        except lmdb.Error as ex:
+            logger.error(f"Error closing keystore for agent {agent.caid}: {ex}")
+
+    def pin(self, caid):
+        """Keeps the agent or view of caid open while an offloaded request reads it."""
+        with self.pinLock:
+            self.pins[caid] = self.pins.get(caid, 0) + 1
+
+    def unpin(self, caid):
+        """Releases a pin taken with pin, safe to call from any thread."""
+        with self.pinLock:
+            if (count := self.pins.get(caid, 0) - 1) > 0:
+                self.pins[caid] = count
+            else:
+                self.pins.pop(caid, None)
 
-        return agent
+    def pinned(self, caid):
+        """Returns True if an offloaded request still reads the agent or view of caid."""
+        with self.pinLock:
+            return caid in self.pins
+
+    def release(self, view):
+        """Closes the read-only view of an agent and removes it from the agency."""
+        logger.info(f"Releasing agent view {view.caid}")
+        self.views.pop(view.caid, None)
+        self.idle.discard(view.caid)
+        view.close()
 
-    def lookup(self, pre):
+    def lookup(self, pre, view=False):
         """
         Look up an agent by either a managed AID prefix (pre) or its controller AID in the agency's database.
 
+        Parameters:
+            pre (str): qb64 managed AID prefix or agent AID prefix
+            view (bool): True means a read-only AgentView is sufficient for the caller
+
         Returns:
             Agent: The agent associated with the given prefix, or None if not found.
         """
-        # Check to see if this is a managed AID
-        if (prefixer := self.adb.aids.get(keys=(pre,))) is not None:
-            caid = prefixer.qb64
-        # Or if its an agent AID
-        elif (prefixer := self.adb.ctrl.get(keys=(pre,))) is not None:
-            caid = prefixer.qb64
-        else:
-            return None
+        # Check the routing index of managed AIDs and agent AIDs
+        if (caid := self.routes.route(pre)) is None:
+            # Fall back to the database for AIDs added by other processes sharing it, such as shard workers
+            if (prefixer := self.adb.aids.get(keys=(pre,))) is not None:
+                caid = prefixer.qb64
+            elif (prefixer := self.adb.ctrl.get(keys=(pre,))) is not None:
+                caid = prefixer.qb64
+            else:
+                return None
+            self.routes.add(pre, caid)
 
         try:
-            return self.get(caid)
+            return self.view(caid) if view else self.get(caid)
         except kering.ConfigurationError:
             return None
 
     def incept(self, caid, pre):
         """Maps a given agent to its controller AID (caid) in the agency's database."""
         self.adb.aids.pin(keys=(pre,), val=coring.Prefixer(qb64=caid))
+        self.routes.add(pre, caid)
 
     def shutdownAgency(self):
         """Shuts down the agents in an agency in preparation for agency shutdown."""
+        for view in list(self.views.values()):
+            self.release(view)
+
         if len(self.agents) > 0:
             caids = list(self.agents.keys())
             for caid in caids:
@@ -507,10 +872,20 @@ class Agency(doing.DoDoer):
         """
         if self.shouldShutdown and len(self.agents) == 0:
             logger.info("Agency shutdown complete. Exiting Agency.")
+            if self.store is not None:
+                self.store.close()
+            self.keystores.close()
+            self.offloader.close()
+            if self.pool is not None:
+                self.pool.shutdown(wait=False, cancel_futures=True)
+            self.waker.close()
             return True
         if self.shouldShutdown and len(self.agents) > 0:
             self.shutdownAgency()
-        super(Agency, self).recur(tyme=tyme)
+        if self.scheduler.budget:
+            self.scheduler.cycle(self, tyme=tyme)
+        else:
+            super(Agency, self).recur(tyme=tyme)
         return False  # Task is not done, run forever until True is returned
 
     def exit(self, rdeeds=None, deeds=None):
@@ -539,7 +914,19 @@ class Agent(doing.DoDoer):
       hierarchical deterministic key (HDK) management scheme used to select keys at the edge.
     """
 
-    def __init__(self, hby, rgy, agentHab, agency, caid, **opts):
+    def __init__(
+        self,
+        hby,
+        rgy,
+        agentHab,
+        agency,
+        caid,
+        seeker=None,
+        exnseeker=None,
+        mgr=None,
+        notifier=None,
+        **opts,
+    ):
         """
         Initialize the Agent with the given Habery, Regery, and agent's Hab.
         Parameters:
@@ -548,6 +935,10 @@ class Agent(doing.DoDoer):
             agentHab (Hab): The Hab instance representing the agent itself.
             agency (Agency): The Agency instance managing this agent.
             caid (str): The controller AID identifier for this agent.
+            seeker (Seeker | None): Already opened credential index, such as one from an AgentView.
+            exnseeker (ExnSeeker | None): Already opened exchange message index.
+            mgr (RemoteManager | None): Already opened remote key index manager.
+            notifier (Notifier | None): Already opened notifier.
             opts (dict): Additional options for the Agent initialization.
 
         Attributes:
@@ -559,6 +950,7 @@ class Agent(doing.DoDoer):
             .cfd (MappingProxyType): Configuration data for the agent.
             .tocks (MappingProxyType): Escrow timing configurations for the underlying Hio tasks comprising this agent.
             .last (datetime.datetime): Last activity timestamp for the agent.
+            .requested (float | None): Monotonic time of the last admin request, gives the agent scheduling priority.
             .shouldShutdown (bool): Flag indicating if the agent should shut down.
             .swain (delegating.Anchorer): Watches the delegator for delegation approval seals for inception and rotation.
             .counselor (Counselor): Handles multisig transaction signing orchestration including for multisig operations.
@@ -642,6 +1034,7 @@ class Agent(doing.DoDoer):
         )
         self.tocks = MappingProxyType(self.cfd.get("tocks", {}))
         self.last = helping.nowUTC()
+        self.requested = None
         self._shouldShutdown = False
 
         self.swain = delegating.Anchorer(hby=hby, proxy=agentHab)
@@ -650,17 +1043,19 @@ class Agent(doing.DoDoer):
 
         oobiery = oobiing.Oobiery(hby=hby)
 
-        self.mgr = RemoteManager(hby=hby)
+        self.mgr = (
+            mgr if mgr is not None else RemoteManager(hby=hby, store=agency.store)
+        )
 
-        self.cues = decking.Deck()
-        self.groups = decking.Deck()
-        self.anchors = decking.Deck()
-        self.witners = decking.Deck()
-        self.queries = decking.Deck()
-        self.exchanges = decking.Deck()
-        self.grants = decking.Deck()
-        self.admits = decking.Deck()
-        self.submits = decking.Deck()
+        self.cues = WakingDeck(waker=agency.waker)
+        self.groups = WakingDeck(waker=agency.waker)
+        self.anchors = WakingDeck(waker=agency.waker)
+        self.witners = WakingDeck(waker=agency.waker)
+        self.queries = WakingDeck(waker=agency.waker)
+        self.exchanges = WakingDeck(waker=agency.waker)
+        self.grants = WakingDeck(waker=agency.waker)
+        self.admits = WakingDeck(waker=agency.waker)
+        self.submits = WakingDeck(waker=agency.waker)
 
         receiptor = agenting.Receiptor(hby=hby)
         self.witq = agenting.WitnessInquisitor(hby=self.hby)
@@ -686,8 +1081,12 @@ class Agent(doing.DoDoer):
             *oobiery.doers,
         ]
 
-        signaler = signaling.Signaler()
-        self.notifier = Notifier(hby=hby, signaler=signaler)
+        if notifier is not None:
+            signaler = notifier.signaler
+            self.notifier = notifier
+        else:
+            signaler = signaling.Signaler()
+            self.notifier = Notifier(hby=hby, signaler=signaler)
         self.mux = grouping.Multiplexor(hby=hby, notifier=self.notifier)
 
         # Initialize all the credential processors
@@ -710,15 +1109,30 @@ class Agent(doing.DoDoer):
             notifier=self.notifier,
         )
 
-        self.seeker = basing.Seeker(
-            name=hby.name,
-            db=hby.db,
-            reger=self.rgy.reger,
-            reopen=True,
-            temp=self.hby.temp,
+        self.seeker = (
+            seeker
+            if seeker is not None
+            else basing.Seeker(
+                name=hby.name,
+                db=hby.db,
+                reger=self.rgy.reger,
+                reopen=True,
+                temp=self.hby.temp,
+                store=agency.store,
+                tenant=hby.name,
+            )
         )
-        self.exnseeker = basing.ExnSeeker(
-            name=hby.name, db=hby.db, reopen=True, temp=self.hby.temp
+        self.exnseeker = (
+            exnseeker
+            if exnseeker is not None
+            else basing.ExnSeeker(
+                name=hby.name,
+                db=hby.db,
+                reopen=True,
+                temp=self.hby.temp,
+                store=agency.store,
+                tenant=hby.name,
+            )
         )
 
         challengeHandler = challenging.ChallengeHandler(db=hby.db, signaler=signaler)
@@ -740,6 +1154,8 @@ class Agent(doing.DoDoer):
             credentialer=self.credentialer,
             submitter=self.submitter,
             exchanger=self.exc,
+            store=agency.store,
+            waker=agency.waker,
         )
 
         self.rvy = routing.Revery(db=hby.db, cues=self.cues)
@@ -763,6 +1179,20 @@ class Agent(doing.DoDoer):
             local=True,
         )  # disable misfit escrow until we can add another parser for remote.
 
+        self.escrower = Escrower(
+            kvy=self.kvy,
+            rgy=self.rgy,
+            rvy=self.rvy,
+            tvy=self.tvy,
+            exc=self.exc,
+            vry=self.verifier,
+            registrar=self.registrar,
+            credentialer=self.credentialer,
+            tock=self.tocks.get("escrower", 0.0),
+            backoff=self.tocks.get("escrowerBackoff", 0.0),
+            maxBackoff=self.tocks.get("escrowerMaxBackoff", 1.0),
+        )
+
         doers.extend(
             [
                 Initer(
@@ -775,17 +1205,7 @@ class Agent(doing.DoDoer):
                     queries=self.queries,
                     tock=self.tocks.get("querier", 0.0),
                 ),
-                Escrower(
-                    kvy=self.kvy,
-                    rgy=self.rgy,
-                    rvy=self.rvy,
-                    tvy=self.tvy,
-                    exc=self.exc,
-                    vry=self.verifier,
-                    registrar=self.registrar,
-                    credentialer=self.credentialer,
-                    tock=self.tocks.get("escrower", 0.0),
-                ),
+                self.escrower,
                 ParserDoer(
                     kvy=self.kvy, parser=self.parser, tock=self.tocks.get("parser", 0.0)
                 ),
@@ -843,8 +1263,20 @@ class Agent(doing.DoDoer):
                     tock=self.tocks.get("exchangecue", 0.0),
                 ),
                 self.submitter,
+                OperationWatcher(
+                    monitor=self.monitor, tock=self.tocks.get("operationWatcher", 0.0)
+                ),
             ]
         )
+        if agency.operationTtl > 0 or agency.operationPendingTtl > 0:
+            doers.append(
+                OperationCollector(
+                    monitor=self.monitor,
+                    ttl=agency.operationTtl or None,
+                    pendingTtl=agency.operationPendingTtl or None,
+                    tock=self.tocks.get("operationCollector", 0.0),
+                )
+            )
 
         super(Agent, self).__init__(doers=doers, **opts)
 
@@ -893,6 +1325,7 @@ class Agent(doing.DoDoer):
 
     def shutdownAgent(self):
         self.remove(self.doers)  # calls .exit()
+        self.monitor.close()  # ends operation event streams so clients reconnect
         # Shut down all of the LMDBer subclasses to close open files.
         to_close = [
             self.seeker,
@@ -919,33 +1352,221 @@ class Agent(doing.DoDoer):
         logger.info(f"Agent {self.caid} shut down")
 
 
-def createBootServerDoer(config: KERIAServerConfig, agency: Agency):
-    """Create the Agent boot HTTP server and the Doer to run it. Returns only the Doer."""
-    bootApp = falconApp(config.logRequests)
+class AgentView:
+    """
+    Read-only, cold view of an Agent used to serve read requests for tenants that are not
+    currently active.  Only the keystore and Habery are opened up front.  The remaining
+    KERIA-owned stores are opened lazily on first access and no doers are started.
+
+    Accessing any attribute only available on a fully active Agent, such as .monitor or one of
+    the decks, upgrades the view to an Agent through the Agency and delegates to it so handlers
+    never observe the difference.
+
+    Stores are only opened and the view only upgraded on the thread that created the view, the
+    main loop, as neither is synchronized.  Handlers offloaded to the read workers must have the
+    stores they read opened before they are offloaded, see offloading.offload.
+
+    Attributes:
+        .agency (Agency): The Agency instance managing this view.
+        .caid (str): The Signify controller AID for this agent.
+        .hby (Habery): The Habery instance for the agent's local database.
+        .agentHab (Hab): The Hab instance representing the agent itself.
+        .last (datetime.datetime): Last activity timestamp for the view.
+    """
+
+    def __init__(self, hby, agentHab, agency, caid):
+        """
+        Initialize the view with the given Habery and agent's Hab.
+
+        Parameters:
+            hby (Habery): The Habery instance for the agent's database access.
+            agentHab (Hab): The Hab instance representing the agent itself.
+            agency (Agency): The Agency instance managing this view.
+            caid (str): The controller AID identifier for this agent.
+        """
+        self.agency = agency
+        self.caid = caid
+        self.hby = hby
+        self.agentHab = agentHab
+        self.last = helping.nowUTC()
+        self.org = connecting.Organizer(hby=hby)
+        self._thread = threading.get_ident()
+
+        self._rgy = None
+        self._seeker = None
+        self._exnseeker = None
+        self._mgr = None
+        self._notifier = None
+        # Agent this view was upgraded to, every store is then served by the agent
+        self._agent = None
+
+    def __getattr__(self, name):
+        """Upgrades to a fully active Agent for any attribute not served by the view."""
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        if self._agent is None:
+            self._owner(name)
+            logger.info(f"Upgrading agent view {self.caid} to access {name}")
+            self.agency.get(self.caid)
+
+        return getattr(self._agent, name)
+
+    def _owner(self, name):
+        """Raises RuntimeError when name would be opened off the thread that created the view."""
+        if threading.get_ident() != self._thread:
+            raise RuntimeError(
+                f"{name} of agent view {self.caid} accessed off the main loop before it was opened"
+            )
+
+    @property
+    def pre(self):
+        return self.agentHab.pre
+
+    @property
+    def cfd(self):
+        return MappingProxyType(
+            dict(self.hby.cf.get()) if self.hby.cf is not None else dict()
+        )
+
+    @property
+    def rgy(self):
+        if self._agent is not None:
+            return self._agent.rgy
+        if self._rgy is None:
+            self._owner("rgy")
+            self._rgy = Regery(
+                hby=self.hby,
+                name=self.agentHab.name,
+                base=self.hby.base,
+                temp=self.hby.temp,
+            )
+        return self._rgy
+
+    @property
+    def seeker(self):
+        if self._agent is not None:
+            return self._agent.seeker
+        if self._seeker is None:
+            self._owner("seeker")
+            self._seeker = basing.Seeker(
+                name=self.hby.name,
+                db=self.hby.db,
+                reger=self.rgy.reger,
+                reopen=True,
+                temp=self.hby.temp,
+                store=self.agency.store,
+                tenant=self.hby.name,
+            )
+        return self._seeker
+
+    @property
+    def exnseeker(self):
+        if self._agent is not None:
+            return self._agent.exnseeker
+        if self._exnseeker is None:
+            self._owner("exnseeker")
+            self._exnseeker = basing.ExnSeeker(
+                name=self.hby.name,
+                db=self.hby.db,
+                reopen=True,
+                temp=self.hby.temp,
+                store=self.agency.store,
+                tenant=self.hby.name,
+            )
+        return self._exnseeker
+
+    @property
+    def mgr(self):
+        if self._agent is not None:
+            return self._agent.mgr
+        if self._mgr is None:
+            self._owner("mgr")
+            self._mgr = RemoteManager(hby=self.hby, store=self.agency.store)
+        return self._mgr
+
+    @property
+    def notifier(self):
+        if self._agent is not None:
+            return self._agent.notifier
+        if self._notifier is None:
+            self._owner("notifier")
+            self._notifier = Notifier(hby=self.hby, signaler=signaling.Signaler())
+        return self._notifier
+
+    def stores(self):
+        """Returns the lazily opened stores so an upgraded Agent can adopt them."""
+        return dict(
+            seeker=self._seeker,
+            exnseeker=self._exnseeker,
+            mgr=self._mgr,
+            notifier=self._notifier,
+        )
+
+    def close(self):
+        """Closes every store opened by this view."""
+        to_close = [
+            self._seeker,
+            self._exnseeker,
+            self._notifier.noter if self._notifier is not None else None,
+            self._rgy.reger if self._rgy is not None else None,
+            self._mgr.rb if self._mgr is not None else None,
+            self.hby.ks,
+            self.hby,
+        ]
+        for db in to_close:
+            if db is None:
+                continue
+            try:
+                db.close(clear=False)
+            except (
+                lmdb.Error
+            ) as ex:  # Sometimes LMDB will throw an error if the DB is already closed
+                logger.error(
+                    f"Error closing database {db.__class__.__name__} for agent view {self.caid}: {ex}"
+                )
+
+
+def createBootApp(config: KERIAServerConfig, agency: Agency):
+    """Create the Falcon app of the Agent boot HTTP server."""
+    bootApp = falconApp(config.logRequests, compressMinSize=config.compressMinSize)
 
     bootEnd = BootEnd(
         agency, username=config.bootUsername, password=config.bootPassword
     )
     bootApp.add_route("/boot", bootEnd)
+    bootApp.add_route("/boot/{caid}", bootEnd, suffix="status")
     bootApp.add_route("/health", HealthEnd())
+    bootApp.add_route("/metrics", MetricsEnd(agency))
+    return bootApp
 
+
+def createBootServerDoer(config: KERIAServerConfig, agency: Agency):
+    """Create the Agent boot HTTP server and the Doer to run it. Returns only the Doer."""
+    bootApp = createBootApp(config, agency)
     bootServer = createHttpServer(
-        config.bootPort, bootApp, config.keyPath, config.certPath, config.caFilePath
+        config.bootPort,
+        bootApp,
+        config.keyPath,
+        config.certPath,
+        config.caFilePath,
+        host=config.host,
     )
     if not bootServer.reopen():
         raise RuntimeError(f"Cannot create boot HTTP server on port {config.bootPort}")
     return http.ServerDoer(server=bootServer)
 
 
-def createAdminServerDoer(config: KERIAServerConfig, agency: Agency):
-    """
-    Create the Admin HTTP server and the Doer to run it.
-    Returns the Doer and the Falcon app so the HTTP app can use it for OpenAPI docs.
-    """
+def createAdminApp(config: KERIAServerConfig, agency: Agency):
+    """Create the Falcon app of the Admin HTTP server."""
     # Create Authenticater for verifying signatures on all requests
     authn = SignedHeaderAuthenticator(agency=agency)
 
-    adminApp = falconApp(config.logRequests, request_type=authing.ModifiableRequest)
+    adminApp = falconApp(
+        config.logRequests,
+        request_type=authing.ModifiableRequest,
+        compressMinSize=config.compressMinSize,
+    )
     if config.cors:
         adminApp.add_middleware(middleware=httping.HandleCORS())
     adminApp.add_middleware(
@@ -963,9 +1584,23 @@ def createAdminServerDoer(config: KERIAServerConfig, agency: Agency):
 
     keriaexchanging.loadEnds(app=adminApp)
     ipexing.loadEnds(app=adminApp)
+    batching.loadEnds(app=adminApp)
+    return adminApp
 
+
+def createAdminServerDoer(config: KERIAServerConfig, agency: Agency):
+    """
+    Create the Admin HTTP server and the Doer to run it.
+    Returns the Doer and the Falcon app so the HTTP app can use it for OpenAPI docs.
+    """
+    adminApp = createAdminApp(config, agency)
     adminServer = createHttpServer(
-        config.adminPort, adminApp, config.keyPath, config.certPath, config.caFilePath
+        config.adminPort,
+        adminApp,
+        config.keyPath,
+        config.certPath,
+        config.caFilePath,
+        host=config.host,
     )
     if not adminServer.reopen():
         raise RuntimeError(
@@ -974,11 +1609,9 @@ def createAdminServerDoer(config: KERIAServerConfig, agency: Agency):
     return adminApp, http.ServerDoer(server=adminServer)
 
 
-def createHttpServerDoer(
-    config: KERIAServerConfig, agency: Agency, adminApp: falcon.App
-):
-    """Create the main HTTP server and the Doer to run it. Returns only the Doer."""
-    happ = falconApp(config.logRequests)
+def createHttpApp(config: KERIAServerConfig, agency: Agency, adminApp: falcon.App):
+    """Create the Falcon app of the main HTTP server serving the OpenAPI docs of the admin app."""
+    happ = falconApp(config.logRequests, compressMinSize=config.compressMinSize)
     happ.req_options.media_handlers.update(media.Handlers())
     happ.resp_options.media_handlers.update(media.Handlers())
 
@@ -993,8 +1626,21 @@ def createHttpServerDoer(
     )
     specEnd.addRoutes(happ)
     happ.add_route("/spec.yaml", specEnd)
+    return happ
+
+
+def createHttpServerDoer(
+    config: KERIAServerConfig, agency: Agency, adminApp: falcon.App
+):
+    """Create the main HTTP server and the Doer to run it. Returns only the Doer."""
+    happ = createHttpApp(config, agency, adminApp)
     server = createHttpServer(
-        config.httpPort, happ, config.keyPath, config.certPath, config.caFilePath
+        config.httpPort,
+        happ,
+        config.keyPath,
+        config.certPath,
+        config.caFilePath,
+        host=config.host,
     )
     if not server.reopen():
         raise RuntimeError(f"cannot create local http server on port {config.httpPort}")
@@ -1009,6 +1655,15 @@ def createAgency(config: KERIAServerConfig, temp=False, cf=None):
         configFile=config.configFile,
         configDir=config.configDir,
         releaseTimeout=config.releaseTimeout,
+        maxAgents=config.maxAgents,
+        maxAgentMemory=config.maxAgentMemory,
+        consolidated=config.consolidated,
+        tickBudget=config.tickBudget,
+        bootWorkers=config.bootWorkers,
+        keystorePool=config.keystorePool,
+        readWorkers=config.readWorkers,
+        operationTtl=config.operationTtl,
+        operationPendingTtl=config.operationPendingTtl,
         curls=config.curls,
         iurls=config.iurls,
         durls=config.durls,
@@ -1040,6 +1695,33 @@ def setupDoers(agency: Agency, config: KERIAServerConfig, temp=False, cf=None):
     return doers
 
 
+def setupServers(agency: Agency, config: KERIAServerConfig):
+    """
+    Sets up the boot, admin and HTTP apps of setupDoers on asyncio servers for the asyncio server
+    mode, see asgiing.AsgiServer.
+    """
+    context = asgiing.sslContext(config.keyPath, config.certPath, config.caFilePath)
+    scheme = "https" if context is not None else "http"
+    adminApp = createAdminApp(config, agency)
+    apps = [
+        (config.bootPort, createBootApp(config, agency)),
+        (config.adminPort, adminApp),
+    ]
+    if config.httpPort:
+        apps.append((config.httpPort, createHttpApp(config, agency, adminApp)))
+
+    return [
+        asgiing.AsgiServer(
+            app=asgiing.WsgiAsgi(app, scheme=scheme),
+            port=port,
+            host=config.host,
+            ssl=context,
+            keepalive=config.keepAlive,
+        )
+        for port, app in apps
+    ]
+
+
 class ParserDoer(doing.Doer):
     """A Doer that continuously processes messages from the Parser."""
 
@@ -1417,6 +2099,72 @@ class ExchangeCueDoer(doing.Doer):
                 return False
 
 
+class OperationWatcher(doing.Doer):
+    """Pushes long running operation state transitions to the subscribers of the Monitor"""
+
+    def __init__(self, monitor, interval=5.0, tock=0.0):
+        """
+        Parameters:
+            monitor (Monitor): long running operation monitor
+            interval (float): seconds between checks of pending operations with unchanged databases
+            tock (float): recur tock
+        """
+        self.monitor = monitor
+        self.interval = interval
+        super(OperationWatcher, self).__init__(tock=tock)
+
+    def recur(self, tyme=None, tock=0.0, **opts):
+        self.monitor.watch(tyme, interval=self.interval)
+        return False
+
+
+class OperationCollector(doing.Doer):
+    """Garbage collects long running operations done for longer than their time to live and, when
+    enabled, times out those pending for longer than the pending time to live"""
+
+    def __init__(self, monitor, ttl, pendingTtl=None, interval=60.0, tock=0.0):
+        """
+        Parameters:
+            monitor (Monitor): long running operation monitor
+            ttl (float | None): seconds done operations are kept, None keeps them
+            pendingTtl (float | None): seconds operations may stay pending, None never times them out
+            interval (float): seconds between collections
+            tock (float): recur tock
+        """
+        self.monitor = monitor
+        self.ttl = ttl
+        self.pendingTtl = pendingTtl
+        self.interval = interval
+        self.due = 0.0
+        self.expired = 0
+        self.reclaimed = 0
+        super(OperationCollector, self).__init__(tock=tock)
+
+    def recur(self, tyme=None, tock=0.0, **opts):
+        if tyme < self.due:
+            return False
+
+        self.due = tyme + self.interval
+        if (
+            self.pendingTtl is not None
+            and (expired := self.monitor.expire(self.pendingTtl)) > 0
+        ):
+            self.expired += expired
+            logger.info(
+                "Timed out %d long running operations of %s pending past their time to live",
+                expired,
+                self.monitor.hby.name,
+            )
+        if self.ttl is not None and (reclaimed := self.monitor.collect(self.ttl)) > 0:
+            self.reclaimed += reclaimed
+            logger.info(
+                "Reclaimed %d expired long running operations of %s",
+                reclaimed,
+                self.monitor.hby.name,
+            )
+        return False
+
+
 class Initer(doing.Doer):
     """Prints a message once an agent is initialized."""
 
@@ -1512,10 +2260,134 @@ class Querier(doing.DoDoer):
         return super(Querier, self).recur(tyme, deeds)
 
 
+class Escrow:
+    """
+    Escrow processing step of an Agent along with the LMDB escrow sub databases it drains, used by
+    the Escrower to skip escrows that are empty or unchanged and to report per escrow metrics.
+
+    The generation of an escrow is the last LMDB transaction ID of the environments holding its sub
+    databases plus any other environments it depends on, such as the KEL database for TEL events
+    waiting on their anchors.  Only writes to those environments mark the escrow dirty again.
+    Escrows that also wait on in-memory state, such as witness receipt cues, are volatile and
+    processed every time since nothing marks them dirty when that state changes.
+
+    Attributes:
+        .name (str): name of the escrow for metrics
+        .process (Callable): processes the escrow once
+        .dbs (list): (LMDBer, named sub database) tuples of the escrow sub databases
+        .deps (list): other LMDBers whose writes may unblock escrowed entries
+        .tracked (bool): True means skip when empty or unchanged, False means always process
+        .runs (int): number of times processed
+        .skips (int): number of times skipped because empty
+        .deferrals (int): number of times deferred because unchanged and backing off
+        .seconds (float): total processing time in seconds
+        .last (float): duration of the last processing in seconds
+        .entries (int): number of escrowed entries at the last check
+        .backoff (float): current backoff in seconds, 0.0 when not backing off
+        .due (float): tyme the escrow must be processed by while backing off
+        .generation (tuple): generation of the escrow after it was last processed
+    """
+
+    def __init__(self, name, process, dbs=None, deps=None, volatile=False):
+        """
+        Parameters:
+            name (str): name of the escrow for metrics
+            process (Callable): processes the escrow once
+            dbs (list): (LMDBer, named sub database) tuples of the escrow sub databases
+            deps (list): other LMDBers whose writes may unblock escrowed entries
+            volatile (bool): True means entries also wait on in-memory state so always process
+        """
+        self.name = name
+        self.process = process
+        self.dbs = dbs if dbs is not None else []
+        self.deps = deps if deps is not None else []
+        self.tracked = len(self.dbs) > 0 and not volatile
+
+        self.runs = 0
+        self.skips = 0
+        self.deferrals = 0
+        self.seconds = 0.0
+        self.last = 0.0
+        self.entries = 0
+        self.backoff = 0.0
+        self.due = 0.0
+        self.generation = None
+
+    @staticmethod
+    def subdbs(dber, *names):
+        """
+        Returns (dber, sub database) tuples for the named escrow sub databases of dber.  Names may
+        be dotted attribute paths and refer to either Subers or raw named sub databases.  Returns
+        None when any name does not resolve in the installed version of keripy, as entries in an
+        escrow sub database that is not watched would never mark the escrow dirty, so the escrow
+        is always processed instead.
+        """
+        dbs = []
+        for name in names:
+            sub = dber
+            for attr in name.split("."):
+                sub = getattr(sub, attr, None)
+            sdb = getattr(sub, "sdb", sub)
+            if not isinstance(sdb, lmdb._Database):
+                logger.warning(
+                    f"Escrow sub database {name} of {type(dber).__name__} not found, "
+                    "processing its escrow every time"
+                )
+                return None
+            dbs.append((dber, sdb))
+        return dbs
+
+    def size(self):
+        """Returns the number of escrowed entries read from the sub database stats in O(1)"""
+        entries = 0
+        for dber, sdb in self.dbs:
+            if dber.env is None:
+                continue
+            with dber.env.begin() as txn:
+                entries += txn.stat(sdb)["entries"]
+        return entries
+
+    def current(self):
+        """Returns the current generation of the escrow"""
+        dbers = [dber for dber, _ in self.dbs] + self.deps
+        envs = {id(dber.env): dber.env for dber in dbers if dber.env is not None}
+        return tuple(env.info()["last_txnid"] for env in envs.values())
+
+    def stats(self):
+        return dict(
+            runs=self.runs,
+            skips=self.skips,
+            deferrals=self.deferrals,
+            seconds=self.seconds,
+            last=self.last,
+            entries=self.entries,
+            backoff=self.backoff,
+        )
+
+
 class Escrower(doing.Doer):
-    def __init__(self, kvy, rgy, rvy, tvy, exc, vry, registrar, credentialer, tock=0.0):
+    def __init__(
+        self,
+        kvy,
+        rgy,
+        rvy,
+        tvy,
+        exc,
+        vry,
+        registrar,
+        credentialer,
+        tock=0.0,
+        backoff=0.0,
+        maxBackoff=1.0,
+    ):
         """Recuring process or escrows for all components in an Agent
 
+        Escrows with no entries are skipped.  Escrows whose last processing made no progress and
+        whose databases and dependencies have not been written to since are only processed again
+        once their backoff expires.  Volatile escrows waiting on in-memory state are always
+        processed.  The backoff doubles from the
+        configured backoff, or the tock when zero, up to maxBackoff for as long as nothing changes.
+
         Parameters:
             kvy (Kevery):
             rgy (Regery):
@@ -1525,6 +2397,9 @@ class Escrower(doing.Doer):
             vry (Verifier):
             registrar (Registrar): Credential TEL escrow processor
             credentialer (Credentialer): Credential escrow processor
+            tock (float): recur tock
+            backoff (float): initial backoff in seconds for unchanged escrows
+            maxBackoff (float): maximum backoff in seconds, 0.0 disables skipping and backoff
         """
         self.kvy = kvy
         self.rgy = rgy
@@ -1535,30 +2410,130 @@ class Escrower(doing.Doer):
         self.registrar = registrar
         self.credentialer = credentialer
         self.tock = tock
+        self.backoff = backoff if backoff else 0.03125
+        self.maxBackoff = maxBackoff
+
+        db = kvy.db
+        reger = rgy.reger
+        self.escrows = [
+            Escrow(
+                "kevery",
+                kvy.processEscrows,
+                Escrow.subdbs(
+                    db,
+                    "ooes",
+                    "uwes",
+                    "ures",
+                    "vres",
+                    "pdes",
+                    "pwes",
+                    "pses",
+                    "ldes",
+                    "qnfs",
+                    "misfits",
+                ),
+            ),
+            Escrow(
+                "delegables",
+                kvy.processEscrowDelegables,
+                Escrow.subdbs(db, "delegables"),
+            ),
+            # Regery processes its own Tevery escrows so shares the Tevery sub databases
+            Escrow(
+                "regery",
+                rgy.processEscrows,
+                Escrow.subdbs(reger, "oots", "taes", "txnsb.escrowdb"),
+                deps=[db],
+            ),
+            Escrow("revery", rvy.processEscrowReply, Escrow.subdbs(db, "rpes")),
+            Escrow("exchanger", exc.processEscrow, Escrow.subdbs(db, "epse")),
+            Escrow(
+                "verifier",
+                vry.processEscrows,
+                Escrow.subdbs(reger, "mce", "mse", "mre"),
+                deps=[db],
+            ),
+            # witness receipts are only complete once the witness doer cued them in memory
+            Escrow(
+                "registrar",
+                registrar.processEscrows,
+                Escrow.subdbs(reger, "tpwe", "tmse", "tede"),
+                volatile=True,
+            ),
+            Escrow(
+                "credentialer",
+                credentialer.processEscrows,
+                Escrow.subdbs(reger, "cmse"),
+            ),
+        ]
+        if tvy is not None:
+            self.escrows.insert(
+                4,
+                Escrow(
+                    "tevery",
+                    tvy.processEscrows,
+                    Escrow.subdbs(tvy.reger, "oots", "taes", "txnsb.escrowdb"),
+                    deps=[db],
+                ),
+            )
 
         super(Escrower, self).__init__(tock=self.tock)
 
     def recur(self, tyme, tock=0.0, **opts):
-        """Process all escrows once per loop."""
-        self.kvy.processEscrows()
-        self.kvy.processEscrowDelegables()
-        self.rgy.processEscrows()
-        self.rvy.processEscrowReply()
-        if self.tvy is not None:
-            self.tvy.processEscrows()
-        self.exc.processEscrow()
-        self.vry.processEscrows()
-        self.registrar.processEscrows()
-        self.credentialer.processEscrows()
+        """Process all dirty escrows once per loop."""
+        for escrow in self.escrows:
+            if not escrow.tracked or not self.maxBackoff:
+                self.run(escrow)
+                continue
+
+            if (entries := escrow.size()) == 0:
+                escrow.entries = 0
+                escrow.backoff = 0.0
+                escrow.skips += 1
+                continue
+
+            # unchanged since last processed so still waiting on the same external input
+            generation = escrow.current()
+            stalled = entries == escrow.entries and generation == escrow.generation
+            if stalled and escrow.backoff and tyme < escrow.due:
+                escrow.deferrals += 1
+                continue
+
+            self.run(escrow)
+            escrow.entries = escrow.size()
+            escrow.generation = escrow.current()
+            if escrow.entries == entries and escrow.generation == generation:
+                # no progress so back off until new input or the backoff expires
+                escrow.backoff = min(
+                    max(escrow.backoff * 2, self.backoff), self.maxBackoff
+                )
+                escrow.due = tyme + escrow.backoff
+            else:
+                escrow.backoff = 0.0
+
         return False
 
+    @staticmethod
+    def run(escrow):
+        start = time.perf_counter()
+        escrow.process()
+        escrow.last = time.perf_counter() - start
+        escrow.seconds += escrow.last
+        escrow.runs += 1
+
+    def stats(self):
+        """Returns per escrow metrics keyed by escrow name"""
+        return {escrow.name: escrow.stats() for escrow in self.escrows}
+
 
 class Releaser(doing.Doer):
     def __init__(self, agency: Agency, releaseTimeout=86400):
-        """Check open agents and close if idle for more than releaseTimeout seconds
+        """Check open agents and views and close them once idle for longer than their timeout.
+        Idle deadlines are kept on the agency's IdleTimer heap so only the expired ones are visited.
+
         Parameters:
             agency (Agency): KERIA agent manager
-            releaseTimeout (int): Timeout in seconds
+            releaseTimeout (int): Default timeout in seconds
 
         """
         self.tock = 60.0
@@ -1570,22 +2545,112 @@ class Releaser(doing.Doer):
 
     def recur(self, tyme=None, tock=0.0, **opts):
         while True:
-            idle = []
-            for caid in self.agents:
-                now = helping.nowUTC()
-                if (now - self.agents[caid].last) > datetime.timedelta(
-                    seconds=self.releaseTimeout
-                ):
-                    idle.append(caid)
-
-            for caid in idle:
-                self.agency.shut(self.agents[caid])
+            for caid in self.agency.idle.expired():
+                if self.agency.pinned(caid):  # still read by an offloaded request
+                    self.agency.idle.track(
+                        caid, timeout=self.agency.releaseTimeoutFor(caid)
+                    )
+                elif caid in self.agents:
+                    self.agency.evict(self.agents[caid])
+                elif (view := self.agency.views.get(caid)) is not None:
+                    self.agency.release(view)
             yield self.tock
 
 
+class Boot:
+    """
+    Provisioning of an agent on the boot worker pool reported to the controller as a long running
+    operation named boot.{caid}.
+
+    Attributes:
+        .caid (str): controller AID of the agent being provisioned
+        .future (Future): result of the provisioning function, the provisioned Agent
+        .state (dict | None): key state of the agent once installed
+        .error (OperationStatus | None): reason provisioning failed
+        .finished (float | None): monotonic time provisioning completed or failed
+
+    """
+
+    def __init__(self, caid, future):
+        self.caid = caid
+        self.future = future
+        self.state = None
+        self.error = None
+        self.finished = None
+
+    @property
+    def name(self):
+        return f"{longrunning.OpTypes.boot}.{self.caid}"
+
+    @property
+    def done(self):
+        return self.finished is not None
+
+    def operation(self):
+        """Returns the long running operation reporting the status of this boot."""
+        metadata = dict(caid=self.caid)
+        if self.error is not None:
+            return longrunning.FailedOperation(
+                name=self.name, metadata=metadata, error=self.error
+            )
+        if self.state is not None:
+            return longrunning.CompletedOperation(
+                name=self.name, metadata=metadata, response=self.state
+            )
+        return longrunning.PendingOperation(name=self.name, metadata=metadata)
+
+
+class Provisioner(doing.Doer):
+    def __init__(self, agency: Agency, retention=300.0, tock=0.0):
+        """Install agents provisioned on the boot worker pool into the agency from the main loop and
+        forget finished boots after retention seconds.
+
+        Parameters:
+            agency (Agency): KERIA agent manager
+            retention (float): Seconds the status of a finished boot is kept for polling
+
+        """
+        self.agency = agency
+        self.retention = retention
+
+        super(Provisioner, self).__init__(tock=tock)
+
+    def recur(self, tyme=None, tock=0.0, **opts):
+        now = time.monotonic()
+        for caid, boot in list(self.agency.boots.items()):
+            if boot.done:
+                if now - boot.finished > self.retention:
+                    del self.agency.boots[caid]
+                continue
+
+            if not boot.future.done():
+                continue
+
+            boot.finished = now
+            try:
+                agent = boot.future.result()
+            except falcon.HTTPError as ex:
+                boot.error = longrunning.OperationStatus(
+                    code=ex.status_code, message=ex.description or ex.title
+                )
+                continue
+            except Exception as ex:
+                logger.exception(f"Provisioning agent {caid} failed")
+                boot.error = longrunning.OperationStatus(code=500, message=str(ex))
+                continue
+
+            self.agency.install(agent)
+            boot.state = asdict(agent.agentHab.kever.state())
+            logger.info(f"Booted agent {agent.pre} for controller {caid}")
+
+        return False
+
+
 def loadEnds(app):
     opColEnd = longrunning.OperationCollectionEnd()
     app.add_route("/operations", opColEnd)
+    opEventsEnd = longrunning.OperationEventsEnd()
+    app.add_route("/operations/events", opEventsEnd)
     opResEnd = longrunning.OperationResourceEnd()
     app.add_route("/operations/{name}", opResEnd)
 
@@ -1663,6 +2728,9 @@ class BootEnd:
         Give me a new Agent.  Create Habery using ctrlPRE as database name, agentHab that anchors the caid and
         returns the KEL of agentHAB Stores ControllerPRE -> AgentPRE in database
 
+        With a Prefer: respond-async header the agent is provisioned on the boot worker pool and the
+        202 response is a long running operation named boot.{caid} to poll at /boot/{caid}.
+
         Parameters:
             req (Request): falcon.Request HTTP request object
             rep (Response): falcon.Response HTTP response object
@@ -1676,7 +2744,7 @@ class BootEnd:
             400:
                 description: Bad request, missing required fields or invalid inception event
             409:
-                description: Conflict, agent for controller already exists
+                description: Conflict, agent for controller already exists or is being booted
 
         """
 
@@ -1699,27 +2767,102 @@ class BootEnd:
 
         caid = icp.pre
 
-        if self.agency.get(caid=caid) is not None:
+        boot = self.agency.boots.get(caid)
+        if (boot is not None and not boot.done) or self.agency.get(
+            caid=caid
+        ) is not None:
             raise falcon.HTTPConflict(
                 title="agent already exists",
                 description=f"agent for controller {caid} already exists",
             )
 
-        agent = self.agency.create(caid=caid)
+        # Client prefers a long running operation to poll over waiting for the agent to be provisioned
+        if self.agency.pool is not None and "respond-async" in (
+            req.get_header("Prefer") or ""
+        ):
+            boot = self.agency.boot(caid, self.provision, icp, siger, body)
+            rep.status = falcon.HTTP_202
+            rep.set_header("Preference-Applied", "respond-async")
+            rep.location = f"/boot/{caid}"
+            rep.data = boot.operation().to_json().encode("utf-8")
+            return
+
+        agent = self.agency.install(self.provision(icp, siger, body))
+
+        rep.status = falcon.HTTP_202
+        rep.data = json.dumps(asdict(agent.agentHab.kever.state())).encode("utf-8")
+
+    def on_get_status(self, req: falcon.Request, rep: falcon.Response, caid):
+        """Boot status GET endpoint
+
+        Parameters:
+            req (Request): falcon.Request HTTP request object
+            rep (Response): falcon.Response HTTP response object
+            caid (str): qb64 controller AID of the agent
 
+        responses:
+            200:
+                description: Long running operation named boot.{caid} reporting the provisioning of
+                             the agent, its response is the agent state once done
+            404:
+                description: No agent booted for controller
+
+        """
+        self.authenticate(req)
+
+        if (boot := self.agency.boots.get(caid)) is not None:
+            operation = boot.operation()
+        elif (view := self.agency.view(caid)) is not None:
+            operation = longrunning.CompletedOperation(
+                name=f"{longrunning.OpTypes.boot}.{caid}",
+                metadata=dict(caid=caid),
+                response=asdict(view.agentHab.kever.state()),
+            )
+        else:
+            raise falcon.HTTPNotFound(
+                description=f"no agent booted for controller {caid}"
+            )
+
+        rep.status = falcon.HTTP_200
+        rep.data = operation.to_json().encode("utf-8")
+
+    def provision(self, icp, siger, body):
+        """
+        Provision the agent for the controller inception event icp and track the key parameters in
+        body.  Safe to run on the boot worker pool as the agent is only installed into the agency by
+        the caller, any agent that fails to boot is discarded.
+
+        Parameters:
+            icp (SerderKERI): controller inception event
+            siger (Siger): controller signature of icp
+            body (dict): boot request body
+
+        Returns:
+            Agent: The provisioned agent, not yet installed.
+        """
+        agent = self.agency.provision(caid=icp.pre)
+        try:
+            self.incept(agent, icp, siger, body)
+        except Exception:
+            self.agency.discard(agent)
+            raise
+
+        return agent
+
+    @staticmethod
+    def incept(agent, icp, siger, body):
+        """Incept the controller AID in the agent's Habery and the remote key parameters it tracks"""
         try:
             ctrlHab = agent.hby.makeSignifyHab(
                 name=agent.caid, ns="agent", serder=icp, sigers=[siger]
             )
         except Exception:
-            self.agency.delete(agent)
             raise falcon.HTTPBadRequest(
                 title="invalid inception",
                 description=f"invalid icp event for caid {agent.caid}",
             )
 
         if ctrlHab.pre != agent.caid:
-            self.agency.delete(agent)
             raise falcon.HTTPBadRequest(
                 title="invalid inception",
                 description=f"invalid icp event for caid {agent.caid}",
@@ -1778,9 +2921,6 @@ class BootEnd:
                 description="multisig groups not supported as agent controller"
             )
 
-        rep.status = falcon.HTTP_202
-        rep.data = json.dumps(asdict(agent.agentHab.kever.state())).encode("utf-8")
-
 
 class HealthEnd:
     """Health resource for determining that a container is live"""
@@ -1790,6 +2930,58 @@ class HealthEnd:
         resp.media = {"message": f"Health is okay. Time is {nowIso8601()}"}
 
 
+class MetricsEnd:
+    """Metrics resource reporting the resource usage of the agency"""
+
+    def __init__(self, agency):
+        self.agency = agency
+
+    def on_get(self, req, rep):
+        """
+        Agency metrics GET endpoint
+
+        Parameters:
+            req (Request): falcon.Request HTTP request
+            rep (Response): falcon.Response HTTP response
+
+        ---
+        summary: Report agency metrics
+        description: Report resident agent cache size, memory budget and hit, miss and eviction counters
+                     along with escrow processing runs, skips, deferrals, timing and sizes summed over
+                     resident agents
+        tags:
+           - Metrics
+        responses:
+           200:
+              description: Agency metrics
+        """
+        rep.status = falcon.HTTP_OK
+        escrows = dict()
+        for agent in self.agency.agents.values():
+            for name, stats in agent.escrower.stats().items():
+                totals = escrows.setdefault(name, dict.fromkeys(stats, 0))
+                for key, val in stats.items():
+                    totals[key] = (
+                        max(totals[key], val)
+                        if key in ("last", "backoff")
+                        else totals[key] + val
+                    )
+
+        rep.media = dict(
+            agents=self.agency.agents.stats(),
+            views=len(self.agency.views),
+            scheduler=self.agency.scheduler.stats(),
+            boots=dict(
+                workers=self.agency.bootWorkers,
+                pending=sum(not boot.done for boot in self.agency.boots.values()),
+            ),
+            keystores=self.agency.keystores.stats(),
+            reads=self.agency.offloader.stats(),
+            routes=len(self.agency.routes),
+            escrows=escrows,
+        )
+
+
 class KeyStateCollectionEnd:
     @staticmethod
     def on_get(req, rep):
@@ -1821,6 +3013,8 @@ class KeyStateCollectionEnd:
                         type: array
                         items:
                             $ref: '#/components/schemas/KeyStateRecord'
+           304:
+              description: Key states unchanged since the version tagged by If-None-Match
            400:
               description: Bad request, missing required fields
            404:
@@ -1834,13 +3028,14 @@ class KeyStateCollectionEnd:
 
         pres = req.params.get("pre")
         pres = pres if isinstance(pres, list) else [pres]
+        kevers = [agent.hby.kevers[pre] for pre in pres if pre in agent.hby.kevers]
 
-        states = []
-        for pre in pres:
-            if pre not in agent.hby.kevers:
-                continue
+        parts = [part for kever in kevers for part in kelParts(agent.hby.db, kever)]
+        if notModified(req, rep, etag("states", *parts)):
+            return
 
-            kever = agent.hby.kevers[pre]
+        states = []
+        for kever in kevers:
             states.append(asdict(kever.state()))
 
         rep.status = falcon.HTTP_200
@@ -1884,6 +3079,14 @@ class KeyEventRecord:
 
 
 class KeyEventCollectionEnd:
+    # Response formats by media type, the first is the default
+    Kinds = {
+        "application/json": "json",
+        "application/x-ndjson": "ndjson",
+        "application/cesr": "cesr",
+    }
+    MediaTypes = {kind: media for media, kind in Kinds.items()}
+
     @staticmethod
     def on_get(req, rep):
         """
@@ -1905,15 +3108,44 @@ class KeyEventCollectionEnd:
               type: string
             required: true
             description: qb64 identifier prefix of KEL to load
+          - in: query
+            name: fn
+            schema:
+              type: integer
+            required: false
+            description: first seen ordinal of the first event to return, defaults to 0
+          - in: query
+            name: sn
+            schema:
+              type: integer
+            required: false
+            description: sequence number of the first event to return, defaults to 0
+          - in: query
+            name: limit
+            schema:
+              type: integer
+            required: false
+            description: maximum number of events to return, defaults to all
         responses:
            200:
-              description: Key event log and key state of identifier
+              description: Key event log and key state of identifier, streamed as a JSON array, as
+                           one JSON event record per line when NDJSON is accepted or as the raw CESR
+                           event messages when CESR is accepted
               content:
                 application/json:
                     schema:
                         type: array
                         items:
                             $ref: '#/components/schemas/KeyEventRecord'
+                application/x-ndjson:
+                    schema:
+                        $ref: '#/components/schemas/KeyEventRecord'
+                application/cesr:
+                    schema:
+                        type: string
+                        format: binary
+           304:
+              description: Key event log unchanged since the version tagged by If-None-Match
            404:
               description: Identifier not found in Key event database
 
@@ -1924,19 +3156,96 @@ class KeyEventCollectionEnd:
             raise falcon.HTTPBadRequest(description="required parameter 'pre' missing")
 
         pre = req.params.get("pre")
-        preb = pre.encode("utf-8")
-        events = []
-        for _, fn, dig in agent.hby.db.getFelItemPreIter(preb, fn=0):
-            if not (raw := agent.hby.db.cloneEvtMsg(pre=preb, fn=fn, dig=dig)):
-                raise falcon.HTTPInternalServerError(f"Missing event for dig={dig}.")
+        fn = req.get_param_as_int("fn", min_value=0, default=0)
+        sn = req.get_param_as_int("sn", min_value=0, default=0)
+        limit = req.get_param_as_int("limit", min_value=0, default=None)
+        kind = KeyEventCollectionEnd.Kinds.get(
+            req.client_prefers(list(KeyEventCollectionEnd.Kinds)), "json"
+        )
+
+        rep.vary = ("Accept",)
+        if (kever := agent.hby.kevers.get(pre)) is not None:
+            parts = kelParts(agent.hby.db, kever)
+            if notModified(req, rep, etag("events", kind, fn, sn, limit, *parts)):
+                return
 
-            serder = serdering.SerderKERI(raw=bytes(raw))
-            atc = raw[serder.size :]
-            events.append(dict(ked=serder.ked, atc=atc.decode("utf-8")))
+        stream = KeyEventCollectionEnd.stream(
+            agent.hby.db, pre.encode("utf-8"), fn=fn, sn=sn, limit=limit, kind=kind
+        )
+        # read the first chunk here so an error before any of the body is sent fails the request
+        head = next(stream, b"")
 
         rep.status = falcon.HTTP_200
-        rep.content_type = "application/json"
-        rep.data = json.dumps(events).encode("utf-8")
+        rep.content_type = KeyEventCollectionEnd.MediaTypes[kind]
+        rep.stream = itertools.chain((head,), stream)
+
+    @staticmethod
+    def stream(db, preb, fn=0, sn=0, limit=None, kind="json", size=65536):
+        """
+        Generates the events of the KEL of preb in first seen order in chunks of about size bytes
+        so a long KEL is never held in memory at once, formatted by kind as:
+            json: JSON array of event records
+            ndjson: one JSON event record per line
+            cesr: the stored CESR messages, events with their attachments, copied as they are
+
+        An event at sequence number sn has at least sn events before it in first seen order so the
+        iteration starts at the larger of fn and sn and skips events until the first at or beyond
+        sn.  Only the skipped events are parsed in cesr form.
+
+        Errors reading the KEL are raised, so the body of a KEL cut short by a missing or corrupt
+        event is never ended like a complete KEL, the JSON array is left open and the asyncio
+        server aborts the connection.
+
+        Parameters:
+            db (Baser): KEL database
+            preb (bytes): qb64b identifier prefix of the KEL
+            fn (int): first seen ordinal of the first event
+            sn (int): sequence number of the first event
+            limit (int | None): maximum number of events, None means all
+            kind (str): response format, json, ndjson or cesr
+            size (int): chunk size in bytes
+        """
+        chunk = bytearray(b"[") if kind == "json" else bytearray()
+        count = 0
+        skipping = sn > 0
+        try:
+            for _, on, dig in db.getFelItemPreIter(preb, fn=max(fn, sn)):
+                if limit is not None and count >= limit:
+                    break
+
+                raw = db.cloneEvtMsg(pre=preb, fn=on, dig=dig)
+                if kind == "cesr" and not skipping:
+                    chunk.extend(raw)
+                else:
+                    serder = serdering.SerderKERI(raw=bytes(raw))
+                    if skipping and serder.sn < sn:
+                        continue
+                    skipping = False
+
+                    if kind == "cesr":
+                        chunk.extend(raw)
+                    else:
+                        atc = memoryview(raw)[serder.size :]
+                        event = json.dumps(dict(ked=serder.ked, atc=str(atc, "utf-8")))
+                        if kind == "ndjson":
+                            chunk.extend(f"{event}\n".encode("utf-8"))
+                        else:
+                            chunk.extend(
+                                f"{', ' if count else ''}{event}".encode("utf-8")
+                            )
+                count += 1
+
+                if len(chunk) >= size:
+                    yield bytes(chunk)
+                    chunk.clear()
+        except (kering.KeriError, lmdb.Error) as ex:
+            logger.error(f"Error streaming KEL of {preb.decode('utf-8')}: {ex}")
+            raise
+
+        if kind == "json":
+            chunk.extend(b"]")
+        if chunk:
+            yield bytes(chunk)
 
 
 class OOBICollectionEnd:
@@ -22,7 +22,7 @@ from keri.db import basing
 from marshmallow import fields
 from marshmallow_dataclass import class_schema
 
-from ..core import longrunning, httping
+from ..core import longrunning, httping, offloading
 from ..utils.openapi import namedtupleToEnum, dataclassFromFielddom
 from keri.core.serdering import Protocols, Vrsn_1_0, Vrsn_2_0, SerderKERI
 
@@ -885,6 +885,8 @@ class IdentifierResourceEnd:
                     application/json:
                         schema:
                             $ref: '#/components/schemas/HabState'
+            304:
+                description: The identifier is unchanged since the version tagged by If-None-Match.
             400:
                 description: Bad request. This could be due to a missing or invalid name parameter.
             404:
@@ -904,6 +906,9 @@ class IdentifierResourceEnd:
                 description=f"{name} is not a valid identifier name or prefix"
             )
 
+        if httping.notModified(req, rep, identifierTag(hab)):
+            return
+
         data = info(hab, agent.mgr, full=True)
         rep.status = falcon.HTTP_200
         rep.content_type = "application/json"
@@ -1265,6 +1270,22 @@ class IdentifierResourceEnd:
         )
 
 
+def identifierTag(hab):
+    """
+    Returns the entity tag of the full state of hab, which changes with its name and every event
+    or witness receipt accepted into its KEL or, for a group, into the KEL of its local member.
+
+    Parameters:
+        hab (SignifyHab | SignifyGroupHab): identifier
+    """
+    parts = [hab.name, hab.pre]
+    if hab.accepted:
+        parts.extend(httping.kelParts(hab.db, hab.kevers[hab.pre]))
+    if isinstance(hab, habbing.SignifyGroupHab):
+        parts.append(identifierTag(hab.mhab))
+    return httping.etag("identifier", *parts)
+
+
 def info(hab, rm, full=False):
     data = dict(
         name=hab.name,
@@ -2208,6 +2229,7 @@ class Contact:
 
 
 class ContactCollectionEnd:
+    @offloading.offload("contacts")
     def on_get(self, req, rep):
         """Contact plural GET endpoint
 
@@ -0,0 +1,280 @@
+# -*- encoding: utf-8 -*-
+"""
+KERIA
+keria.app.batching module
+
+Batched admin requests dispatched through the falcon router under one signed envelope
+"""
+
+import base64
+import io
+import json
+from urllib.parse import unquote
+
+import falcon
+
+from keria import ogler, log_name
+from keria.core import httping
+from keria.core.authing import AuthMode
+
+logger = ogler.getLogger(log_name)
+
+
+def loadEnds(app):
+    batchEnd = BatchEnd(app=app)
+    app.add_route("/batch", batchEnd)
+
+
+class BatchEnd:
+    """
+    Resource dispatching the sub-requests of one signed request through the router of the admin
+    app.  The envelope is authenticated and its response signed once, by the authentication
+    middleware, so sub-requests skip the middleware and run with the agent of the envelope.
+
+    Sub-requests run in order so writes are visible to later reads of the same batch.  Offloadable
+    reads run inline, as every sub-request is dispatched before any response is rendered so each
+    offloaded read would hold a permit of its route until the batch completes and refuse the rest.
+    """
+
+    # Maximum number of sub-requests in one batch
+    MaxRequests = 50
+
+    def __init__(self, app):
+        """
+        Parameters:
+            app (falcon.App): admin app routing the sub-requests
+        """
+        self.app = app
+
+    def on_post(self, req, rep):
+        """Batch POST endpoint
+
+        Parameters:
+            req (Request): falcon.Request HTTP request
+            rep (Response): falcon.Response HTTP response
+
+        ---
+        summary: Run a batch of admin requests
+        description: Runs the admin requests of the batch in order under the signature of the
+                     batch request and returns their responses in the same order
+        tags:
+           - Batch
+        requestBody:
+            required: true
+            content:
+              application/json:
+                schema:
+                  type: object
+                  properties:
+                    requests:
+                      type: array
+                      items:
+                        type: object
+                        properties:
+                          method:
+                            type: string
+                            description: HTTP method, defaults to GET
+                          path:
+                            type: string
+                            description: path and query string of the request
+                          headers:
+                            type: object
+                            description: request headers
+                          body:
+                            description: JSON request body
+                        required:
+                          - path
+        responses:
+           200:
+              description: Responses of the requests of the batch in order
+              content:
+                  application/json:
+                    schema:
+                      type: object
+                      properties:
+                        responses:
+                          type: array
+                          items:
+                            type: object
+                            properties:
+                              status:
+                                type: integer
+                              headers:
+                                type: object
+                              encoding:
+                                type: string
+                                description: base64 when the body is not UTF-8 text and is sent base64 encoded
+                              body:
+                                description: JSON response body, or the body as a string for other media types
+           400:
+              description: Malformed batch or too many requests
+        """
+        if getattr(req.context, "batched", False):
+            raise falcon.HTTPBadRequest(description="batches can not be nested")
+
+        body = req.get_media()
+        subs = httping.getRequiredParam(body, "requests")
+        if not isinstance(subs, list):
+            raise falcon.HTTPBadRequest(description="'requests' must be a list")
+        if len(subs) > self.MaxRequests:
+            raise falcon.HTTPBadRequest(
+                description=f"batch of {len(subs)} requests exceeds limit of {self.MaxRequests}"
+            )
+
+        for sub in subs:
+            path = sub.get("path") if isinstance(sub, dict) else None
+            if not isinstance(path, str) or not path.startswith("/"):
+                raise falcon.HTTPBadRequest(
+                    description="each request requires an absolute 'path'"
+                )
+            # routed on the decoded path, see .dispatch
+            if unquote(path.partition("?")[0]).rstrip("/") == "/batch":
+                raise falcon.HTTPBadRequest(description="batches can not be nested")
+
+        reps = [self.dispatch(req, rep, sub) for sub in subs]
+
+        rep.status = falcon.HTTP_200
+        rep.content_type = "application/json"
+        streaming = any(srep.stream is not None for srep in reps)
+        if streaming and getattr(req.context, "mode", None) != AuthMode.ESSR:
+            rep.stream = self.render(reps)
+        else:
+            # ESSR encrypts the full body and runs offloadable reads inline
+            rep.data = b"".join(self.render(reps))
+
+    def dispatch(self, req, rep, sub):
+        """
+        Routes and runs one sub-request with the agent of the batch request
+
+        Parameters:
+            req (Request): batch request
+            rep (Response): batch response
+            sub (dict): sub-request with path and optional method, headers and JSON body
+
+        Returns:
+            falcon.Response: response of the sub-request
+        """
+        method = sub.get("method", "GET").upper()
+        path, _, query = sub["path"].partition("?")
+        body = sub.get("body")
+        raw = json.dumps(body).encode("utf-8") if body is not None else b""
+
+        environ = {
+            key: val
+            for key, val in req.env.items()
+            if not key.startswith("HTTP_")
+            and key not in ("CONTENT_TYPE", "CONTENT_LENGTH")
+        }
+        environ.update(
+            {
+                "wsgi.input": io.BytesIO(raw),
+                "REQUEST_METHOD": method,
+                "PATH_INFO": unquote(path),
+                "QUERY_STRING": query,
+                "CONTENT_TYPE": "application/json" if raw else "",
+                "CONTENT_LENGTH": str(len(raw)),
+            }
+        )
+        for key, val in (sub.get("headers") or {}).items():
+            key = key.replace("-", "_").upper()
+            if key not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+                key = "HTTP_" + key
+            environ[key] = str(val)
+
+        sreq = type(req)(environ, options=req.options)
+        sreq.context.agent = req.context.agent
+        sreq.context.mode = getattr(req.context, "mode", None)
+        sreq.context.batched = True
+        srep = falcon.Response(options=rep.options)
+
+        try:
+            route = self.app._router.find(sreq.path, req=sreq)
+            if route is None:
+                raise falcon.HTTPNotFound(description=f"{sreq.path} not found")
+
+            _, methods, params, _ = route
+            responder = methods.get(method)
+            if responder is None:
+                raise falcon.HTTPMethodNotAllowed(allowed_methods=list(methods))
+
+            responder(sreq, srep, **params)
+            if srep.content_type == "text/event-stream":
+                srep.stream.close()
+                raise falcon.HTTPBadRequest(
+                    description="event streams can not be batched"
+                )
+        except falcon.HTTPError as ex:
+            srep = falcon.Response(options=rep.options)
+            srep.status = ex.status
+            srep.content_type = falcon.MEDIA_JSON
+            srep.data = ex.to_json()
+            for key, val in (ex.headers or {}).items():
+                srep.set_header(key, val)
+        except Exception as ex:
+            logger.exception(f"Batched {method} {path} failed: {ex}")
+            srep = falcon.Response(options=rep.options)
+            srep.status = falcon.HTTP_500
+            srep.content_type = falcon.MEDIA_JSON
+            srep.data = falcon.HTTPInternalServerError().to_json()
+
+        return srep
+
+    @staticmethod
+    def render(reps):
+        """
+        Generates the JSON batch response from the sub-responses in order.  Yields empty chunks
+        while a sub-response stream has nothing ready, which the HTTP server skips.  Bodies that are
+        not valid JSON are sent as a string, base64 encoded when they are not UTF-8 text.
+
+        Parameters:
+            reps (list[falcon.Response]): responses of the sub-requests
+        """
+        yield b'{"responses":['
+        for i, srep in enumerate(reps):
+            chunks = []
+            if srep.stream is not None:
+                for chunk in srep.stream:
+                    if not chunk:
+                        yield b""
+                        continue
+                    chunks.append(chunk)
+                if hasattr(srep.stream, "close"):
+                    srep.stream.close()
+            elif (data := srep.render_body()) is not None:
+                chunks.append(data)
+
+            status = getattr(srep.stream, "_status", None) or srep.status
+            headers = dict(srep.headers)
+            headers["content-type"] = (
+                srep.content_type or srep.options.default_media_type
+            )
+            headers.update(getattr(srep.stream, "_headers", None) or {})
+
+            data = b"".join(chunks)
+            mediaType = headers["content-type"].split(";", 1)[0].strip()
+            head = dict(status=falcon.http_status_to_code(status), headers=headers)
+            if not data:
+                data = b"null"
+            elif not BatchEnd.isJson(mediaType, data):
+                try:
+                    data = json.dumps(data.decode("utf-8")).encode("utf-8")
+                except UnicodeDecodeError:
+                    head["encoding"] = "base64"
+                    data = b'"' + base64.b64encode(data) + b'"'
+
+            head = json.dumps(head)
+            yield (b"," if i else b"") + head[:-1].encode("utf-8") + b',"body":'
+            yield data + b"}"
+
+        yield b"]}"
+
+    @staticmethod
+    def isJson(mediaType, data):
+        """Returns True if data of mediaType can be embedded in the batch response as is"""
+        if not (mediaType == "application/json" or mediaType.endswith("+json")):
+            return False
+        try:  # handlers may set a plain text body without changing the default media type
+            json.loads(data)
+        except ValueError:
+            return False
+        return True
@@ -0,0 +1,85 @@
+# -*- encoding: utf-8 -*-
+"""
+KERIA
+keria.cli.commands module
+
+Migrates the KERIA owned stores of every agent into the shared agency store used by consolidated storage mode
+"""
+
+import argparse
+
+from hio.base import doing
+from keri import help
+from keri.app import directing
+from keri.db import dbing
+
+from keria.core import keeping, longrunning
+from keria.db import basing
+
+logger = help.ogler.getLogger()
+
+parser = argparse.ArgumentParser(
+    description="Migrates the credential and exchange indexes, long running operations and remote key indexes of "
+    "every agent from their own databases into the shared agency database used with consolidated storage"
+)
+parser.set_defaults(handler=lambda args: handler(args))
+parser.add_argument(
+    "--base",
+    "-b",
+    help="additional optional prefix to file location of KERI keystore",
+    required=False,
+    default="",
+)
+parser.add_argument(
+    "--clear",
+    action="store_true",
+    required=False,
+    default=False,
+    help="Remove the per agent databases once migrated",
+)
+
+# KERIA owned per agent stores kept in the shared agency store in consolidated storage mode
+Stores = (basing.Seeker, basing.ExnSeeker, longrunning.Operator, keeping.RemoteKeeper)
+
+
+def handler(args):
+    kwa = dict(args=args)
+    return directing.runController([doing.doify(consolidate, **kwa)], expire=0.0)
+
+
+def dedicated(klas, name, base):
+    """Opens the dedicated environment of a klas store of an agent without opening its sub databases"""
+    dber = dbing.LMDBer(name=name, base=base, temp=False, reopen=False)
+    dber.TailDirPath = klas.TailDirPath
+    dber.AltTailDirPath = klas.AltTailDirPath
+    dber.MaxNamedDBs = klas.MaxNamedDBs
+    dber.reopen()
+    return dber
+
+
+def consolidate(tymth, tock=0.0, **opts):
+    _ = yield tock
+    args = opts["args"]
+
+    adb = basing.AgencyBaser(name="TheAgency", base=args.base, reopen=True, temp=False)
+    store = basing.AgencyStore(
+        name="TheAgency", base=args.base, reopen=True, temp=False
+    )
+
+    caids = [caid for (caid,), _ in adb.agnt.getItemIter()]
+    print(f"Migrating {len(caids)} agents into {store.path}")
+
+    for caid in caids:
+        for klas in Stores:
+            dber = dedicated(klas, name=caid, base=args.base)
+            if not basing.subdbNames(dber.env):  # never created for this agent
+                dber.close(clear=True)
+                continue
+
+            count = store.migrate(caid, dber)
+            print(f"\t{caid} {klas.__name__}: {count} entries")
+            dber.close(clear=args.clear)
+
+    store.close()
+    adb.close()
+    print("Done, start KERIA with --consolidated to use the shared agency database")
@@ -0,0 +1,154 @@
+# -*- encoding: utf-8 -*-
+"""
+KERIA
+keria.cli.commands module
+
+Drops and rebuilds the credential indexes of one or every agent
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from hio.base import doing
+from keri import help
+from keri.app import directing
+from keri.db import basing
+from keri.vdr import viring
+
+from keria.db import basing as abase
+
+logger = help.ogler.getLogger()
+
+parser = argparse.ArgumentParser(
+    description="Drops and rebuilds the credential indexes of the Seeker of one or every agent from their saved "
+    "credentials, after schema changes, index corruption or a KERIA upgrade.  Stop KERIA before reindexing"
+)
+parser.set_defaults(handler=lambda args: handler(args))
+parser.add_argument(
+    "--base",
+    "-b",
+    help="additional optional prefix to file location of KERI keystore",
+    required=False,
+    default="",
+)
+parser.add_argument(
+    "--tenant",
+    "-t",
+    help="controller AID of the agent to reindex, every agent of the agency when not provided",
+    required=False,
+    default=None,
+)
+parser.add_argument(
+    "--consolidated",
+    action="store_true",
+    required=False,
+    default=False,
+    help="Rebuild the indexes kept in the shared agency database of consolidated storage mode",
+)
+parser.add_argument(
+    "--workers",
+    "-w",
+    type=int,
+    required=False,
+    default=os.cpu_count() or 1,
+    help="Number of processes reindexing agents in parallel. Default is the number of CPUs",
+)
+parser.add_argument(
+    "--batch",
+    type=int,
+    required=False,
+    default=10000,
+    help="Number of credentials indexed per write transaction. Default is 10000",
+)
+
+
+def handler(args):
+    kwa = dict(args=args)
+    return directing.runController([doing.doify(reindex, **kwa)], expire=0.0)
+
+
+def reindexTenant(caid, base, consolidated, batch):
+    """
+    Rebuilds the Seeker indexes of the agent of caid
+
+    Returns:
+        tuple: caid, number of credentials indexed, number that failed and seconds taken
+    """
+    start = time.perf_counter()
+    db = basing.Baser(name=caid, base=base, temp=False, reopen=True)
+    reger = viring.Reger(
+        name=f"agent-{caid}", base=base, db=db, temp=False, reopen=True
+    )
+    store = (
+        abase.AgencyStore(name="TheAgency", base=base, reopen=True, temp=False)
+        if consolidated
+        else None
+    )
+    seeker = abase.Seeker(
+        name=caid,
+        base=base,
+        db=db,
+        reger=reger,
+        reopen=True,
+        temp=False,
+        store=store,
+        tenant=caid,
+    )
+
+    try:
+        indexed, failed = seeker.reindex(batch=batch)
+    finally:
+        seeker.close()
+        if store is not None:
+            store.close()
+        reger.close()
+        db.close()
+
+    return caid, indexed, failed, time.perf_counter() - start
+
+
+def reindex(tymth, tock=0.0, **opts):
+    _ = yield tock
+    args = opts["args"]
+
+    if args.tenant is not None:
+        caids = [args.tenant]
+    else:
+        adb = abase.AgencyBaser(
+            name="TheAgency", base=args.base, reopen=True, temp=False
+        )
+        caids = [caid for (caid,), _ in adb.agnt.getItemIter()]
+        adb.close()
+
+    workers = max(1, min(args.workers, len(caids)))
+    print(f"Reindexing the credentials of {len(caids)} agents with {workers} workers")
+
+    start = time.perf_counter()
+    total = 0
+    jobs = [(caid, args.base, args.consolidated, args.batch) for caid in caids]
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    results = (
+        pool.map(reindexTenant, *zip(*jobs))
+        if pool is not None
+        else (reindexTenant(*job) for job in jobs)
+    )
+
+    # Reported as each agent is done
+    for caid, indexed, failed, elapsed in results:
+        total += indexed
+        rate = indexed / elapsed if elapsed else 0.0
+        print(
+            f"\t{caid}: {indexed} credentials indexed, {failed} failed in {elapsed:.2f}s "
+            f"({rate:.0f} credentials/s)"
+        )
+
+    if pool is not None:
+        pool.shutdown()
+
+    elapsed = time.perf_counter() - start
+    rate = total / elapsed if elapsed else 0.0
+    print(
+        f"Done, {total} credentials indexed in {elapsed:.2f}s ({rate:.0f} credentials/s)"
+    )
@@ -13,7 +13,7 @@ import os
 from keri import __version__
 from keri import help
 
-from keria.app import agenting
+from keria.app import agenting, sharding
 
 d = "Runs KERI Signify Agent\n"
 d += "\tExample:\nkli ahab\n"
@@ -119,6 +119,127 @@ parser.add_argument(
     help="path of the log file. If not defined, logs will not be written to the file.",
 )
 parser.add_argument("--logrequests", help="log HTTP requests", action="store_true")
+parser.add_argument(
+    "--max-agents",
+    dest="maxAgents",
+    action="store",
+    type=int,
+    default=os.getenv("KERIA_MAX_AGENTS", "0"),
+    help="Maximum number of resident agents before the least recently used are evicted. Default is 0 (unbounded)",
+)
+parser.add_argument(
+    "--max-agent-memory",
+    dest="maxAgentMemory",
+    action="store",
+    type=int,
+    default=os.getenv("KERIA_MAX_AGENT_MEMORY", "0"),
+    help="Approximate memory budget in bytes for resident agents before the least recently used are evicted."
+    " Default is 0 (unbounded)",
+)
+parser.add_argument(
+    "--consolidated",
+    action="store_true",
+    default=os.getenv("KERIA_CONSOLIDATED", "false").lower() in ("true", "1"),
+    help="Keep the indexes, operations and remote key indexes of all agents in one shared agency database."
+    " Migrate existing agents first with 'keria consolidate'",
+)
+parser.add_argument(
+    "--workers",
+    action="store",
+    type=int,
+    default=os.getenv("KERIA_WORKERS", "1"),
+    help="Number of Agency worker processes, each owning a shard of the agents, behind a front router on the"
+    " admin, boot and HTTP ports. Worker i listens on the ports offset by 10 * (i + 1). Default is 1 (no sharding)",
+)
+parser.add_argument(
+    "--tick-budget",
+    dest="tickBudget",
+    action="store",
+    type=float,
+    default=os.getenv("KERIA_TICK_BUDGET", "0.0"),
+    help="Time budget in seconds per loop tick shared fairly between the background work of all agents,"
+    " agents with recent admin requests first. Default is 0.0 (unbounded)",
+)
+parser.add_argument(
+    "--boot-workers",
+    dest="bootWorkers",
+    action="store",
+    type=int,
+    default=os.getenv("KERIA_BOOT_WORKERS", "4"),
+    help="Number of threads provisioning agents for boot requests sent with Prefer: respond-async,"
+    " 0 boots every agent synchronously. Default is 4",
+)
+parser.add_argument(
+    "--keystore-pool",
+    dest="keystorePool",
+    action="store",
+    type=int,
+    default=os.getenv("KERIA_KEYSTORE_POOL", "0"),
+    help="Number of pre-created agent keystores kept ready in the background to speed up boot."
+    " Default is 0 (no pool)",
+)
+parser.add_argument(
+    "--read-workers",
+    dest="readWorkers",
+    action="store",
+    type=int,
+    default=os.getenv("KERIA_READ_WORKERS", "4"),
+    help="Number of threads running heavy read-only admin requests, like credential queries and"
+    " exports, off the HTTP server loop. Default is 4, 0 runs them inline",
+)
+parser.add_argument(
+    "--server",
+    dest="server",
+    action="store",
+    choices=("hio", "asyncio"),
+    default=os.getenv("KERIA_SERVER", "hio"),
+    help="HTTP server running the boot, admin and HTTP apps. 'asyncio' serves them from an asyncio event"
+    " loop with HTTP/1.1 keep-alive and pipelining, driving the Agency from the same loop. Default is hio",
+)
+parser.add_argument(
+    "--keep-alive",
+    dest="keepAlive",
+    action="store",
+    type=float,
+    default=os.getenv("KERIA_KEEP_ALIVE", "75.0"),
+    help="Seconds idle keep-alive connections stay open with the asyncio server. Default is 75.0",
+)
+parser.add_argument(
+    "--compress-min-size",
+    dest="compressMinSize",
+    action="store",
+    type=int,
+    default=os.getenv("KERIA_COMPRESS_MIN_SIZE", "1024"),
+    help="Smallest response body in bytes compressed with gzip, or zstd when the zstandard package is"
+    " installed, for clients sending Accept-Encoding. Default is 1024, 0 disables compression",
+)
+parser.add_argument(
+    "--operation-ttl",
+    dest="operationTtl",
+    action="store",
+    type=int,
+    default=os.getenv("KERIA_OPERATION_TTL", "604800"),
+    help="Seconds done long running operations are kept before they are garbage collected. Default is"
+    " 604800 (7 days), 0 keeps them until deleted",
+)
+parser.add_argument(
+    "--operation-pending-ttl",
+    dest="operationPendingTtl",
+    action="store",
+    type=int,
+    default=os.getenv("KERIA_OPERATION_PENDING_TTL", "0"),
+    help="Seconds long running operations may stay pending before they fail with a time out. Default"
+    " is 0, operations stay pending until done",
+)
+parser.add_argument(
+    "--idle-wait",
+    dest="idleWait",
+    action="store",
+    type=float,
+    default=os.getenv("KERIA_IDLE_WAIT", "1.0"),
+    help="Longest wait in seconds of the run loop when no agent has work, requests and queued work wake it"
+    " immediately. Default is 1.0, 0 cycles every tock",
+)
 parser.add_argument(
     "--experimental-boot-password",
     help="Experimental password for boot endpoint. Enables HTTP Basic Authentication for the boot endpoint. Only meant to be used for testing purposes.",
@@ -137,31 +258,47 @@ logger = help.ogler.getLogger()
 
 
 def launch(args):
-    agenting.runAgency(
-        agenting.KERIAServerConfig(
-            name=args.name or "ahab",
-            base=args.base or "",
-            bran=args.bran,
-            adminPort=args.admin,
-            httpPort=args.http,
-            bootPort=args.boot,
-            configFile=args.configFile,
-            configDir=args.configDir,
-            keyPath=args.keypath,
-            certPath=args.certpath,
-            caFilePath=args.cafilepath,
-            logLevel=args.loglevel,
-            logFile=args.logfile,
-            logRequests=args.logrequests if args.logrequests else False,
-            cors=os.getenv("KERI_AGENT_CORS", "false").lower() in ("true", "1"),
-            releaseTimeout=int(os.getenv("KERIA_RELEASER_TIMEOUT", "86400")),
-            curls=getListVariable("KERIA_CURLS"),
-            iurls=getListVariable("KERIA_IURLS"),
-            durls=getListVariable("KERIA_DURLS"),
-            bootPassword=args.bootPassword,
-            bootUsername=args.bootUsername,
-        )
+    config = agenting.KERIAServerConfig(
+        name=args.name or "ahab",
+        base=args.base or "",
+        bran=args.bran,
+        adminPort=args.admin,
+        httpPort=args.http,
+        bootPort=args.boot,
+        configFile=args.configFile,
+        configDir=args.configDir,
+        keyPath=args.keypath,
+        certPath=args.certpath,
+        caFilePath=args.cafilepath,
+        logLevel=args.loglevel,
+        logFile=args.logfile,
+        logRequests=args.logrequests if args.logrequests else False,
+        cors=os.getenv("KERI_AGENT_CORS", "false").lower() in ("true", "1"),
+        releaseTimeout=int(os.getenv("KERIA_RELEASER_TIMEOUT", "86400")),
+        maxAgents=args.maxAgents,
+        maxAgentMemory=args.maxAgentMemory,
+        consolidated=args.consolidated,
+        curls=getListVariable("KERIA_CURLS"),
+        iurls=getListVariable("KERIA_IURLS"),
+        durls=getListVariable("KERIA_DURLS"),
+        bootPassword=args.bootPassword,
+        bootUsername=args.bootUsername,
+        workers=args.workers,
+        tickBudget=args.tickBudget,
+        bootWorkers=args.bootWorkers,
+        keystorePool=args.keystorePool,
+        readWorkers=args.readWorkers,
+        idleWait=args.idleWait,
+        server=args.server,
+        keepAlive=args.keepAlive,
+        compressMinSize=args.compressMinSize,
+        operationTtl=args.operationTtl,
+        operationPendingTtl=args.operationPendingTtl,
     )
+    if config.workers > 1:
+        sharding.runShards(config)
+    else:
+        agenting.runAgency(config)
     logger.info("Agent %s gracefully stopped", args.name)
 
 
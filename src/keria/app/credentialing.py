@@ -20,7 +20,7 @@ from keri.vdr import viring
 
 from ..utils.openapi import dataclassFromFielddom
 from keri.core.serdering import Protocols, Vrsn_1_0, Vrsn_2_0, SerderKERI
-from ..core import httping, longrunning
+from ..core import httping, longrunning, offloading
 from marshmallow import fields, Schema as MarshmallowSchema
 from typing import List, Dict, Any, Optional, Literal, Union
 from .aiding import (
@@ -473,6 +473,8 @@ class RegistryResourceEnd:
                   application/json:
                     schema:
                       $ref: '#/components/schemas/Registry'
+           304:
+            description: The registry is unchanged since the version tagged by If-None-Match.
            404:
             description: The requested registry was not found.
         """
@@ -499,11 +501,18 @@ class RegistryResourceEnd:
                 description=f"{registryName} is not a valid registry for AID {name}"
             )
 
+        tever = registry.tever
+        tag = httping.etag(
+            "registry", registry.name, registry.regk, tever.sn, tever.serder.said
+        )
+        if httping.notModified(req, rep, tag):
+            return
+
         rd = dict(
             name=registry.name,
             regk=registry.regk,
             pre=registry.hab.pre,
-            state=asdict(registry.tever.state()),
+            state=asdict(tever.state()),
         )
         rep.status = falcon.HTTP_200
         rep.content_type = "application/json"
@@ -770,6 +779,7 @@ class CredentialQueryCollectionEnd:
     """
 
     @staticmethod
+    @offloading.offload("credentials.query", stores=("rgy", "seeker"))
     def on_post(req, rep):
         """Credentials GET endpoint
 
@@ -796,6 +806,28 @@ class CredentialQueryCollectionEnd:
                 type: string
              description:  schema to filter by if provided
              required: false
+        requestBody:
+            required: false
+            content:
+              application/json:
+                schema:
+                  type: object
+                  properties:
+                    filter:
+                      type: object
+                      description: The filter criteria to apply on the credentials.
+                    sort:
+                      type: array
+                      description: The fields to sort the credentials by.
+                    skip:
+                      type: integer
+                      description: The number of credentials to skip. (default=0)
+                    limit:
+                      type: integer
+                      description: The maximum number of credentials to return. (default=25)
+                    after:
+                      type: string
+                      description: SAID of the last credential of the previous page to continue after
         responses:
            200:
               description: Credential list.
@@ -830,13 +862,21 @@ class CredentialQueryCollectionEnd:
                 limit = body["limit"]
             else:
                 limit = 25
+
+            if "after" in body:
+                after = body["after"]
+            else:
+                after = None
         except falcon.HTTPError:
             filtr = {}
             sort = {}
             skip = 0
             limit = 25
+            after = None
 
-        cur = agent.seeker.find(filtr=filtr, sort=sort, skip=skip, limit=limit)
+        cur = agent.seeker.find(
+            filtr=filtr, sort=sort, skip=skip, limit=limit, after=after
+        )
         saids = [coring.Saider(qb64=said) for said in cur]
         creds = agent.rgy.reger.cloneCreds(saids=saids, db=agent.hby.db)
 
@@ -996,6 +1036,7 @@ class CredentialResourceEnd:
         """ """
 
     @staticmethod
+    @offloading.offload("credentials.export", stores=("rgy",))
     def on_get(req, rep, said):
         """Credentials GET endpoint
 
@@ -1024,6 +1065,10 @@ class CredentialResourceEnd:
                   application/json+cesr:
                     schema:
                         $ref: '#/components/schemas/Credential'
+                  application/cesr:
+                    schema:
+                        type: string
+                        format: binary
            404:
              description: The requested credential was not found.
         """
@@ -1035,8 +1080,8 @@ class CredentialResourceEnd:
                 description=f"credential for said {said} not found."
             )
 
-        if accept == "application/json+cesr":
-            rep.content_type = "application/json+cesr"
+        if accept in ("application/json+cesr", "application/cesr"):
+            rep.content_type = accept
             data = CredentialResourceEnd.outputCred(agent.hby, agent.rgy, said)
         else:
             rep.content_type = "application/json"
@@ -1068,31 +1113,19 @@ class CredentialResourceEnd:
 
         issr = creder.issuer
         for msg in hby.db.clonePreIter(pre=issr):
-            serder = serdering.SerderKERI(raw=msg)
-            atc = msg[serder.size :]
-            out.extend(serder.raw)
-            out.extend(atc)
+            out.extend(msg)
 
         if "i" in creder.attrib:
             subj = creder.attrib["i"]
             for msg in hby.db.clonePreIter(pre=subj):
-                serder = serdering.SerderKERI(raw=msg)
-                atc = msg[serder.size :]
-                out.extend(serder.raw)
-                out.extend(atc)
+                out.extend(msg)
 
         if creder.regi is not None:
             for msg in rgy.reger.clonePreIter(pre=creder.regi):
-                serder = serdering.SerderKERI(raw=msg)
-                atc = msg[serder.size :]
-                out.extend(serder.raw)
-                out.extend(atc)
+                out.extend(msg)
 
             for msg in rgy.reger.clonePreIter(pre=creder.said):
-                serder = serdering.SerderKERI(raw=msg)
-                atc = msg[serder.size :]
-                out.extend(serder.raw)
-                out.extend(atc)
+                out.extend(msg)
 
         out.extend(signing.serialize(creder, prefixer, seqner, saider))
 
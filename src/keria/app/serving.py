@@ -1,6 +1,12 @@
+import selectors
 import signal
+import socket
+import time
+from collections import deque
 
-from hio.base import doing
+from hio.base import doing, tyming
+from hio.core.http import clienting
+from hio.help import decking
 from keri import help
 
 logger = help.ogler.getLogger()
@@ -63,3 +69,281 @@ class GracefulShutdownDoer(doing.Doer):
         # Once shutdown_received is set, trigger agency shutdown which will eventually shut down
         # the Doist loop by throwing a KeyboardInterrupt
         return True  # Returns a "done" status
+
+
+class Waker:
+    """
+    Wakes an IdleDoist blocked waiting for work from the main loop or any thread.  The self pipe
+    socket pair is only created once an IdleDoist waits on it so waking is a flag update otherwise.
+
+    Attributes:
+        .pending (bool): True means work arrived since the IdleDoist last drained the waker
+    """
+
+    def __init__(self):
+        self.pending = False
+        self._rsock = None
+        self._wsock = None
+
+    def wake(self):
+        """Signals that work is pending"""
+        if self.pending:
+            return
+
+        self.pending = True
+        if self._wsock is not None:
+            try:
+                self._wsock.send(b"\x00")
+            except OSError:  # full, already readable
+                pass
+
+    def fileno(self):
+        """Returns the file descriptor to wait on for wakeups, opening the socket pair if needed"""
+        if self._rsock is None:
+            self._rsock, self._wsock = socket.socketpair()
+            self._rsock.setblocking(False)
+            self._wsock.setblocking(False)
+            if self.pending:
+                self._wsock.send(b"\x00")
+        return self._rsock.fileno()
+
+    def drain(self):
+        """Clears pending work, called by the IdleDoist before it runs the doers"""
+        self.pending = False
+        if self._rsock is None:
+            return
+
+        try:
+            while self._rsock.recv(4096):
+                pass
+        except OSError:  # empty
+            pass
+
+    def close(self):
+        for sock in (self._rsock, self._wsock):
+            if sock is not None:
+                sock.close()
+        self._rsock = self._wsock = None
+
+
+class WakingDeck(decking.Deck):
+    """Deck waking the IdleDoist through its waker whenever work is added to it"""
+
+    def __init__(self, iterable=(), maxlen=None, waker=None):
+        super(WakingDeck, self).__init__(iterable, maxlen)
+        self.waker = waker
+
+    def append(self, elem):
+        super(WakingDeck, self).append(elem)
+        if self.waker is not None:
+            self.waker.wake()
+
+    def extend(self, iterable):
+        super(WakingDeck, self).extend(iterable)
+        if self.waker is not None:
+            self.waker.wake()
+
+
+class IdleDoist(doing.Doist):
+    """
+    Doist that stops cycling when the agency has no work instead of running every doer once per tock.
+
+    While active it cycles once per tock like the Doist but waits for the rest of each tock on the
+    sockets of the HTTP servers, the sockets of outbound HTTP clients with I/O pending and the
+    waker, so a request, a response to an outbound request or a deck push starts the next cycle
+    right away.  After .linger seconds without socket activity, waker wakeups or responses still
+    being sent it goes idle and blocks until one of those happens or .idle seconds pass, so the
+    periodic work of timers, escrows and outbound clients still runs at least once every .idle
+    seconds.  Tyme follows real time so tyme based timers hold across idle waits.
+
+    Attributes:
+        .waker (Waker): woken when work is added from the loop or other threads
+        .servers (list): hio HTTP servers whose sockets are waited on
+        .idle (float): longest wait in seconds when idle
+        .linger (float): seconds to keep cycling every tock after the last activity
+    """
+
+    def __init__(self, waker, servers=None, idle=1.0, linger=2.0, **kwa):
+        """
+        Parameters:
+            waker (Waker): woken when work is added from the loop or other threads
+            servers (list | None): hio HTTP servers whose sockets are waited on
+            idle (float): longest wait in seconds when idle
+            linger (float): seconds to keep cycling every tock after the last activity
+        """
+        self.waker = waker
+        self.servers = servers if servers is not None else []
+        self.idle = idle
+        self.linger = linger
+        self.cycles = 0
+        self.waits = 0
+        self.selector = None
+        self.watched = dict()
+        self.origin = None
+        self.start = None
+        self.active = 0.0
+
+        super(IdleDoist, self).__init__(**kwa)
+        # cycles are paced on real time by .recur instead of Doist.do sleeping out each tock
+        self.real = False
+
+    def enter(self, doers=None):
+        self.origin, self.start = self.tyme, time.monotonic()
+        self.active = self.start
+        return super(IdleDoist, self).enter(doers=doers)
+
+    def exit(self, deeds=None):
+        try:
+            super(IdleDoist, self).exit(deeds=deeds)
+        finally:
+            if self.selector is not None:
+                self.selector.close()
+            self.selector = None
+            self.watched = dict()
+
+    def recur(self, deeds=None):
+        """
+        Runs the deeds once like Doist.recur and then, for the deeds of the run loop, waits for the
+        rest of the tock while active or up to .idle seconds once idle, see .pace
+        """
+        if deeds is not None:
+            return super(IdleDoist, self).recur(deeds=deeds)
+
+        self.waker.drain()
+        super(IdleDoist, self).recur()
+        self.cycles += 1
+        self.pace()
+
+    def pace(self):
+        """Waits after a cycle and keeps tyme on real time across the wait"""
+        if self.start is None:
+            self.origin, self.start = self.tyme, time.monotonic()
+            self.active = self.start
+
+        now = time.monotonic()
+        if self.waker.pending or self.busy():
+            self.active = now
+
+        if now - self.active < self.linger:
+            # outbound clients are serviced every cycle while active so only wait on them when idle
+            idle, timeout = False, max(0.0, self.timer.remaining)
+        else:
+            idle, timeout = True, self.idle
+            self.waits += 1
+
+        if timeout > 0.0 and self.wait(timeout, clients=idle):
+            self.active = time.monotonic()
+
+        self.tyme = max(self.tyme, self.origin + time.monotonic() - self.start)
+        self.timer.restart()
+
+    def sockets(self):
+        """Returns the listen and connection sockets of the HTTP servers"""
+        socks = []
+        for server in self.servers:
+            servant = getattr(server, "servant", None)
+            if servant is None:
+                continue
+            if (ss := getattr(servant, "ss", None)) is not None:
+                socks.append(ss)
+            for remoter in getattr(servant, "ixes", {}).values():
+                if (cs := getattr(remoter, "cs", None)) is not None:
+                    socks.append(cs)
+        return socks
+
+    def clients(self):
+        """
+        Returns (socket, events) of the outbound hio HTTP clients run by a ClientDoer anywhere in
+        the doer tree that have I/O pending, readable while awaiting a response and writable while
+        a request waits to be sent, which includes waiting for the connection to complete.  Walks
+        the doer tree of every resident agent, so only called before idle waits.
+        """
+        socks = []
+        stack = [self.deeds]
+        while stack:
+            for _, _, doer in stack.pop():
+                if isinstance(doer, clienting.ClientDoer):
+                    client = doer.client
+                    connector = client.connector
+                    if connector.cs is None:
+                        continue
+
+                    events = selectors.EVENT_READ if client.waited else 0
+                    if connector.txbs or client.requests:
+                        events |= selectors.EVENT_WRITE
+                    if events:
+                        socks.append((connector.cs, events))
+                elif (deeds := getattr(doer, "deeds", None)) is not None:
+                    stack.append(deeds)
+        return socks
+
+    def busy(self):
+        """
+        Returns True if a server is still sending or streaming a response.  Long lived streams
+        waiting on events, whose body iterator is .waiting, do not count as they wake the waker
+        when an event is queued.
+        """
+        for server in self.servers:
+            for responder in (getattr(server, "reps", None) or {}).values():
+                iterator = getattr(responder, "iterator", None)
+                if not getattr(responder, "ended", False) and not getattr(
+                    iterator, "waiting", False
+                ):
+                    return True
+            servant = getattr(server, "servant", None)
+            for remoter in getattr(servant, "ixes", {}).values():
+                if getattr(remoter, "txbs", None):
+                    return True
+        return False
+
+    def wait(self, timeout, clients=True):
+        """
+        Blocks up to timeout seconds until a server socket is readable, the waker is woken or, with
+        clients, an outbound client socket is ready for its pending I/O.  The selector is kept
+        across waits and only the sockets opened, closed or changed since the last wait are
+        registered or unregistered.
+
+        Parameters:
+            timeout (float): longest wait in seconds
+            clients (bool): True means wait on outbound client sockets too, see .clients
+
+        Returns:
+            bool: True means woken by activity, False means timed out
+        """
+        if self.selector is None:
+            self.selector = selectors.DefaultSelector()
+            self.selector.register(self.waker, selectors.EVENT_READ)
+            self.watched = dict()
+
+        wanted = {sock: selectors.EVENT_READ for sock in self.sockets()}
+        if clients:
+            for sock, events in self.clients():
+                wanted[sock] = wanted.get(sock, 0) | events
+        self.watch(wanted)
+
+        return bool(self.selector.select(timeout))
+
+    def watch(self, wanted):
+        """
+        Updates the registrations of the selector to the sockets and events of wanted, removing
+        sockets no longer wanted first so a closed socket whose descriptor was reused is replaced
+
+        Parameters:
+            wanted (dict): events to wait on keyed by socket
+        """
+        for sock, events in list(self.watched.items()):
+            if wanted.get(sock) != events:
+                del self.watched[sock]
+                try:
+                    self.selector.unregister(sock)
+                except (ValueError, KeyError, OSError):  # closed
+                    pass
+
+        for sock, events in wanted.items():
+            if sock in self.watched:
+                continue
+            try:
+                self.selector.register(sock, events)
+            except (ValueError, KeyError, OSError):  # closed or already registered
+                continue
+            self.watched[sock] = events
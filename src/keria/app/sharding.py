@@ -0,0 +1,326 @@
+# -*- encoding: utf-8 -*-
+"""
+KERIA
+keria.app.sharding module
+
+Sharded multi-process Agency.  Runs N Agency worker processes, each owning a consistent hash shard
+of controller AIDs, behind a thin front router listening on the admin, boot and HTTP ports that
+forwards each request to the worker owning its Agent.
+"""
+
+import bisect
+import dataclasses
+import hashlib
+import http.client
+import json
+import multiprocessing
+import signal
+import ssl
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from keria import ogler, log_name, set_log_level
+from keria.app import agenting
+from keria.db import basing
+
+logger = ogler.getLogger(log_name)
+
+# Offset between the ports of consecutive workers, worker i listens on port + PortStride * (i + 1)
+PortStride = 10
+
+# Request headers identifying the controller AID of an admin request and the destination of a KERI request
+SIGNIFY_RESOURCE_HEADER = "Signify-Resource"
+CESR_DESTINATION_HEADER = "CESR-DESTINATION"
+
+# Hop by hop headers not forwarded by the router
+HopHeaders = (
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailers",
+    "transfer-encoding",
+    "upgrade",
+)
+
+
+def hashKey(key):
+    """Returns the 64 bit ring position of key"""
+    return int.from_bytes(
+        hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+class ShardRing:
+    """
+    Consistent hash ring of worker shards.  Each shard is placed on the ring at a number of virtual
+    node positions so controller AIDs spread evenly and only ~1/N of them move when N changes.
+
+    Attributes:
+        .shards (int): number of worker shards
+        .replicas (int): number of virtual nodes per shard
+
+    """
+
+    def __init__(self, shards, replicas=64):
+        """
+        Parameters:
+            shards (int): number of worker shards
+            replicas (int): number of virtual nodes per shard
+        """
+        if shards < 1:
+            raise ValueError(f"invalid number of shards={shards}")
+
+        self.shards = shards
+        self.replicas = replicas
+
+        ring = sorted(
+            (hashKey(f"shard-{shard}-{replica}"), shard)
+            for shard in range(shards)
+            for replica in range(replicas)
+        )
+        self._positions = [position for position, _ in ring]
+        self._owners = [shard for _, shard in ring]
+
+    def shard(self, key):
+        """Returns the index of the shard owning key"""
+        idx = bisect.bisect(self._positions, hashKey(key)) % len(self._positions)
+        return self._owners[idx]
+
+    def assign(self, keys):
+        """Returns a list of the number of keys owned by each shard"""
+        counts = [0] * self.shards
+        for key in keys:
+            counts[self.shard(key)] += 1
+        return counts
+
+
+def workerConfig(config: agenting.KERIAServerConfig, index):
+    """
+    Returns the configuration of worker index.  Workers listen on localhost only, on ports offset
+    from the public ports, and leave TLS to the front router.
+    """
+    offset = PortStride * (index + 1)
+    return dataclasses.replace(
+        config,
+        adminPort=config.adminPort + offset,
+        httpPort=config.httpPort + offset if config.httpPort else None,
+        bootPort=config.bootPort + offset,
+        host="127.0.0.1",
+        keyPath=None,
+        certPath=None,
+        caFilePath=None,
+        workers=1,
+    )
+
+
+class Router:
+    """
+    Resolves the worker shard that owns the Agent a request is for.
+
+    Admin requests carry the controller AID in the Signify-Resource header, boot requests carry the
+    controller inception event in the body, KERI requests carry a managed or agent AID in the
+    CESR-DESTINATION header and OOBI requests carry one in the path.  Managed and agent AIDs are
+    mapped to their controller AID through the AgencyBaser shared with the workers.  Requests with
+    no tenant go to the first shard.
+    """
+
+    def __init__(self, ring, adb):
+        """
+        Parameters:
+            ring (ShardRing): consistent hash ring of the workers
+            adb (AgencyBaser): agency database shared with the workers
+        """
+        self.ring = ring
+        self.adb = adb
+
+    def caid(self, aid):
+        """Returns the controller AID of a controller, agent or managed AID"""
+        if (prefixer := self.adb.aids.get(keys=(aid,))) is not None:
+            return prefixer.qb64
+        if (prefixer := self.adb.ctrl.get(keys=(aid,))) is not None:
+            return prefixer.qb64
+        return aid
+
+    def resolve(self, method, path, headers, body=b""):
+        """
+        Returns the index of the worker shard for a request
+
+        Parameters:
+            method (str): HTTP method
+            path (str): request path without query
+            headers (Mapping): request headers, case insensitive
+            body (bytes): request body
+        """
+        if (caid := headers.get(SIGNIFY_RESOURCE_HEADER)) is not None:
+            return self.ring.shard(caid)
+
+        if (aid := headers.get(CESR_DESTINATION_HEADER)) is not None:
+            return self.ring.shard(self.caid(aid))
+
+        parts = [part for part in path.split("/") if part]
+        if len(parts) >= 2 and parts[0] == "oobi":
+            return self.ring.shard(self.caid(parts[1]))
+
+        if parts and parts[0] == "boot":
+            if len(parts) >= 2:
+                return self.ring.shard(parts[1])
+            if method == "POST" and body:
+                try:
+                    return self.ring.shard(json.loads(body)["icp"]["i"])
+                except (ValueError, KeyError, TypeError):
+                    pass
+
+        return 0
+
+
+def forwarder(router, ports, name):
+    """
+    Returns a request handler class forwarding requests to the worker ports chosen by router
+
+    Parameters:
+        router (Router): resolves the worker for each request
+        ports (list): port of this server on each worker
+        name (str): name of the server for logging
+    """
+
+    class ForwardHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            logger.debug(f"{name} router: {format % args}")
+
+        def forward(self):
+            length = int(self.headers.get("Content-Length", 0) or 0)
+            body = self.rfile.read(length) if length else b""
+
+            path = urlsplit(self.path).path
+            shard = router.resolve(self.command, path, self.headers, body)
+            headers = {
+                key: val
+                for key, val in self.headers.items()
+                if key.lower() not in HopHeaders
+            }
+
+            conn = http.client.HTTPConnection("127.0.0.1", ports[shard])
+            try:
+                conn.request(self.command, self.path, body=body, headers=headers)
+                rep = conn.getresponse()
+            except OSError as ex:
+                logger.error(f"{name} router: worker {shard} unavailable: {ex}")
+                self.send_error(502, f"worker {shard} unavailable")
+                return
+
+            try:
+                self.send_response(rep.status, rep.reason)
+                for key, val in rep.getheaders():
+                    # send_response already set Server and Date
+                    if key.lower() not in HopHeaders + ("server", "date"):
+                        self.send_header(key, val)
+
+                # Responses without a length, such as event streams, are delimited by closing
+                if rep.getheader("Content-Length") is None:
+                    self.send_header("Connection", "close")
+                    self.close_connection = True
+                self.end_headers()
+
+                while chunk := rep.read1(65536):
+                    self.wfile.write(chunk)
+                    self.wfile.flush()
+            finally:
+                conn.close()
+
+        do_GET = do_POST = do_PUT = do_DELETE = do_PATCH = do_HEAD = do_OPTIONS = (
+            forward
+        )
+
+    return ForwardHandler
+
+
+def createRouterServer(
+    port, router, ports, name, keypath=None, certpath=None, cafilepath=None
+):
+    """Create a threaded front router server on port forwarding to the worker ports"""
+    server = ThreadingHTTPServer(("", port), forwarder(router, ports, name))
+    server.daemon_threads = True
+    if keypath is not None and certpath is not None:
+        context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH, cafile=cafilepath)
+        context.load_cert_chain(certfile=certpath, keyfile=keypath)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+    return server
+
+
+def runShards(config: agenting.KERIAServerConfig, temp=False):
+    """
+    Runs config.workers Agency worker processes behind front routers on the admin, boot and HTTP
+    ports until SIGTERM or SIGINT, then shuts the workers down gracefully.
+    """
+    set_log_level(config.logLevel, logger)
+    ring = ShardRing(config.workers)
+
+    configs = [workerConfig(config, index) for index in range(config.workers)]
+    workers = [
+        multiprocessing.Process(
+            target=agenting.runAgency, args=(cfg, temp), name=f"keria-shard-{index}"
+        )
+        for index, cfg in enumerate(configs)
+    ]
+    # Forked workers must not inherit an open LMDB environment so the agency database is only
+    # opened once they are started
+    for worker in workers:
+        worker.start()
+
+    adb = basing.AgencyBaser(name="TheAgency", base=config.base, reopen=True, temp=temp)
+    caids = [caid for (caid,), _ in adb.agnt.getItemIter()]
+    logger.info(f"Agents per shard: {ring.assign(caids)}")
+
+    router = Router(ring=ring, adb=adb)
+    listeners = [
+        ("admin", config.adminPort, [cfg.adminPort for cfg in configs]),
+        ("boot", config.bootPort, [cfg.bootPort for cfg in configs]),
+    ]
+    if config.httpPort:
+        listeners.append(("http", config.httpPort, [cfg.httpPort for cfg in configs]))
+
+    servers = []
+    for name, port, ports in listeners:
+        server = createRouterServer(
+            port,
+            router,
+            ports,
+            name,
+            keypath=config.keyPath,
+            certpath=config.certPath,
+            cafilepath=config.caFilePath,
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+
+    logger.info(
+        "Routing admin/%s, http/%s, boot/%s to %s workers",
+        config.adminPort,
+        config.httpPort,
+        config.bootPort,
+        config.workers,
+    )
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    signal.signal(signal.SIGINT, lambda signum, frame: stop.set())
+    while not stop.is_set() and all(worker.is_alive() for worker in workers):
+        stop.wait(1.0)
+
+    logger.info("Stopping front routers and workers")
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+    for worker in workers:
+        if worker.is_alive():
+            worker.terminate()  # SIGTERM, handled by the worker's GracefulShutdownDoer
+    for worker in workers:
+        worker.join()
+
+    adb.close()
@@ -0,0 +1,459 @@
+# -*- encoding: utf-8 -*-
+"""
+KERIA
+keria.core.asgiing module
+
+Serving the KERIA falcon apps and driving the agency Doist on an asyncio event loop
+"""
+
+import asyncio
+import io
+import ssl
+import sys
+import time
+from http import HTTPStatus
+from urllib.parse import unquote
+
+from keria import ogler, log_name
+
+logger = ogler.getLogger(log_name)
+
+# Seconds between polls of a response body that yielded an empty chunk, like an offloaded handler,
+# doubling up to BodyPollMax while it keeps yielding empty chunks, like an idle event stream
+BodyPoll = 0.002
+BodyPollMax = 0.05
+
+
+class WsgiAsgi:
+    """
+    ASGI app serving a falcon WSGI app.  The WSGI app runs on the event loop thread, the same single
+    thread the agency Doist runs on, so endpoints keep their unsynchronized access to the agency.
+    Bodies yielding empty chunks, like the Deferred of an offloaded handler or an event stream, are
+    polled without blocking the loop, and the ._status and ._headers attributes of the body iterator
+    override the response head as with the hio HTTP server.
+
+    Attributes:
+        .app (falcon.App): WSGI app
+        .scheme (str): URL scheme of the server
+    """
+
+    def __init__(self, app, scheme="http"):
+        """
+        Parameters:
+            app (falcon.App): WSGI app
+            scheme (str): URL scheme of the server
+        """
+        self.app = app
+        self.scheme = scheme
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            while (message := await receive())["type"] != "lifespan.shutdown":
+                await send(dict(type=f"{message['type']}.complete"))
+            await send(dict(type="lifespan.shutdown.complete"))
+            return
+
+        body = bytearray()
+        while True:
+            message = await receive()
+            body.extend(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+
+        head = dict()
+
+        def start(status, headers, exc_info=None):
+            head["status"] = status
+            head["headers"] = headers
+
+        result = self.app(self.environ(scope, bytes(body)), start)
+        started = False
+        poll = BodyPoll
+        try:
+            for chunk in result:
+                if not chunk:
+                    await asyncio.sleep(poll)
+                    poll = min(poll * 2, BodyPollMax)
+                    continue
+                poll = BodyPoll
+                if not started:
+                    await send(self.start(result, head))
+                    started = True
+                await send(dict(type="http.response.body", body=chunk, more_body=True))
+        finally:
+            if hasattr(result, "close"):
+                result.close()
+
+        if not started:
+            await send(self.start(result, head))
+        await send(dict(type="http.response.body", body=b"", more_body=False))
+
+    def environ(self, scope, body):
+        """Returns the WSGI environ of the ASGI http scope with request body"""
+        server = scope.get("server") or ("localhost", 80)
+        client = scope.get("client") or ("", 0)
+        environ = {
+            "REQUEST_METHOD": scope["method"],
+            "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+            "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+            "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+            "SERVER_NAME": str(server[0]),
+            "SERVER_PORT": str(server[1]),
+            "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+            "REMOTE_ADDR": str(client[0]),
+            "REMOTE_PORT": str(client[1]),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": scope.get("scheme", self.scheme),
+            "wsgi.input": io.BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": False,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+
+        for name, value in scope.get("headers", []):
+            name = name.decode("latin-1").upper().replace("-", "_")
+            value = value.decode("latin-1")
+            if name == "CONTENT_TYPE" or name == "CONTENT_LENGTH":
+                environ[name] = value
+            elif (key := f"HTTP_{name}") in environ:
+                environ[key] = f"{environ[key]},{value}"
+            else:
+                environ[key] = value
+
+        return environ
+
+    @staticmethod
+    def start(result, head):
+        """Returns the ASGI response start message, applying the overrides of the body iterator"""
+        status = getattr(result, "_status", None) or head.get("status", "500")
+        headers = {name.lower(): value for name, value in head.get("headers", [])}
+        headers.update(
+            (name.lower(), value)
+            for name, value in (getattr(result, "_headers", None) or {}).items()
+        )
+        return dict(
+            type="http.response.start",
+            status=int(str(status).split(" ", 1)[0]),
+            headers=[
+                (name.encode("latin-1"), str(value).encode("latin-1"))
+                for name, value in headers.items()
+            ],
+        )
+
+
+class AsgiServer:
+    """
+    HTTP/1.1 server for an ASGI app on asyncio streams.  Connections are kept alive between requests
+    until the client closes them, asks for Connection: close or stays idle for .keepalive seconds.
+    The headers and the body of a request must each arrive within .timeout seconds, so slow clients
+    can not hold connections open.
+    Pipelined requests on a connection are read and answered strictly in order.  Requests on
+    different connections are served concurrently.
+
+    Attributes:
+        .app (Callable): ASGI app
+        .host (str): interface to listen on
+        .port (int): port to listen on
+        .ssl (ssl.SSLContext | None): TLS context, None means plain HTTP
+        .keepalive (float): seconds an idle connection is kept open
+        .timeout (float): seconds to read the headers and, separately, the body of a request
+        .maxBody (int): largest request body in bytes
+        .server (asyncio.Server | None): listening server once started
+        .requests (int): number of requests served
+    """
+
+    def __init__(
+        self,
+        app,
+        host="",
+        port=8080,
+        ssl=None,
+        keepalive=75.0,
+        timeout=30.0,
+        maxBody=16777216,
+    ):
+        """
+        Parameters:
+            app (Callable): ASGI app
+            host (str): interface to listen on, empty for all interfaces
+            port (int): port to listen on
+            ssl (ssl.SSLContext | None): TLS context, None means plain HTTP
+            keepalive (float): seconds an idle connection is kept open
+            timeout (float): seconds to read the headers and, separately, the body of a request
+            maxBody (int): largest request body in bytes
+        """
+        self.app = app
+        self.host = host
+        self.port = port
+        self.ssl = ssl
+        self.keepalive = keepalive
+        self.timeout = timeout
+        self.maxBody = maxBody
+        self.server = None
+        self.requests = 0
+
+    async def start(self):
+        """Starts listening for connections"""
+        self.server = await asyncio.start_server(
+            self.handle,
+            host=self.host or None,
+            port=self.port,
+            ssl=self.ssl,
+            reuse_address=True,
+        )
+        if not self.port:
+            self.port = self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """Stops listening and closes open connections"""
+        if self.server is not None:
+            self.server.close()
+            if hasattr(self.server, "close_clients"):
+                self.server.close_clients()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def handle(self, reader, writer):
+        """Serves the requests of one connection"""
+        try:
+            while await self.serve(reader, writer):
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as ex:
+            logger.exception(f"Error serving HTTP connection: {ex}")
+        finally:
+            writer.close()
+
+    async def serve(self, reader, writer):
+        """
+        Reads one request from the connection and writes its response.
+
+        Returns:
+            bool: True means the connection stays open for another request
+        """
+        try:
+            line = await asyncio.wait_for(reader.readline(), self.keepalive)
+        except TimeoutError:
+            return False
+        if not line.strip():
+            return bool(line)  # skip stray blank lines between requests, stop at EOF
+
+        try:
+            method, target, version = line.decode("latin-1").split()
+            major, minor = map(int, version.removeprefix("HTTP/").split("."))
+            headers = await asyncio.wait_for(self.headers(reader), self.timeout)
+        except TimeoutError:
+            await self.error(writer, 408, "Request Timeout")
+            return False
+        except (ValueError, asyncio.LimitOverrunError):
+            await self.error(writer, 400, "Bad Request")
+            return False
+
+        fields = dict()
+        for name, value in headers:
+            fields.setdefault(name, value)
+
+        # both framings of the body are a request smuggling vector, RFC 9112 section 6.3
+        if b"transfer-encoding" in fields and b"content-length" in fields:
+            await self.error(writer, 400, "Bad Request")
+            return False
+
+        conn = fields.get(b"connection", b"").lower()
+        keep = conn != b"close" if (major, minor) >= (1, 1) else conn == b"keep-alive"
+
+        try:
+            body = await asyncio.wait_for(self.body(reader, fields), self.timeout)
+        except TimeoutError:
+            await self.error(writer, 408, "Request Timeout")
+            return False
+        except ValueError:
+            await self.error(writer, 413, "Content Too Large")
+            return False
+
+        path, _, query = target.partition("?")
+        sockname = writer.get_extra_info("sockname") or ("", self.port)
+        peername = writer.get_extra_info("peername") or ("", 0)
+        scope = dict(
+            type="http",
+            asgi=dict(version="3.0", spec_version="2.3"),
+            http_version=f"{major}.{minor}",
+            method=method.upper(),
+            scheme="https" if self.ssl is not None else "http",
+            path=unquote(path),
+            raw_path=path.encode("latin-1"),
+            query_string=query.encode("latin-1"),
+            root_path="",
+            headers=headers,
+            server=(sockname[0], sockname[1]),
+            client=(peername[0], peername[1]),
+        )
+
+        received = False
+
+        async def receive():
+            nonlocal received
+            if received:
+                return dict(type="http.disconnect")
+            received = True
+            return dict(type="http.request", body=body, more_body=False)
+
+        state = dict(chunked=False, length=None)
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                lines = [f"HTTP/1.1 {message['status']} {reason(message['status'])}"]
+                names = set()
+                for name, value in message.get("headers", []):
+                    names.add(name.lower())
+                    lines.append(f"{name.decode('latin-1')}: {value.decode('latin-1')}")
+                if b"content-length" not in names and method.upper() != "HEAD":
+                    if (major, minor) >= (1, 1):
+                        state["chunked"] = True
+                        lines.append("Transfer-Encoding: chunked")
+                    else:
+                        state["length"] = False
+                if not keep or state["length"] is False:
+                    lines.append("Connection: close")
+                writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+            elif message["type"] == "http.response.body":
+                chunk = message.get("body", b"")
+                if method.upper() == "HEAD":
+                    chunk = b""
+                if state["chunked"]:
+                    if chunk:
+                        writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                    if not message.get("more_body", False):
+                        writer.write(b"0\r\n\r\n")
+                elif chunk:
+                    writer.write(chunk)
+                await writer.drain()
+
+        await self.app(scope, receive, send)
+        self.requests += 1
+        return keep and state["length"] is not False
+
+    @staticmethod
+    async def headers(reader):
+        """Reads the header fields of a request as a list of lowercase name and value bytes"""
+        headers = []
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                return headers
+            if len(headers) >= 100:
+                raise ValueError("too many header fields")
+            name, sep, value = line.partition(b":")
+            if not sep:
+                raise ValueError("malformed header field")
+            headers.append((name.strip().lower(), value.strip()))
+
+    async def body(self, reader, fields):
+        """Reads the body of a request with a content length or chunked transfer coding"""
+        if b"chunked" in fields.get(b"transfer-encoding", b"").lower():
+            body = bytearray()
+            while True:
+                size = int((await reader.readline()).split(b";", 1)[0], 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass  # trailers
+                    return bytes(body)
+                if len(body) + size > self.maxBody:
+                    raise ValueError("request body too large")
+                body.extend(await reader.readexactly(size))
+                await reader.readline()
+
+        length = int(fields.get(b"content-length", b"0"))
+        if length > self.maxBody:
+            raise ValueError("request body too large")
+        return await reader.readexactly(length) if length else b""
+
+    @staticmethod
+    async def error(writer, status, reason):
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\nContent-Length: 0\r\nConnection: close\r\n\r\n".encode(
+                "latin-1"
+            )
+        )
+        await writer.drain()
+
+
+def reason(status):
+    """Returns the reason phrase of HTTP status code status"""
+    try:
+        return HTTPStatus(status).phrase
+    except ValueError:
+        return ""
+
+
+def sslContext(keypath=None, certpath=None, cafilepath=None):
+    """
+    Returns the TLS context for the asyncio servers from the same key material as createHttpServer,
+    or None for plain HTTP when any of it is missing.
+    """
+    if keypath is None or certpath is None or cafilepath is None:
+        return None
+
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(certfile=certpath, keyfile=keypath)
+    context.load_verify_locations(cafile=cafilepath)
+    return context
+
+
+async def runDoist(doist, waker=None):
+    """
+    Drives doist from the event loop until its doers are done.  Runs one cycle every tock, or as soon
+    as the waker is woken, and yields the loop to the servers in between.  Tyme follows real time.
+
+    Parameters:
+        doist (Doist): Doist with its doers set
+        waker (Waker | None): woken when the doers get work, see serving.Waker
+    """
+    loop = asyncio.get_running_loop()
+    woken = asyncio.Event()
+    if waker is not None:
+        loop.add_reader(waker.fileno(), woken.set)
+
+    doist.done = False
+    doist.enter()
+    origin, start = doist.tyme, time.monotonic()
+    try:
+        while True:
+            if waker is not None:
+                waker.drain()
+            woken.clear()
+            doist.recur()
+            doist.tyme = max(doist.tyme, origin + time.monotonic() - start)
+
+            if not doist.deeds:
+                doist.done = True
+                break
+
+            try:
+                await asyncio.wait_for(woken.wait(), doist.tock)
+            except TimeoutError:
+                pass
+    finally:
+        if waker is not None:
+            loop.remove_reader(waker.fileno())
+        doist.exit()
+
+
+async def serve(doist, servers, waker=None):
+    """
+    Starts servers, drives doist on the same event loop until its doers are done and then closes
+    the servers.
+
+    Parameters:
+        doist (Doist): Doist with the agency doers set
+        servers (list): AsgiServer instances to run
+        waker (Waker | None): woken when the doers get work, see serving.Waker
+    """
+    for server in servers:
+        await server.start()
+    try:
+        await runDoist(doist, waker=waker)
+    finally:
+        for server in servers:
+            await server.close()
@@ -8,6 +8,7 @@ keria.core.authing module
 import pysodium
 import json
 import sys
+import time
 from urllib.parse import urlsplit
 from io import BytesIO
 from enum import Enum
@@ -45,6 +46,9 @@ class ModifiableRequest(falcon.Request):
 
 
 class Authenticator(ABC):
+    # HTTP methods that can be served from a read-only AgentView of a cold agent
+    ReadMethods = ("GET", "HEAD", "OPTIONS")
+
     def __init__(self, agency: "Agency"):
         """Abstract agent authenticator for verifying requests and preparing responses
 
@@ -68,6 +72,21 @@ class Authenticator(ABC):
     def resource(request: falcon.Request):
         return Authenticator.getRequiredHeader(request, "SIGNIFY-RESOURCE")
 
+    def agent(self, request: falcon.Request, caid: str):
+        """Load the agent for caid, using a read-only view when the request method allows it
+
+        Parameters:
+            request (falcon.Request): Falcon request object
+            caid (str): qb64 controller AID of the agent to load
+
+        Returns:
+            Agent | AgentView: the agent, or None if the controller is unknown
+
+        """
+        if request.method in self.ReadMethods:
+            return self.agency.view(caid)
+        return self.agency.get(caid)
+
     @abstractmethod
     def inbound(self, request: ModifiableRequest):
         pass
@@ -105,7 +124,7 @@ class SignedHeaderAuthenticator(Authenticator):
         signature = self.getRequiredHeader(request, "SIGNATURE")
 
         resource = self.resource(request)
-        agent = self.agency.get(resource)
+        agent = self.agent(request, resource)
 
         if agent is None:
             raise kering.AuthNError("Unknown controller")
@@ -234,7 +253,7 @@ class ESSRAuthenticator(Authenticator):
         resource = self.resource(request)
         receiver = self.getRequiredHeader(request, "SIGNIFY-RECEIVER")
 
-        agent = self.agency.get(resource)
+        agent = self.agency.view(resource)
         if agent is None or agent.pre != receiver:
             raise kering.AuthNError("Unknown or invalid agent")
 
@@ -271,6 +290,10 @@ class ESSRAuthenticator(Authenticator):
             )
 
         request.reinit(environ)
+        # upgrade for mutating inner requests
+        if request.method not in self.ReadMethods:
+            agent = self.agency.get(resource)
+
         request.path = unquote(request.path)
         request.context.mode = AuthMode.ESSR
         request.context.agent = agent
@@ -455,6 +478,9 @@ class AuthenticationMiddleware:
 
         try:
             authenticator.inbound(req)
+            # give the agent's background work priority while the request's work completes
+            if (agent := getattr(req.context, "agent", None)) is not None:
+                agent.requested = time.monotonic()
             return
         except (kering.AuthNError, ValueError):
             pass
@@ -0,0 +1,301 @@
+# -*- encoding: utf-8 -*-
+"""
+KERIA
+keria.core.caching module
+
+Bounded caches and idle expiry for resident agents
+"""
+
+import heapq
+import itertools
+import time
+from collections import OrderedDict
+
+import lmdb
+
+from keria import ogler, log_name
+
+logger = ogler.getLogger(log_name)
+
+# Fixed per-agent overhead in bytes for the Python objects, doers and open file handles of a resident agent
+AgentOverhead = 4 * 1024 * 1024
+
+
+def footprint(dbers):
+    """
+    Approximate the memory footprint of a set of LMDB environments as the size of the pages in use.
+    LMDB memory maps its data file so these are the pages that become resident as an agent works.
+
+    Parameters:
+        dbers (Iterable[LMDBer]): opened LMDBer instances, None entries and closed ones are skipped
+
+    Returns:
+        int: approximate size in bytes
+    """
+    size = 0
+    for dber in dbers:
+        env = getattr(dber, "env", None)
+        if env is None:
+            continue
+        if (
+            getattr(dber, "store", None) is not None
+        ):  # shared agency store is not per agent
+            continue
+        try:
+            size += (env.info()["last_pgno"] + 1) * env.stat()["psize"]
+        except lmdb.Error:  # closed environment
+            continue
+
+    return size
+
+
+def agentCost(agent):
+    """
+    Estimate the resident memory cost of an agent from the LMDB stores it holds open.
+
+    Parameters:
+        agent (Agent): resident agent
+
+    Returns:
+        int: approximate cost in bytes
+    """
+    hby = agent.hby
+    dbers = [
+        hby,
+        hby.ks,
+        getattr(agent.rgy, "reger", None),
+        getattr(agent, "seeker", None),
+        getattr(agent, "exnseeker", None),
+        getattr(getattr(agent, "mgr", None), "rb", None),
+    ]
+    return AgentOverhead + footprint(dbers)
+
+
+class AgentCache:
+    """
+    Least recently used cache of resident agents keyed by controller AID bounded by a maximum
+    number of agents and an approximate memory budget.
+
+    Accessing an agent through .lookup moves it to the most recently used end.  Inserting an agent
+    that takes the cache over either bound evicts the least recently used agents, other than the
+    one just inserted and those pinned by an offloaded request still reading them, by handing each
+    to the evict callback which is responsible for shutting it down.  Iteration order is least to
+    most recently used.
+
+    Attributes:
+        .maxAgents (int): maximum number of resident agents, 0 means unbounded
+        .maxMemory (int): approximate memory budget in bytes, 0 means unbounded
+        .memory (int): current approximate memory cost of all resident agents
+        .hits (int): number of lookups served by a resident agent
+        .misses (int): number of lookups that had to load an agent
+        .evictions (int): number of agents evicted to stay within the bounds
+
+    """
+
+    def __init__(
+        self, maxAgents=0, maxMemory=0, evict=None, cost=agentCost, pinned=None
+    ):
+        """
+        Parameters:
+            maxAgents (int): maximum number of resident agents, 0 means unbounded
+            maxMemory (int): approximate memory budget in bytes, 0 means unbounded
+            evict (Callable | None): called with each evicted agent after removal from the cache
+            cost (Callable): returns the approximate memory cost in bytes of an agent
+            pinned (Callable | None): returns True if the agent of a caid must not be evicted
+        """
+        self.maxAgents = maxAgents if maxAgents else 0
+        self.maxMemory = maxMemory if maxMemory else 0
+        self.evict = evict
+        self.cost = cost
+        self.pinned = pinned
+
+        self.memory = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._agents = OrderedDict()
+        self._costs = dict()
+
+    def __len__(self):
+        return len(self._agents)
+
+    def __contains__(self, caid):
+        return caid in self._agents
+
+    def __iter__(self):
+        return iter(self._agents)
+
+    def __getitem__(self, caid):
+        return self._agents[caid]
+
+    def __setitem__(self, caid, agent):
+        if caid in self._agents:
+            self._discard(caid)
+
+        cost = self.cost(agent)
+        self._agents[caid] = agent
+        self._costs[caid] = cost
+        self.memory += cost
+        self._shrink()
+
+    def __delitem__(self, caid):
+        if caid not in self._agents:
+            raise KeyError(caid)
+        self._discard(caid)
+
+    def keys(self):
+        return self._agents.keys()
+
+    def values(self):
+        return self._agents.values()
+
+    def items(self):
+        return self._agents.items()
+
+    def pop(self, caid, default=None):
+        if caid not in self._agents:
+            return default
+        return self._discard(caid)
+
+    def lookup(self, caid):
+        """
+        Returns the resident agent for caid marking it as most recently used, counting the lookup as
+        a cache hit or miss.
+
+        Returns:
+            Agent: resident agent or None if the agent is not resident
+        """
+        agent = self._agents.get(caid)
+        if agent is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._agents.move_to_end(caid)
+        return agent
+
+    def oldest(self):
+        """Returns the least recently used resident agent or None if the cache is empty."""
+        for agent in self._agents.values():
+            return agent
+        return None
+
+    def stats(self):
+        """Returns the size, bounds and counters of the cache as a dict."""
+        return dict(
+            size=len(self._agents),
+            maxAgents=self.maxAgents,
+            memory=self.memory,
+            maxMemory=self.maxMemory,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+        )
+
+    def _discard(self, caid):
+        agent = self._agents.pop(caid)
+        self.memory -= self._costs.pop(caid, 0)
+        return agent
+
+    def _over(self):
+        if self.maxAgents and len(self._agents) > self.maxAgents:
+            return True
+        if self.maxMemory and self.memory > self.maxMemory:
+            return True
+        return False
+
+    def _shrink(self):
+        # the most recently used agent, the one just inserted, is never evicted
+        for caid in list(self._agents)[:-1]:
+            if not self._over():
+                break
+            if self.pinned is not None and self.pinned(caid):
+                continue
+
+            agent = self._discard(caid)
+            self.evictions += 1
+            logger.info(
+                f"Evicting agent {caid}, {len(self._agents)} agents using ~{self.memory} bytes remain"
+            )
+            if self.evict is not None:
+                self.evict(agent)
+
+
+class IdleTimer:
+    """
+    Idle expiry of resident agents on a min heap of deadlines so finding the idle agents costs
+    O(expired log n) rather than a scan of every resident agent.
+
+    Touching an entry only records its access time.  Its heap node keeps the deadline from when it
+    was pushed and is lazily pushed again with the deadline of its last access when it surfaces
+    early, so a busy agent costs one heap operation per timeout rather than one per request.  Each
+    entry has its own timeout so tenants can be given different idle timeouts.
+
+    Attributes:
+        .timeout (float): default idle timeout in seconds
+        .clock (Callable): monotonic clock returning seconds
+
+    """
+
+    def __init__(self, timeout=86400.0, clock=time.monotonic):
+        """
+        Parameters:
+            timeout (float): default idle timeout in seconds
+            clock (Callable): monotonic clock returning seconds
+        """
+        self.timeout = timeout
+        self.clock = clock
+
+        self._heap = []
+        self._entries = dict()  # key -> [last access, timeout, heap node sequence]
+        self._seq = itertools.count()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def track(self, key, timeout=None):
+        """Starts tracking key as accessed now with an idle timeout, the default if None"""
+        timeout = self.timeout if timeout is None else timeout
+        now = self.clock()
+        seq = next(self._seq)
+        self._entries[key] = [now, timeout, seq]
+        heapq.heappush(self._heap, (now + timeout, seq, key))
+
+    def touch(self, key):
+        """Records an access of key now"""
+        if (entry := self._entries.get(key)) is not None:
+            entry[0] = self.clock()
+
+    def discard(self, key):
+        """Stops tracking key, its heap node is dropped when it surfaces"""
+        self._entries.pop(key, None)
+
+    def expired(self):
+        """
+        Removes and returns the keys idle for longer than their timeout.
+
+        Returns:
+            list: expired keys in order of expiry
+        """
+        now = self.clock()
+        expired = []
+        while self._heap and self._heap[0][0] <= now:
+            _, seq, key = heapq.heappop(self._heap)
+            entry = self._entries.get(key)
+            if entry is None or entry[2] != seq:  # discarded or tracked again since
+                continue
+
+            last, timeout, _ = entry
+            if (deadline := last + timeout) > now:  # touched since pushed
+                entry[2] = next(self._seq)
+                heapq.heappush(self._heap, (deadline, entry[2], key))
+                continue
+
+            del self._entries[key]
+            expired.append(key)
+
+        return expired
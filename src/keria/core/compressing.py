@@ -0,0 +1,244 @@
+# -*- encoding: utf-8 -*-
+"""
+KERIA
+keria.core.compressing module
+
+Compressing large JSON and CESR responses negotiated by Accept-Encoding
+"""
+
+import zlib
+
+import falcon
+
+from keria.core.authing import AuthMode
+from keria.core.offloading import Deferred
+
+try:
+    import zstandard
+except ImportError:  # zstd is only offered when the zstandard package is installed
+    zstandard = None
+
+# Media types worth compressing, JSON and CESR being large and highly repetitive
+Compressible = (
+    "application/json",
+    "application/x-ndjson",
+    "application/cesr",
+    "application/yaml",
+    "application/javascript",
+    "text/",
+)
+
+
+def codings():
+    """Returns the supported content codings in order of preference"""
+    return ("zstd", "gzip") if zstandard is not None else ("gzip",)
+
+
+def negotiate(header):
+    """
+    Returns the preferred content coding accepted by an Accept-Encoding header or None for identity
+
+    Parameters:
+        header (str | None): value of the Accept-Encoding request header
+    """
+    if not header:
+        return None
+
+    accepted = dict()
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding.strip().lower()] = q
+
+    best = None
+    for coding in codings():
+        q = accepted.get(coding, accepted.get("*", 0.0))
+        if q > 0.0 and (best is None or q > best[1]):
+            best = (coding, q)
+
+    return best[0] if best is not None else None
+
+
+def compressor(coding, level):
+    """
+    Returns a streaming compressor for coding with compress and flush methods like zlib's
+
+    Parameters:
+        coding (str): content coding, gzip or zstd
+        level (int): compression level, -1 is the default level of the coding
+    """
+    if coding == "zstd":
+        return zstandard.ZstdCompressor(level=level if level >= 0 else 3).compressobj()
+    return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+
+class Compressed:
+    """
+    Response body compressing the chunks of a streamed body as they are generated.  Empty chunks,
+    which the hio HTTP server skips while an offloaded handler runs, are passed through and the
+    ._status and ._headers attributes of the streamed body still apply.
+
+    With a coding the body is the Deferred of an offloaded handler whose status and headers are
+    only known once the handler ran, so whether to compress is decided then, see
+    CompressionMiddleware.encodable, and the Content-Encoding and weak ETag of a compressed body
+    are added to its ._headers.
+
+    Attributes:
+        .chunks (Iterator[bytes]): streamed body
+        .compressor (zlib.Compress | zstandard.ZstdCompressionObj): streaming compressor
+        .coding (str | None): content coding decided on once the deferred body has its status
+        .compressing (bool | None): True means compress, None means not decided yet
+    """
+
+    def __init__(self, chunks, compressor, coding=None):
+        self.chunks = chunks
+        self.iterator = iter(chunks)
+        self.compressor = compressor
+        self.coding = coding
+        self.compressing = True if coding is None else None
+        self.flushed = False
+
+    @property
+    def _status(self):
+        return getattr(self.chunks, "_status", None)
+
+    @property
+    def _headers(self):
+        headers = getattr(self.chunks, "_headers", None)
+        if self.coding is None or not self.compressing:
+            return headers
+
+        headers = dict(headers or {})
+        headers["content-encoding"] = self.coding
+        if (etag := headers.get("etag")) is not None and not etag.startswith("W/"):
+            headers["etag"] = f"W/{etag}"
+        return headers
+
+    def decide(self):
+        """Decides whether to compress the deferred body once its handler set its status"""
+        if self.compressing is None and self._status is not None:
+            headers = getattr(self.chunks, "_headers", None) or {}
+            self.compressing = CompressionMiddleware.encodable(
+                self._status,
+                headers.get("content-encoding"),
+                headers.get("content-type"),
+            )
+        return self.compressing
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.flushed:
+            raise StopIteration
+
+        try:
+            chunk = next(self.iterator)
+        except StopIteration:
+            self.flushed = True
+            if not self.decide():
+                raise
+            return self.compressor.flush()
+
+        if not self.decide():
+            return chunk
+        return self.compressor.compress(chunk) if chunk else b""
+
+    def close(self):
+        if hasattr(self.chunks, "close"):
+            self.chunks.close()
+
+
+class CompressionMiddleware:
+    """
+    Falcon middleware compressing response bodies with the content coding the client prefers in its
+    Accept-Encoding header, zstd when the zstandard package is installed or gzip.  Rendered bodies
+    are compressed from .minSize bytes and streamed bodies, like KEL exports and offloaded queries,
+    are compressed chunk by chunk as they stream.
+
+    Register it before the authentication middleware so it processes responses after them.  Signed
+    header responses are compressed after signing, as the signature covers headers but not the body.
+    ESSR responses are not compressed, their ciphertext being incompressible.  Offloaded handlers
+    set their status and headers after the middleware ran, so their bodies are compressed or not
+    once the handler is done, see Compressed.
+    """
+
+    def __init__(self, minSize=1024, level=-1):
+        """
+        Parameters:
+            minSize (int): smallest rendered body in bytes compressed
+            level (int): compression level, -1 is the default level of each coding
+        """
+        self.minSize = minSize
+        self.level = level
+
+    def process_response(self, req, rep, resource, req_succeeded):
+        """Compresses the body of rep when the client accepts a supported content coding"""
+        if req.method == "HEAD" or getattr(req.context, "mode", None) == AuthMode.ESSR:
+            return
+
+        if isinstance(rep.stream, Deferred):
+            rep.append_header("Vary", "Accept-Encoding")
+            if (coding := negotiate(req.get_header("Accept-Encoding"))) is not None:
+                rep.stream = Compressed(
+                    rep.stream, compressor(coding, self.level), coding=coding
+                )
+            return
+
+        if not self.encodable(
+            rep.status,
+            rep.get_header("Content-Encoding"),
+            rep.content_type or rep.options.default_media_type,
+        ):
+            return
+
+        coding = negotiate(req.get_header("Accept-Encoding"))
+        rep.append_header("Vary", "Accept-Encoding")
+        if coding is None:
+            return
+
+        if rep.stream is not None:
+            rep.stream = Compressed(rep.stream, compressor(coding, self.level))
+        else:
+            body = rep.render_body()
+            if body is None or len(body) < self.minSize:
+                return
+
+            comp = compressor(coding, self.level)
+            rep.data = comp.compress(body) + comp.flush()
+            rep.text = None
+
+        rep.set_header("Content-Encoding", coding)
+        if (etag := rep.get_header("ETag")) is not None and not etag.startswith("W/"):
+            # the compressed representation is only semantically equivalent to the uncompressed one
+            rep.set_header("ETag", f"W/{etag}")
+
+    @classmethod
+    def encodable(cls, status, encoding, contentType):
+        """
+        Returns True if a response with status, Content-Encoding header encoding and Content-Type
+        header contentType may be compressed
+        """
+        if falcon.http_status_to_code(status) in (204, 304) or encoding is not None:
+            return False
+        return cls.compressible(contentType)
+
+    @staticmethod
+    def compressible(contentType):
+        """Returns True if responses of contentType are worth compressing"""
+        if not contentType:
+            return False
+        mediaType = contentType.split(";", 1)[0].strip().lower()
+        # event streams are buffered by the compressor so events would never arrive
+        if mediaType == "text/event-stream":
+            return False
+        return mediaType.endswith("+json") or any(
+            mediaType.startswith(compressible) for compressible in Compressible
+        )
@@ -5,14 +5,17 @@ keria.core.httping module
 
 """
 
+import hashlib
 import io
 import logging
 
 import falcon
 from falcon.http_status import HTTPStatus
 from hio.core import tcp, http
+from keri.db import dbing
 
 from keria import ogler, log_name
+from keria.core import compressing
 
 logger = ogler.getLogger(log_name)
 
@@ -38,6 +41,62 @@ def getRequiredParam(body, name):
     return param
 
 
+def etag(*parts):
+    """
+    Returns a strong entity tag for the version of a resource identified by parts, such as the
+    prefix, sequence number and SAID of the latest event of a KEL.
+
+    Parameters:
+        parts (tuple): values identifying the version of the resource and its representation
+
+    Returns:
+        str: entity tag without quotes
+    """
+    ser = "\x1f".join(str(part) for part in parts).encode("utf-8")
+    return hashlib.blake2b(ser, digest_size=16).hexdigest()
+
+
+def kelParts(db, kever):
+    """
+    Returns the values identifying the current version of the KEL of kever for an entity tag: its
+    prefix, sequence number, first seen ordinal and the SAID and witness receipt count of its latest
+    event, so the tag changes with every accepted event and receipt.
+
+    Parameters:
+        db (Baser): KEL database
+        kever (Kever): key state of the KEL
+    """
+    dgkey = dbing.dgKey(kever.prefixer.qb64b, kever.serder.saidb)
+    return (
+        kever.prefixer.qb64,
+        kever.sn,
+        kever.fn,
+        kever.serder.said,
+        len(db.getWigs(dgkey)),
+    )
+
+
+def notModified(req, rep, tag):
+    """
+    Sets the ETag header of rep to tag and answers 304 Not Modified when the If-None-Match header
+    of req lists tag, so an unchanged resource is not rendered again.
+
+    Parameters:
+        req (falcon.Request): HTTP request
+        rep (falcon.Response): HTTP response
+        tag (str): entity tag of the current version of the resource
+
+    Returns:
+        bool: True means rep is a 304 and the caller must not render the resource
+    """
+    rep.etag = tag
+    matches = req.if_none_match
+    if matches and (matches == ["*"] or tag in matches):
+        rep.status = falcon.HTTP_304
+        return True
+    return False
+
+
 def parseRangeHeader(header, name, start=0, end=9):
     """Parse the start and end requested range values, defaults are 0, 9
 
@@ -118,14 +177,28 @@ corsMiddleware = falcon.CORSMiddleware(
 )
 
 
-def falconApp(logRequests=False, request_type=falcon.Request):
+def falconApp(logRequests=False, request_type=falcon.Request, compressMinSize=0):
+    """
+    Create a Falcon app with the CORS, optional request logging and optional response compression
+    middleware.  Compression processes responses last so it sees the signed responses of
+    authentication middleware added later.
+
+    Parameters:
+        logRequests (bool): True means log requests and responses
+        request_type (type): falcon.Request subclass of the app requests
+        compressMinSize (int): smallest response body in bytes compressed, 0 disables compression
+    """
     middlewares: list = [corsMiddleware]
+    if compressMinSize > 0:
+        middlewares.insert(
+            0, compressing.CompressionMiddleware(minSize=compressMinSize)
+        )
     if logRequests:
         middlewares.append(RequestLoggerMiddleware())
     return falcon.App(middleware=middlewares, request_type=request_type)
 
 
-def createHttpServer(port, app, keypath=None, certpath=None, cafilepath=None):
+def createHttpServer(port, app, keypath=None, certpath=None, cafilepath=None, host=""):
     """
     Create an HTTP or HTTPS server depending on whether TLS key material is present
 
@@ -135,6 +208,7 @@ def createHttpServer(port, app, keypath=None, certpath=None, cafilepath=None):
         keypath (string)   : the file path to the TLS private key
         certpath (string)  : the file path to the TLS signed certificate (public key)
         cafilepath (string): the file path to the TLS CA certificate chain file
+        host (string)      : interface to listen on, empty for all interfaces
     Returns:
         hio.core.http.Server
     """
@@ -144,9 +218,10 @@ def createHttpServer(port, app, keypath=None, certpath=None, cafilepath=None):
             keypath=keypath,
             certpath=certpath,
             cafilepath=cafilepath,
+            host=host,
             port=port,
         )
-        server = http.Server(port=port, app=app, servant=servant)
+        server = http.Server(host=host, port=port, app=app, servant=servant)
     else:
-        server = http.Server(port=port, app=app)
+        server = http.Server(host=host, port=port, app=app)
     return server
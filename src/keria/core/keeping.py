@@ -11,9 +11,11 @@ from keri.app.keeping import PreSit, Algos, PubLot, PubSet
 from keri import core
 from keri.core import coring
 from keri.core.coring import Tiers, MtrDex
-from keri.db import dbing, subing, koming
+from keri.db import subing, koming
 from keri.help import helping
 
+from keria.db import basing
+
 
 @dataclass()
 class Prefix:
@@ -43,7 +45,7 @@ class SaltyPrm:
         return iter(asdict(self))
 
 
-class RemoteKeeper(dbing.LMDBer):
+class RemoteKeeper(basing.TenantLMDBer):
     """
     RemoteKeeper stores data for Salty or Randy Encrypted edge key generation.
 
@@ -112,27 +114,27 @@ class RemoteKeeper(dbing.LMDBer):
         # Names end with "." as sub DB name must include a non Base64 character
         # to avoid namespace collisions with Base64 identifier prefixes.
 
-        self.gbls = subing.Suber(db=self, subkey="gbls.")
-        self.prxs = subing.CesrSuber(db=self, subkey="prxs.", klas=core.Cipher)
-        self.nxts = subing.CesrSuber(db=self, subkey="nxts.", klas=core.Cipher)
-        self.mhabs = subing.CesrSuber(db=self, subkey="mhabs.", klas=coring.Prefixer)
-        self.pres = koming.Komer(
-            db=self,
+        self.gbls = self.subdb(subing.Suber, subkey="gbls.")
+        self.prxs = self.subdb(subing.CesrSuber, subkey="prxs.", klas=core.Cipher)
+        self.nxts = self.subdb(subing.CesrSuber, subkey="nxts.", klas=core.Cipher)
+        self.mhabs = self.subdb(subing.CesrSuber, subkey="mhabs.", klas=coring.Prefixer)
+        self.pres = self.subdb(
+            koming.Komer,
             subkey="pres.",
             schema=Prefix,
         )  # New Prefix
-        self.sprms = koming.Komer(
-            db=self,
+        self.sprms = self.subdb(
+            koming.Komer,
             subkey="sprms.",
             schema=SaltyPrm,
         )  # New Salty Parameters
-        self.sits = koming.Komer(
-            db=self,
+        self.sits = self.subdb(
+            koming.Komer,
             subkey="sits.",
             schema=PreSit,
         )  # Prefix Situation
-        self.pubs = koming.Komer(
-            db=self,
+        self.pubs = self.subdb(
+            koming.Komer,
             subkey="pubs.",
             schema=PubSet,
         )  # public key set at pre.ridx
@@ -145,7 +147,13 @@ class RemoteManager:
     associated remote Signify controller.
     """
 
-    def __init__(self, hby, rb: RemoteKeeper = None):
+    def __init__(self, hby, rb: RemoteKeeper = None, store=None):
+        """
+        Parameters:
+            hby (Habery): identifier database environment of the agent
+            rb (RemoteKeeper | None): already opened remote key index database
+            store (AgencyStore | None): shared agency database to keep the remote key index in
+        """
         self.hby = hby
         self.rb = (
             rb
@@ -157,6 +165,8 @@ class RemoteManager:
                 reopen=True,
                 clear=False,
                 headDirPath=hby.db.headDirPath,
+                store=store,
+                tenant=hby.name,
             )
         )
 
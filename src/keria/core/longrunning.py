@@ -6,6 +6,9 @@ keria.core.longrunning module
 """
 
 import datetime
+import functools
+import itertools
+import time
 from collections import namedtuple
 from dataclasses import dataclass, asdict, field
 from marshmallow import fields
@@ -17,16 +20,20 @@ from dataclasses_json import dataclass_json
 from keri import kering
 from keri.app.oobiing import Result
 from keri.core import eventing, coring, serdering
-from keri.db import dbing, koming
+from keri.db import dbing, koming, subing
 from keri.help import helping
 
 from keria.app.delegating import approveDelegation
+from keria.app.serving import WakingDeck
+from keria.core import httping
+from keria.core.authing import AuthMode
+from keria.db import basing
 
 # long running operation types
 Typeage = namedtuple(
     "Tierage",
     "oobi witness delegation group query registry credential endrole "  # type: ignore[name-match]
-    "locscheme challenge exchange submit done",
+    "locscheme challenge exchange submit done boot",
 )
 
 OpTypes = Typeage(
@@ -43,6 +50,7 @@ OpTypes = Typeage(
     exchange="exchange",
     submit="submit",
     done="done",
+    boot="boot",
 )
 
 
@@ -102,6 +110,11 @@ class FailedOperation(BaseOperation):
 
 Operation = Union[PendingOperation, CompletedOperation, FailedOperation]
 
+# long running operation states in the operation index
+Stateage = namedtuple("Stateage", "pending done")
+
+OpStates = Stateage(pending="pending", done="done")
+
 
 @dataclass
 class Op:
@@ -109,9 +122,13 @@ class Op:
     type: str
     start: str
     metadata: dict
+    # response or error of the operation once done, frozen so it is never checked again
+    result: Optional[dict] = None
+    # ISO-8601 time the operation was found done, the start of its time to live
+    end: Optional[str] = None
 
 
-class Operator(dbing.LMDBer):
+class Operator(basing.TenantLMDBer):
     TailDirPath = "keri/opr"
     AltTailDirPath = ".keri/opr"
     TempPrefix = "keri_ops_"
@@ -126,6 +143,9 @@ class Operator(dbing.LMDBer):
             kwa:
         """
         self.ops = None
+        self.ends = None
+        self.starts = None
+        self.stas = None
         self.msgs = None
 
         super(Operator, self).__init__(
@@ -137,22 +157,109 @@ class Operator(dbing.LMDBer):
         super(Operator, self).reopen(**kwa)
 
         # Long running operations, keyed by "name" which is f"{type}.{oid}"
-        self.ops = koming.Komer(
-            db=self,
-            subkey="opr.",
-            schema=Op,
-        )
+        self.ops = self.subdb(koming.Komer, subkey="opr.", schema=Op)
+
+        # Expiry index of done operations keyed by (end, name), in time order as ends are fixed width
+        self.ends = self.subdb(subing.Suber, subkey="opre.", sep="|")
+
+        # Time out index of pending operations keyed by (start, name), in time order like .ends
+        self.starts = self.subdb(subing.Suber, subkey="oprp.", sep="|")
+
+        # Index of operations keyed by (state, type, start, name) for filtered and paged listings
+        self.stas = self.subdb(subing.Suber, subkey="oprs.", sep="|")
+
+        # Operations stored before the index was added
+        if next(self.stas.getItemIter(), None) is None:
+            for _, op in self.ops.getItemIter():
+                self.index(f"{op.type}.{op.oid}", op)
+
+        # Pending operations stored before the time out index was added
+        if next(self.starts.getItemIter(), None) is None:
+            for key, val in self.scan(self.stas.sdb, f"{OpStates.pending}|".encode()):
+                start = key.decode("utf-8").split("|")[2]
+                self.starts.pin(keys=(start, val.decode("utf-8")), val=val)
 
         return self.env
 
+    @staticmethod
+    def state(op):
+        """Returns the state of op in the index, done once its result is frozen"""
+        return OpStates.done if op.result is not None else OpStates.pending
+
+    def index(self, name, op):
+        """Adds op stored under name to the state index and, while pending, the time out index"""
+        self.stas.pin(keys=(self.state(op), op.type, op.start, name), val=name)
+        if op.result is None:
+            self.starts.pin(keys=(op.start, name), val=name)
+
+    def unindex(self, name, op):
+        """Removes op stored under name from the state index and the time out index"""
+        self.stas.rem(keys=(self.state(op), op.type, op.start, name))
+        if op.result is None:
+            self.starts.rem(keys=(op.start, name))
+
+    def scan(self, sdb, top, low=b""):
+        """
+        Yields the (key, val) bytes items of sdb whose key starts with top from top + low on
+
+        Parameters:
+            sdb (lmdb._Database): named sub database
+            top (bytes): key prefix of the items, within the keyspace of the tenant
+            low (bytes): lowest key suffix after top, so a range of the branch is read
+        """
+        top = self.keyspace + top
+        with self.env.begin(db=sdb, write=False, buffers=True) as txn:
+            cursor = txn.cursor()
+            if cursor.set_range(top + low):
+                for key, val in cursor.iternext():
+                    key = bytes(key)
+                    if not key.startswith(top):
+                        break
+                    yield key[len(self.keyspace) :], bytes(val)
+
+    def find(self, type=None, state=None, since=None):
+        """
+        Yields the names of operations matching the filters, reading keys only.  Without state and
+        since filters operations are in name order from the operations database, otherwise they
+        are in state, type and start time order from the state index.
+
+        Parameters:
+            type (str | None): only operations of this type
+            state (str | None): only operations in this state, pending or done
+            since (str | None): only operations started at or after this ISO-8601 date time
+        """
+        if state is None and since is None:
+            top = f"{type}.".encode("utf-8") if type is not None else b""
+            for key, _ in self.scan(self.ops.sdb, top):
+                yield key.decode("utf-8")
+            return
+
+        low = since.encode("utf-8") if since is not None and type is not None else b""
+        for sta in (state,) if state is not None else OpStates:
+            top = "|".join((sta, type, "") if type is not None else (sta, ""))
+            for key, val in self.scan(self.stas.sdb, top.encode("utf-8"), low):
+                if since is not None and key.decode("utf-8").split("|")[2] < since:
+                    continue
+                yield val.decode("utf-8")
+
 
 class Monitor:
     """Monitoring and garbage collecting long running operations
 
+    Operation state transitions are pushed to subscribers, such as the operation event streams of
+    clients, by .watch which the agent runs every loop.  Only pending operations are checked again
+    and only once the agent's databases were written to, by escrow, cue or message processing, or
+    the sweep interval passed for time outs and in memory state.
+
+    The result of an operation is frozen with its Op once it is done, so listing operations is a
+    range scan of the operations database that only checks the status of pending operations.
+
     Attributes:
         hby (Habery): identifier database environment
         opr(Operator): long running operations database
         swain(Anchorer): Delegation processes tracker
+        subscribers (list): decks receiving (sequence number, Operation) tuples of state transitions
+        pending (dict | None): Op of each pending operation keyed by name, None until watched
 
     """
 
@@ -167,6 +274,8 @@ class Monitor:
         submitter=None,
         opr=None,
         temp=False,
+        store=None,
+        waker=None,
     ):
         """Create long running operation monitor
 
@@ -174,6 +283,8 @@ class Monitor:
             hby (Habery): identifier database environment
             swain(Anchorer): Delegation processes tracker
             opr (Operator): long running operations database
+            store (AgencyStore): shared agency database to keep operations in when opr is not provided
+            waker (Waker): woken when a transition is pushed to subscribers
 
         """
         self.hby = hby
@@ -183,7 +294,17 @@ class Monitor:
         self.exchanger = exchanger
         self.credentialer = credentialer
         self.submitter = submitter
-        self.opr = opr if opr is not None else Operator(name=hby.name, temp=temp)
+        self.opr = (
+            opr
+            if opr is not None
+            else Operator(name=hby.name, temp=temp, store=store, tenant=hby.name)
+        )
+        self.waker = waker
+        self.subscribers = []
+        self.pending = None
+        self.sn = 0
+        self.generation = None
+        self.due = 0.0
 
     def submit(self, oid, typ, metadata=None):
         """Submit a new long running operation to track
@@ -205,46 +326,319 @@ class Monitor:
         name = f"{typ}.{oid}"
         op = Op(oid=oid, type=typ, start=helping.nowIso8601(), metadata=metadata)
 
-        # Overwrite any existing long running operation of this type for this resource.
-        # resets the clock basically
-        self.opr.ops.pin(keys=(name,), val=op)
+        try:
+            # Return Operation with full status check in case its already finished.
+            operation = self.status(op)
+            if operation.done:
+                self.settle(op, operation)
+        finally:
+            # Overwrite any existing long running operation of this type for this resource.
+            # resets the clock basically
+            if (old := self.opr.ops.get(keys=(name,))) is not None:
+                self.opr.unindex(name, old)
+            self.opr.ops.pin(keys=(name,), val=op)
+            self.opr.index(name, op)
+        if self.pending is not None:
+            self.pending.pop(name, None)
+            if not operation.done:
+                self.pending[name] = op
+        self.publish(operation)
 
-        # Return Operation with full status check in case its already finished.
-        return self.get(name)
+        return operation
 
     def get(self, name):
         if (op := self.opr.ops.get(keys=(name,))) is None:
             return None
 
+        operation = self.load(op)
+
+        return operation
+
+    def getOperations(self, type=None, state=None, since=None, start=0, end=-1):
+        """Return list of long running opterations, optionally filtered by type, state and start time
+
+        Only the keys of matching operations are read, see Operator.find, and only the operations
+        in the start to end range are loaded.  Done operations are read from their frozen result so
+        only pending operations are checked.  With a state filter pending operations are checked
+        before paging, see .resolve, so those found done are in the done state for the range.
+
+        Parameters:
+            type (str | None): only operations of this type
+            state (str | None): only operations in this state, pending or done
+            since (str | None): only operations started at or after this ISO-8601 date time
+            start (int): index of the first matching operation to return
+            end (int): index of the last matching operation to return, -1 means all
+        """
+        if state is not None:
+            self.resolve(type=type, since=since)
+
+        names = self.opr.find(type=type, state=state, since=since)
+        names = itertools.islice(names, start, None if end == -1 else end + 1)
+
+        operations = []
+        for name in list(names):
+            if (op := self.opr.ops.get(keys=(name,))) is None:
+                continue
+            operations.append(self.safeStatus(op))
+
+        return operations
+
+    def count(self, type=None, state=None, since=None):
+        """Returns the number of operations matching the filters of .getOperations"""
+        if state is not None:
+            self.resolve(type=type, since=since)
+
+        return sum(1 for _ in self.opr.find(type=type, state=state, since=since))
+
+    def resolve(self, type=None, since=None):
+        """
+        Checks the pending operations matching the filters, freezing those found done so they move
+        to the done state of the index before a listing by state is paged or counted.
+
+        Parameters:
+            type (str | None): only operations of this type
+            since (str | None): only operations started at or after this ISO-8601 date time
+        """
+        for name in list(self.opr.find(type=type, state=OpStates.pending, since=since)):
+            if (op := self.opr.ops.get(keys=(name,))) is not None:
+                self.safeStatus(op)
+
+    def load(self, op):
+        """Returns the frozen operation of op once done or checks its status, freezing it if done
+
+        Parameters:
+            op (Op): database storage for long running operation
+
+        Returns:
+            Operation: The status of the operation
+        """
+        if op.result is not None:
+            return self.thaw(op)
+
         operation = self.status(op)
+        if operation.done:
+            self.opr.unindex(operation.name, op)
+            self.settle(op, operation)
+            self.opr.ops.pin(keys=(operation.name,), val=op)
+            self.opr.index(operation.name, op)
 
         return operation
 
-    def getOperations(self, type=None):
-        """Return list of long running opterations, optionally filtered by type"""
-        ops = self.opr.ops.getItemIter()
-        if type is not None:
-            ops = filter(lambda i: i[1].type == type, ops)
+    def settle(self, op, operation):
+        """Freezes the result of done operation into op and indexes op for expiry"""
+        op.result = self.freeze(operation)
+        op.end = helping.nowIso8601()
+        self.opr.ends.pin(keys=(op.end, operation.name), val=operation.name)
 
-        def get_status(op):
-            try:
-                return self.status(op)
-            except Exception as err:
-                # self.status may throw an exception.
-                # Handling error by returning an operation with error status
-                return FailedOperation(
-                    name=f"{op.type}.{op.oid}",
-                    metadata=op.metadata,
-                    done=True,
-                    error=OperationStatus(code=500, message=f"{err}"),
-                )
+    @staticmethod
+    def freeze(operation):
+        """Returns the result of done operation to store with its Op"""
+        if isinstance(operation, FailedOperation):
+            return dict(error=operation.error.to_dict())
+        return dict(response=operation.response)
+
+    @staticmethod
+    def thaw(op):
+        """Returns the done operation of the frozen result of op"""
+        name = f"{op.type}.{op.oid}"
+        if "error" in op.result:
+            return FailedOperation(
+                name=name,
+                metadata=op.metadata,
+                error=OperationStatus(**op.result["error"]),
+            )
+        return CompletedOperation(
+            name=name, metadata=op.metadata, response=op.result["response"]
+        )
 
-        return [get_status(op) for (_, op) in ops]
+    def safeStatus(self, op):
+        """Returns the status of op or a failed operation when the status check raises"""
+        try:
+            return self.load(op)
+        except Exception as err:
+            # self.status may throw an exception.
+            # Handling error by returning an operation with error status
+            return FailedOperation(
+                name=f"{op.type}.{op.oid}",
+                metadata=op.metadata,
+                done=True,
+                error=OperationStatus(code=500, message=f"{err}"),
+            )
 
     def rem(self, name):
         """Remove tracking of the long running operation represented by name"""
+        if self.pending is not None:
+            self.pending.pop(name, None)
+        if (op := self.opr.ops.get(keys=(name,))) is not None:
+            self.opr.unindex(name, op)
         return self.opr.ops.rem(keys=(name,))
 
+    def expire(self, ttl, limit=1000):
+        """
+        Checks pending operations started more than ttl seconds ago, oldest first, with a range
+        scan of the time out index.  Those now done are frozen and those still pending are failed
+        with a time out, so operations no client reads again move to the done state and are
+        collected in turn.  Index entries of operations since removed or done are dropped.
+
+        Parameters:
+            ttl (float): seconds operations are kept pending
+            limit (int): most index entries processed, so a large backlog is expired in steps
+
+        Returns:
+            int: number of operations failed with a time out
+        """
+        cutoff = helping.toIso8601(helping.nowUTC() - datetime.timedelta(seconds=ttl))
+
+        stale = []
+        for keys, name in self.opr.starts.getItemIter():
+            if keys[0] > cutoff or len(stale) >= limit:
+                break
+            stale.append((keys[0], name))
+
+        expired = 0
+        for start, name in stale:
+            op = self.opr.ops.get(keys=(name,))
+            if op is None or op.result is not None or op.start != start:
+                self.opr.starts.rem(keys=(start, name))
+                continue
+
+            operation = self.safeStatus(op)
+            if not operation.done:
+                operation = FailedOperation(
+                    name=name,
+                    metadata=op.metadata,
+                    error=OperationStatus(
+                        code=408,  # Using HTTP error codes here for lack of a better alternative
+                        message=f"long running {op.type} for {op.oid} operation still pending after "
+                        f"{ttl} seconds",
+                    ),
+                )
+                expired += 1
+
+            # not yet frozen when still pending or when the status check raised
+            if op.result is None:
+                self.opr.unindex(name, op)
+                self.settle(op, operation)
+                self.opr.ops.pin(keys=(name,), val=op)
+                self.opr.index(name, op)
+
+            if self.pending is not None and self.pending.pop(name, None) is not None:
+                self.publish(operation)
+
+        return expired
+
+    def collect(self, ttl, limit=1000):
+        """
+        Removes operations done for longer than ttl seconds, oldest first, with a range scan of the
+        expiry index.  Index entries of operations since removed or submitted again are dropped.
+
+        Parameters:
+            ttl (float): seconds done operations are kept
+            limit (int): most index entries processed, so a large backlog is collected in steps
+
+        Returns:
+            int: number of operations removed
+        """
+        cutoff = helping.toIso8601(helping.nowUTC() - datetime.timedelta(seconds=ttl))
+
+        expired = []
+        for keys, name in self.opr.ends.getItemIter():
+            if keys[0] > cutoff or len(expired) >= limit:
+                break
+            expired.append((keys[0], name))
+
+        reclaimed = 0
+        for end, name in expired:
+            if (op := self.opr.ops.get(keys=(name,))) is not None and op.end == end:
+                self.rem(name)
+                reclaimed += 1
+            self.opr.ends.rem(keys=(end, name))
+
+        return reclaimed
+
+    def subscribe(self):
+        """Returns a new deck receiving the (sequence number, Operation) tuples of transitions"""
+        deck = WakingDeck(waker=self.waker)
+        self.subscribers.append(deck)
+        return deck
+
+    def unsubscribe(self, deck):
+        """Stops pushing transitions to deck"""
+        if deck in self.subscribers:
+            self.subscribers.remove(deck)
+
+    def publish(self, operation):
+        """Pushes operation to every subscriber with the next sequence number"""
+        self.sn += 1
+        for deck in self.subscribers:
+            deck.append((self.sn, operation))
+
+    def prune(self):
+        """
+        Ends and drops subscriber decks not read for longer than their .stale seconds, like those
+        of event streams whose client disconnected without the HTTP server closing the stream.
+        Decks without a .stale time are kept until unsubscribed.
+        """
+        now = time.monotonic()
+        for deck in list(self.subscribers):
+            stale = getattr(deck, "stale", None)
+            if stale is not None and now - deck.polled > stale:
+                self.unsubscribe(deck)
+                deck.append(None)
+
+    def close(self):
+        """Ends the streams of all subscribers, called on agent shutdown"""
+        for deck in self.subscribers:
+            deck.append(None)
+        self.subscribers = []
+
+    def current(self):
+        """Returns the last LMDB transaction IDs of the databases operation status is read from"""
+        dbers = [self.hby.db, self.opr]
+        if self.registrar is not None:
+            dbers.append(self.registrar.rgy.reger)
+        return tuple(dber.env.info()["last_txnid"] for dber in dbers if dber.env)
+
+    def watch(self, tyme, interval=5.0):
+        """
+        Checks the pending operations again and pushes those now done to subscribers.  Runs only
+        while there are subscribers, once the databases changed or interval seconds passed.
+
+        Parameters:
+            tyme (float): current tyme of the agent loop
+            interval (float): seconds between checks of unchanged pending operations
+
+        Returns:
+            list: operations that completed or failed
+        """
+        self.prune()
+        if not self.subscribers:
+            # stale without checks so reloaded for the next subscriber
+            self.pending = None
+            return []
+
+        if self.pending is None:
+            self.pending = {
+                f"{op.type}.{op.oid}": op
+                for _, op in self.opr.ops.getItemIter()
+                if not self.safeStatus(op).done
+            }
+        elif self.current() == self.generation and tyme < self.due:
+            return []
+
+        done = []
+        for name, op in list(self.pending.items()):
+            operation = self.safeStatus(op)
+            if operation.done:
+                del self.pending[name]
+                done.append(operation)
+                self.publish(operation)
+
+        # after checking as some checks, like approving delegations, write themselves
+        self.generation = self.current()
+        self.due = tyme + interval
+        return done
+
     def status(self, op):
         """Calculate the status of an operation.
 
@@ -630,6 +1024,26 @@ class OperationCollectionEnd:
               type: string
             required: false
             description: filter list of long running operations by type
+          - in: query
+            name: state
+            schema:
+              type: string
+              enum: [pending, done]
+            required: false
+            description: filter list of long running operations by state
+          - in: query
+            name: since
+            schema:
+              type: string
+              format: date-time
+            required: false
+            description: only long running operations started at or after this ISO-8601 date time
+          - in: header
+            name: Range
+            schema:
+              type: string
+            required: false
+            description: HTTP Range header syntax, operations=start-end, all operations without it
         responses:
             200:
               description: list of long running operations
@@ -639,13 +1053,203 @@ class OperationCollectionEnd:
                         type: array
                         items:
                           $ref: '#/components/schemas/Operation'
+            206:
+              description: range of the list of long running operations
+            400:
+              description: invalid state or since filter
         """
         agent = req.context.agent
         type = req.params.get("type")
-        ops = agent.monitor.getOperations(type=type)
+        state = req.params.get("state")
+        if state is not None and state not in OpStates:
+            raise falcon.HTTPBadRequest(
+                description=f"invalid state {state}, must be one of {', '.join(OpStates)}"
+            )
+
+        since = req.params.get("since")
+        if since is not None:
+            try:
+                dt = helping.fromIso8601(since)
+                if dt.tzinfo is None:
+                    dt = dt.replace(tzinfo=datetime.timezone.utc)
+                # start times are stored in UTC so compare as strings
+                since = helping.toIso8601(dt.astimezone(datetime.timezone.utc))
+            except ValueError:
+                raise falcon.HTTPBadRequest(
+                    description=f"invalid since {since}, must be an ISO-8601 date time"
+                )
+
+        rng = req.get_header("Range")
+        if rng is None:
+            rep.status = falcon.HTTP_200
+            start = 0
+            end = -1
+        else:
+            rep.status = falcon.HTTP_206
+            start, end = httping.parseRangeHeader(rng, "operations")
+
+        ops = agent.monitor.getOperations(
+            type=type, state=state, since=since, start=start, end=end
+        )
+        if rng is not None:
+            count = agent.monitor.count(type=type, state=state, since=since)
+            end = start + (len(ops) - 1) if len(ops) > 0 else 0
+            rep.set_header("Accept-Ranges", "operations")
+            rep.set_header("Content-Range", f"operations {start}-{end}/{count}")
+
         rep.data = json.dumps(ops, default=lambda o: o.to_dict()).encode("utf-8")
         rep.content_type = "application/json"
+
+
+class OperationEvents:
+    """
+    Server-sent events response body streaming the operation state transitions pushed to a
+    subscriber deck of the Monitor.  Yields empty chunks while no transition is queued, which the
+    HTTP server skips, and a comment every .keepalive seconds so proxies keep the stream open.
+
+    Attributes:
+        .monitor (Monitor): monitor the deck is subscribed to
+        .deck (Deck): subscriber deck of (sequence number, Operation) tuples, None ends the stream
+        .head (bytes): sent first, like the events of the current operation states
+        .type (str | None): only stream operations of this type
+        .keepalive (float): seconds between keep-alive comments
+        .touch (Callable | None): called with each keep-alive so the agent is not released as idle
+
+    The HTTP server reads the stream every cycle while the client is connected and drops it without
+    closing it once the client disconnects, so each read is recorded on the deck and the Monitor
+    drops decks not read for .StaleKeepAlives keep-alive intervals, see Monitor.prune.
+    """
+
+    # Default seconds between keep-alive comments
+    KeepAlive = 15.0
+    # Keep-alive intervals a stream may go unread before its subscriber deck is dropped
+    StaleKeepAlives = 4
+
+    def __init__(self, monitor, deck, head=b"", type=None, keepalive=None, touch=None):
+        self.monitor = monitor
+        self.deck = deck
+        self.head = head
+        self.type = type
+        self.keepalive = keepalive if keepalive is not None else self.KeepAlive
+        self.touch = touch
+        self.last = time.monotonic()
+        self.ended = False
+        self.deck.stale = self.keepalive * self.StaleKeepAlives
+        self.deck.polled = self.last
+
+    @property
+    def waiting(self):
+        """True means nothing is queued so the HTTP server need not keep cycling for this stream"""
+        return not self.head and not self.deck
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.ended:
+            raise StopIteration
+
+        self.deck.polled = time.monotonic()
+
+        if self.head:
+            head, self.head = self.head, b""
+            return head
+
+        while self.deck:
+            if (item := self.deck.popleft()) is None:
+                self.ended = True
+                raise StopIteration
+
+            sn, operation = item
+            if self.type is not None and not operation.name.startswith(f"{self.type}."):
+                continue
+
+            self.last = time.monotonic()
+            return self.event(operation, sn)
+
+        if time.monotonic() - self.last >= self.keepalive:
+            self.last = time.monotonic()
+            if self.touch is not None:
+                self.touch()
+            return b": keep-alive\n\n"
+
+        return b""
+
+    @staticmethod
+    def event(operation, sn=None):
+        """Returns the server-sent event of operation, with sn as its ID when given"""
+        lines = [] if sn is None else [f"id: {sn}"]
+        lines.extend(["event: operation", f"data: {operation.to_json()}", "", ""])
+        return "\n".join(lines).encode("utf-8")
+
+    def close(self):
+        self.ended = True
+        self.monitor.unsubscribe(self.deck)
+
+
+class OperationEventsEnd:
+    """Server-sent events endpoint streaming long running operation state transitions"""
+
+    @staticmethod
+    def on_get(req, rep):
+        """GET operation event stream endpoint
+
+        Parameters:
+            req (Request):  Falcon HTTP Request object
+            rep (Response): Falcon HTTP Response object
+        ---
+        summary: Stream long running operation state transitions
+        description: Streams the current state of every long running operation followed by each
+                     operation that is submitted, completes or fails as server-sent events, so
+                     clients need not poll the operations they wait on
+        tags:
+        - Operation
+        parameters:
+          - in: query
+            name: type
+            schema:
+              type: string
+            required: false
+            description: only stream long running operations of this type
+        responses:
+          200:
+            description: Stream of operation events, each with the operation as JSON data
+            content:
+                text/event-stream:
+                    schema:
+                        type: string
+          400:
+            description: Event streams are not available with ESSR encrypted responses
+        """
+        if getattr(req.context, "mode", None) == AuthMode.ESSR:
+            raise falcon.HTTPBadRequest(
+                description="operation event streams are not available with ESSR"
+            )
+
+        agent = req.context.agent
+        type = req.params.get("type")
+        monitor = agent.monitor
+        deck = monitor.subscribe()
+
+        # current states first so transitions before subscribing are not missed
+        head = [b"retry: 3000\n\n"]
+        head.extend(
+            OperationEvents.event(operation)
+            for operation in monitor.getOperations(type=type)
+        )
+
+        agency = getattr(agent, "agency", None)
+        touch = (
+            functools.partial(agency.idle.touch, agent.caid)
+            if agency is not None
+            else None
+        )
         rep.status = falcon.HTTP_200
+        rep.content_type = "text/event-stream"
+        rep.set_header("Cache-Control", "no-cache")
+        rep.stream = OperationEvents(
+            monitor=monitor, deck=deck, head=b"".join(head), type=type, touch=touch
+        )
 
 
 class OperationResourceEnd:
@@ -0,0 +1,256 @@
+# -*- encoding: utf-8 -*-
+"""
+KERIA
+keria.core.offloading module
+
+Running heavy read-only admin handlers on a thread pool off the HTTP server loop
+"""
+
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import falcon
+
+from keria import ogler, log_name
+from keria.core.authing import AuthMode
+
+logger = ogler.getLogger(log_name)
+
+
+class Deferred:
+    """
+    WSGI response body of an offloaded handler.  Yields empty chunks while the handler runs on the
+    thread pool, which the hio HTTP server skips without sending anything, and then the body the
+    handler rendered, or the chunks of its stream when it streams its response.  The hio server reads the ._status and ._headers attributes of the body
+    iterator when it sends the head so the status and headers set by the handler still apply.
+
+    The release callback runs once the body has been sent, the body is closed or, when the server
+    drops the response early, the body is collected, so whatever the handler needs is held until
+    its streamed body no longer reads it.
+
+    Attributes:
+        .future (Future): handler running on the offloader thread pool
+        .rep (falcon.Response): response the handler renders into
+        .release (weakref.finalize | None): runs the release callback at most once
+        ._status (str | None): status of the handler response once done
+        ._headers (dict): headers of the handler response once done
+    """
+
+    def __init__(self, future, rep, release=None):
+        self.future = future
+        self.rep = rep
+        self.release = weakref.finalize(self, release) if release is not None else None
+        self._status = None
+        self._headers = dict()
+        self.chunks = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.chunks is None:
+            if not self.future.done():
+                return b""
+            self.chunks = self.render()
+
+        try:
+            return next(self.chunks)
+        except StopIteration:
+            self.close()
+            raise
+
+    def close(self):
+        if hasattr(self.chunks, "close"):
+            self.chunks.close()
+        if self.release is not None:
+            self.release()
+
+    def render(self):
+        """Sets the status and headers from the finished handler and returns an iterator of its body"""
+        try:
+            self.future.result()
+            rep = self.rep
+            if rep.stream is not None:
+                body = rep.stream
+            else:
+                body = [rep.render_body() or b""]
+        except falcon.HTTPError as ex:
+            rep = falcon.Response(options=self.rep.options)
+            rep.status = ex.status
+            rep.content_type = falcon.MEDIA_JSON
+            body = [ex.to_json()]
+        except Exception as ex:
+            logger.exception(f"Offloaded request failed: {ex}")
+            ex = falcon.HTTPInternalServerError()
+            rep = falcon.Response(options=self.rep.options)
+            rep.status = ex.status
+            rep.content_type = falcon.MEDIA_JSON
+            body = [ex.to_json()]
+
+        self._status = falcon.code_to_http_status(rep.status)
+        self._headers = rep.headers
+        if rep.content_type:
+            self._headers["content-type"] = rep.content_type
+        return iter(body)
+
+
+class Offloader:
+    """
+    Bounded thread pool running the read-only admin handlers marked with offload so a large query
+    or export of one tenant does not block the HTTP server loop for every tenant.  The handler only
+    reads the agent's LMDB databases, each read running in its own read transaction, and renders
+    into a response of its own while the hio server keeps serving other requests.  Requests over
+    the concurrency limit of their route are refused with 503 and a Retry-After header.
+
+    Attributes:
+        .workers (int): number of threads, 0 means offloadable handlers run inline
+        .limits (dict): maximum number of concurrent requests keyed by route name
+        .executor (ThreadPoolExecutor | None): thread pool running the handlers
+        .waker (Waker | None): woken when a handler finishes so its response is sent promptly
+        .offloaded (int): number of requests run on the thread pool
+        .refused (int): number of requests refused over their route limit
+    """
+
+    def __init__(self, workers=0, limits=None, waker=None):
+        """
+        Parameters:
+            workers (int): number of threads, 0 means offloadable handlers run inline
+            limits (dict | None): maximum number of concurrent requests keyed by route name,
+                routes not listed are limited to the number of threads
+            waker (Waker | None): woken when a handler finishes so its response is sent promptly
+        """
+        self.workers = workers if workers else 0
+        self.limits = dict(limits) if limits is not None else dict()
+        self.waker = waker
+        self.executor = (
+            ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="keria-read"
+            )
+            if self.workers
+            else None
+        )
+        self.semaphores = dict()
+        self.offloaded = 0
+        self.refused = 0
+
+    def semaphore(self, route):
+        """Returns the semaphore limiting the concurrent requests of route"""
+        if (sem := self.semaphores.get(route)) is None:
+            limit = self.limits.get(route, self.workers)
+            sem = self.semaphores[route] = threading.BoundedSemaphore(max(1, limit))
+        return sem
+
+    def submit(self, route, fn, rep, release=None):
+        """
+        Runs handler fn on the thread pool rendering into a fresh response and streams it as the
+        body of rep once done.
+
+        Parameters:
+            route (str): name of the route for concurrency limits
+            fn (Callable): called with the response the handler renders into
+            rep (falcon.Response): response of the request
+            release (Callable | None): called once the response body is done with, or right away
+                when the request is refused
+
+        Raises:
+            falcon.HTTPServiceUnavailable: route is at its concurrency limit
+        """
+        sem = self.semaphore(route)
+        if not sem.acquire(blocking=False):
+            self.refused += 1
+            if release is not None:
+                release()
+            raise falcon.HTTPServiceUnavailable(
+                description=f"too many concurrent {route} requests",
+                retry_after=1,
+            )
+
+        out = falcon.Response(options=rep.options)
+        try:
+            future = self.executor.submit(fn, out)
+        except RuntimeError:  # shut down
+            sem.release()
+            if release is not None:
+                release()
+            raise falcon.HTTPServiceUnavailable(description="agency shutting down")
+
+        future.add_done_callback(lambda _: self.done(sem))
+        self.offloaded += 1
+        rep.status = falcon.HTTP_200
+        rep.stream = Deferred(future=future, rep=out, release=release)
+
+    def done(self, sem):
+        sem.release()
+        if self.waker is not None:
+            self.waker.wake()
+
+    def close(self):
+        """Stops the thread pool, called on agency shutdown"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        """Returns the thread count and counters of the offloader as a dict."""
+        return dict(
+            workers=self.workers, offloaded=self.offloaded, refused=self.refused
+        )
+
+
+def offload(route, stores=()):
+    """
+    Marks a read-only falcon responder to run on the agency Offloader under the concurrency limit
+    of route.  The responder runs inline when the agency has no read workers, the request is not
+    authenticated to an agent, the request is part of a batch or its response is encrypted with
+    ESSR, which needs the full response before the middleware completes.  Offloaded responders
+    must only read agent state.
+
+    An AgentView opens its stores lazily and only on the main loop, so the stores the responder
+    reads that a view opens lazily are opened before it is offloaded.  The agent is pinned until
+    its response has been sent so neither the agent cache nor the Releaser closes it meanwhile.
+
+    Usage:
+        class KeyEventCollectionEnd:
+            @staticmethod
+            @offload("kel")
+            def on_get(req, rep):
+                ...
+
+    Parameters:
+        route (str): name of the route for concurrency limits
+        stores (tuple): names of the lazily opened agent stores the responder reads
+    """
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            # responders are plain functions for static methods and methods otherwise
+            at = 0 if isinstance(args[0], falcon.Request) else 1
+            req, rep = args[at], args[at + 1]
+            agent = getattr(req.context, "agent", None)
+            offloader = getattr(getattr(agent, "agency", None), "offloader", None)
+            if (
+                offloader is None
+                or offloader.executor is None
+                or getattr(req.context, "batched", False)
+                or getattr(req.context, "mode", None) == AuthMode.ESSR
+            ):
+                return fn(*args, **kwargs)
+
+            for name in stores:
+                getattr(agent, name)
+
+            agency = agent.agency
+            agency.pin(agent.caid)
+            offloader.submit(
+                route,
+                lambda out: fn(*args[:at], req, out, *args[at + 2 :], **kwargs),
+                rep,
+                release=functools.partial(agency.unpin, agent.caid),
+            )
+
+        wrapper.offload = route
+        return wrapper
+
+    return decorator
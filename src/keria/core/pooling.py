@@ -0,0 +1,312 @@
+# -*- encoding: utf-8 -*-
+"""
+KERIA
+keria.core.pooling module
+
+Warm pool of pre-created agent keystores
+"""
+
+import fcntl
+import os
+import shutil
+import uuid
+from collections import deque
+
+import lmdb
+from hio.base import doing
+from keri.app import keeping
+from keri.db import basing
+
+from keria import ogler, log_name
+
+logger = ogler.getLogger(log_name)
+
+# Name prefix of the keystores in the pool, never a valid controller AID
+PoolPrefix = "pool-"
+
+
+def acquire(path):
+    """
+    Takes an exclusive lock on the lock file at path, creating it if missing, so agency processes
+    sharing a base never claim the same pooled keystore.
+
+    Returns:
+        int: file descriptor holding the lock or None if another process holds it
+    """
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def release(fd, path=None):
+    """Releases the lock held by fd, removing the lock file at path first when given"""
+    if path is not None and os.path.exists(path):
+        os.remove(path)
+    os.close(fd)
+
+
+def orphans(klas, base=""):
+    """
+    Returns the pooled keystore environment directories of LMDBer class klas under base, keyed by
+    name, in both the head and the alternate head directory klas may have opened them in.
+    """
+    paths = dict()
+    for head, tail in (
+        (klas.HeadDirPath, klas.TailDirPath),
+        (klas.AltHeadDirPath, klas.AltTailDirPath),
+    ):
+        dirpath = os.path.abspath(os.path.expanduser(os.path.join(head, tail, base)))
+        if not os.path.isdir(dirpath):
+            continue
+        for name in sorted(os.listdir(dirpath)):
+            path = os.path.join(dirpath, name)
+            if name.startswith(PoolPrefix) and os.path.isdir(path):
+                paths.setdefault(name, path)
+    return paths
+
+
+class Keystore:
+    """
+    Pre-created, unassigned agent keystore made of the LMDB environments of a Keeper and a Baser with
+    all of their sub databases created.  Creating these is most of the cost of booting an agent.
+
+    A persistent keystore holds an exclusive lock on a lock file next to its Keeper directory until
+    it is bound or removed, telling keystores left behind by a stopped process apart from the ones
+    still pooled by another agency process sharing the base.
+
+    Attributes:
+        .name (str): pool name of the keystore
+        .base (str): base directory of the keystore
+        .temp (bool): True means the environments live in temporary directories
+        .ks (Keeper): key store environment
+        .db (Baser): KEL database environment
+        .lock (int | None): file descriptor holding the lock of a persistent keystore
+
+    """
+
+    def __init__(self, name, base="", temp=False, lock=None):
+        """
+        Parameters:
+            name (str): pool name of the keystore
+            base (str): base directory of the keystore
+            temp (bool): True means create the environments in temporary directories
+            lock (int | None): file descriptor already holding the lock of a reclaimed keystore
+        """
+        self.name = name
+        self.base = base
+        self.temp = temp
+        self.ks = keeping.Keeper(name=name, base=base, temp=temp, reopen=True)
+        self.db = basing.Baser(name=name, base=base, temp=temp, reopen=True)
+        self.lock = lock
+        if not temp and lock is None:
+            self.lock = acquire(self.lockpath)
+            if self.lock is None:
+                self.close()
+                raise RuntimeError(f"Pooled keystore {name} claimed by another process")
+
+    @property
+    def lockpath(self):
+        """Path of the lock file of the keystore"""
+        return f"{self.ks.path}.lock"
+
+    def bind(self, caid):
+        """
+        Binds the keystore to controller AID caid by moving its environments to the locations the
+        agent of caid is opened from.  Temporary environments are handed over as they are.
+
+        Returns:
+            tuple: (Keeper, Baser) of the agent for caid, or None if caid already has a keystore
+        """
+        if self.temp:
+            return self.ks, self.db
+
+        # The Keeper moves last so the keystore stays locked until both environments have moved
+        moves = []
+        for dber in (self.db, self.ks):
+            path = dber.path
+            dest = os.path.join(os.path.dirname(path), caid)
+            if os.path.exists(dest):
+                self.close(clear=True)
+                return None
+            moves.append((dber, path, dest))
+
+        lockpath = self.lockpath
+        for dber, path, dest in moves:
+            dber.close()
+            os.rename(path, dest)
+        release(self.lock, lockpath)
+        self.lock = None
+
+        ks = keeping.Keeper(name=caid, base=self.base, temp=False, reopen=True)
+        db = basing.Baser(name=caid, base=self.base, temp=False, reopen=True)
+        return ks, db
+
+    def close(self, clear=False):
+        """Closes the environments of the keystore, removing them and its lock file when clear"""
+        lockpath = self.lockpath
+        for dber in (self.ks, self.db):
+            try:
+                dber.close(clear=clear)
+            except lmdb.Error as ex:
+                logger.error(f"Error closing pooled keystore {self.name}: {ex}")
+        if self.lock is not None:
+            release(self.lock, lockpath if clear else None)
+            self.lock = None
+
+
+def discard(future):
+    """Removes the keystore created by future"""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close(clear=True)
+
+
+class KeystorePool(doing.Doer):
+    """
+    Pool of pre-created, unassigned agent keystores refilled in the background up to .size keystores
+    so booting an agent only binds a pooled keystore to its controller AID.
+
+    Keystores are created on the executor when one is given, otherwise one per tick on the main loop.
+    Persistent keystores left in the pool by a previous run are reclaimed when the pool starts.
+
+    Attributes:
+        .size (int): number of keystores to keep ready, 0 disables the pool
+        .base (str): base directory of the keystores
+        .temp (bool): True means create the keystores in temporary directories
+        .executor (Executor | None): runs keystore creation off the main loop
+        .keystores (deque): ready keystores
+        .futures (list): keystore creations in flight on the executor
+        .hits (int): number of boots that took a pooled keystore
+        .misses (int): number of boots that found the pool empty
+
+    """
+
+    def __init__(self, size=0, base="", temp=False, executor=None, tock=0.0):
+        """
+        Parameters:
+            size (int): number of keystores to keep ready, 0 disables the pool
+            base (str): base directory of the keystores
+            temp (bool): True means create the keystores in temporary directories
+            executor (Executor | None): runs keystore creation off the main loop
+        """
+        self.size = size if size else 0
+        self.base = base
+        self.temp = temp
+        self.executor = executor
+        self.keystores = deque()
+        self.futures = []
+        self.hits = 0
+        self.misses = 0
+
+        super(KeystorePool, self).__init__(tock=tock)
+
+    def enter(self, temp=False):
+        """Reclaims the keystores left behind by a previous run when the pool starts"""
+        self.reclaim()
+
+    def take(self):
+        """
+        Takes a ready keystore out of the pool, safe to call from the boot worker threads.
+
+        Returns:
+            Keystore: pooled keystore or None if the pool is empty
+        """
+        try:
+            keystore = self.keystores.popleft()
+        except IndexError:
+            if self.size:
+                self.misses += 1
+            return None
+
+        self.hits += 1
+        return keystore
+
+    def create(self):
+        """Creates a new unassigned keystore"""
+        return Keystore(
+            name=f"{PoolPrefix}{uuid.uuid4().hex}", base=self.base, temp=self.temp
+        )
+
+    def reclaim(self):
+        """
+        Reclaims the pooled keystores under .base left behind by a process that stopped before
+        binding or removing them, skipping those still locked by a running agency process.  Whole
+        keystores are reused up to .size and removed beyond it along with environments left without
+        their pair, such as by a bind that was interrupted.
+        """
+        if self.temp:
+            return
+
+        reused = removed = 0
+        dbs = orphans(basing.Baser, self.base)
+        for name, path in orphans(keeping.Keeper, self.base).items():
+            lockpath = f"{path}.lock"
+            if (lock := acquire(lockpath)) is None:
+                dbs.pop(name, None)  # still pooled by a running agency process
+                continue
+
+            dbpath = dbs.pop(name, None)
+            if dbpath is not None and len(self.keystores) < self.size:
+                try:
+                    self.keystores.append(
+                        Keystore(name=name, base=self.base, lock=lock)
+                    )
+                    reused += 1
+                    continue
+                except Exception as ex:
+                    logger.error(f"Error reusing pooled keystore {name}: {ex}")
+
+            shutil.rmtree(path, ignore_errors=True)
+            if dbpath is not None:
+                shutil.rmtree(dbpath, ignore_errors=True)
+            release(lock, lockpath)
+            removed += 1
+
+        # Baser environments are only ever left alone when their Keeper is gone
+        for path in dbs.values():
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+
+        if reused or removed:
+            logger.info(
+                f"Reclaimed pooled keystores: {reused} reused, {removed} removed"
+            )
+
+    def recur(self, tyme=None, tock=0.0, **opts):
+        for future in [future for future in self.futures if future.done()]:
+            self.futures.remove(future)
+            try:
+                self.keystores.append(future.result())
+            except Exception as ex:
+                logger.error(f"Error creating pooled keystore: {ex}")
+
+        while len(self.keystores) + len(self.futures) < self.size:
+            if self.executor is None:
+                self.keystores.append(self.create())
+                break
+
+            self.futures.append(self.executor.submit(self.create))
+
+        return False
+
+    def close(self):
+        """Removes every ready keystore, called on agency shutdown"""
+        for future in self.futures:
+            if not future.cancel():  # already creating, remove once created
+                future.add_done_callback(discard)
+        self.futures = []
+        while self.keystores:
+            self.keystores.popleft().close(clear=True)
+
+    def stats(self):
+        """Returns the size, depth and counters of the pool as a dict."""
+        return dict(
+            size=self.size,
+            depth=len(self.keystores),
+            refilling=len(self.futures),
+            hits=self.hits,
+            misses=self.misses,
+        )
@@ -0,0 +1,152 @@
+# -*- encoding: utf-8 -*-
+"""
+KERIA
+keria.core.scheduling module
+
+Fair scheduling of agent background work across the tenants of an Agency
+"""
+
+import time
+import weakref
+
+from keria import ogler, log_name
+
+logger = ogler.getLogger(log_name)
+
+
+class FairScheduler:
+    """
+    Deficit round robin scheduler for the deeds of a DoDoer, used by the Agency to share each tick
+    fairly between its agents.
+
+    Every tick the deeds are visited in round robin order until the time budget of the tick is
+    spent.  The deeds not reached are first in line on the next tick.  Each visit earns a deed one
+    quantum of run time credit, capped at one quantum, and running it costs the time it took, so a
+    tenant whose background work, such as a huge escrow or a long KEL replay, takes longer than its
+    share sits out the following ticks until it has paid off its debt instead of starving the rest.
+
+    Deeds whose doer was requested through the admin API within the priority window are always run
+    first and are exempt from both the budget and the credit so admin initiated work completes
+    promptly.
+
+    Attributes:
+        .budget (float): time budget in seconds of a tick, 0.0 means unbounded
+        .quantum (float): run time credit in seconds earned by each visit
+        .window (float): seconds after an admin request its agent keeps priority
+        .deferrals (int): number of times a deed was not run because the tick budget was spent
+        .throttles (int): number of times a deed was not run because it was out of credit
+
+    """
+
+    def __init__(self, budget=0.0, quantum=0.01, window=1.0):
+        """
+        Parameters:
+            budget (float): time budget in seconds of a tick, 0.0 means unbounded
+            quantum (float): run time credit in seconds earned by each visit
+            window (float): seconds after an admin request its agent keeps priority
+        """
+        self.budget = budget
+        self.quantum = quantum
+        self.window = window
+        self.deferrals = 0
+        self.throttles = 0
+        self.credits = weakref.WeakKeyDictionary()
+
+    def prioritized(self, doer, now):
+        """Returns True if doer was requested through the admin API within the priority window"""
+        requested = getattr(doer, "requested", None)
+        return requested is not None and now - requested <= self.window
+
+    def cycle(self, dodoer, tyme, deeds=None):
+        """
+        Cycle once through the deeds of dodoer, equivalent to DoDoer.recur, running each deed whose
+        retyme has come, the prioritized ones first, within the time budget of the tick.
+
+        Parameters:
+            dodoer (DoDoer): owner of the deeds providing the default tock
+            tyme (float): tyme fed by the Doist
+            deeds (deque): tuples of form (dog, retyme, doer), defaults to dodoer.deeds
+        """
+        if deeds is None:
+            deeds = dodoer.deeds
+
+        start = time.perf_counter()
+        now = time.monotonic()
+        prioritized = [
+            deed for deed in deeds if deed[1] <= tyme and self.prioritized(deed[2], now)
+        ]
+        for deed in prioritized:
+            deeds.remove(deed)
+            self.run(dodoer, tyme, deed, deeds)
+
+        # Run the remainder in place preserving their order like DoDoer.recur
+        deeds.append((None, None, None))  # run through once marker
+        deferred = None
+        index = 0
+        while deeds:
+            deed = deeds.popleft()
+            dog, retyme, doer = deed
+            if not dog:
+                break
+
+            if retyme > tyme or any(doer is other[2] for other in prioritized):
+                deeds.append(deed)
+            elif self.budget and time.perf_counter() - start >= self.budget:
+                self.deferrals += 1
+                if deferred is None:
+                    deferred = index
+                deeds.append(deed)
+            elif not self.afford(doer):
+                self.throttles += 1
+                deeds.append(deed)
+            elif not self.run(dodoer, tyme, deed, deeds):
+                continue  # done so removed, index unchanged
+
+            index += 1
+
+        # Start the next tick with the first deed that did not fit in this one
+        if deferred:
+            deeds.rotate(-deferred)
+
+    def afford(self, doer):
+        """Earns doer a quantum of credit and returns True if it has credit left to run"""
+        credit = min(self.credits.get(doer, 0.0) + self.quantum, self.quantum)
+        self.credits[doer] = credit
+        return credit > 0.0
+
+    def run(self, dodoer, tyme, deed, deeds):
+        """
+        Runs deed once, charging its run time to its credit, and reappends it to deeds unless done.
+
+        Returns:
+            bool: True means reappended, False means done
+        """
+        dog, retyme, doer = deed
+        start = time.perf_counter()
+        try:  # send tyme. yield tock, tock may change during sended run
+            tock = dog.send(tyme)  # yielded tock == 0.0 means re-run asap
+        except StopIteration as ex:  # returned instead of yielded
+            try:
+                doer.done = ex.value if ex.value else False  # assign done state
+            except AttributeError:
+                doer.__func__.done = ex.value if ex.value else False
+            return False
+        finally:
+            if doer in self.credits:
+                self.credits[doer] -= time.perf_counter() - start
+
+        if not tock:  # rerun at next recur
+            retyme = tyme + dodoer.tock
+        else:
+            retyme += tock  # cumulative retyme of doer tock
+        deeds.append((dog, retyme, doer))
+        return True
+
+    def stats(self):
+        """Returns the scheduler configuration and counters as a dict."""
+        return dict(
+            budget=self.budget,
+            quantum=self.quantum,
+            deferrals=self.deferrals,
+            throttles=self.throttles,
+        )
@@ -5,9 +5,15 @@ keria.db.basing module
 
 """
 
+import contextlib
+import functools
+import itertools
+import sys
+import threading
 from dataclasses import dataclass
 from ordered_set import OrderedSet as oset
 
+import lmdb
 from keri.core import coring
 from keri.db import dbing, subing, koming
 
@@ -27,6 +33,27 @@ class IndexRecord:
     paths: list
 
 
+def resolver(path):
+    """
+    Returns a function resolving the value at the SAD path path in a SAD, decoding path once
+    instead of on every resolution.  Paths of field labels are resolved with plain dict lookups.
+
+    Parameters:
+        path (str): qb64 of the Pather of the SAD path
+    """
+    pather = coring.Pather(qb64=path)
+    parts = tuple(pather.path)
+    if any(part == "" or part.isdigit() for part in parts):
+        return lambda sad: pather._resolve(sad, list(parts))
+
+    def resolve(sad):
+        for part in parts:
+            sad = sad[part]
+        return sad
+
+    return resolve
+
+
 class AgencyBaser(dbing.LMDBer):
     """
     Agency database for tracking Agent tenants and their managed identifiers in this KERIA instance.
@@ -111,7 +138,361 @@ class AgencyBaser(dbing.LMDBer):
         self.aids = subing.CesrSuber(db=self, subkey="aids.", klas=coring.Prefixer)
 
 
-class Seeker(dbing.LMDBer):
+class RoutingIndex:
+    """
+    In memory index routing managed AIDs and agent AIDs to the controller AID of their agent.
+    Mirrors the .aids and .ctrl sub databases of an AgencyBaser so routing an inbound request to
+    its agent needs no LMDB reads.
+
+    Prefixes are kept as the qb64b bytes read from the database and every controller AID is
+    interned so all the AIDs of one agent share a single caid string, keeping the index to a
+    dict entry plus one small bytes object per AID.
+
+    """
+
+    def __init__(self, adb=None):
+        """
+        Parameters:
+            adb (AgencyBaser | None): agency database to load the index from
+        """
+        self._routes = dict()
+        if adb is not None:
+            self.load(adb)
+
+    def __len__(self):
+        return len(self._routes)
+
+    def __contains__(self, pre):
+        return pre.encode("utf-8") in self._routes
+
+    def load(self, adb):
+        """
+        Loads every agent AID and managed AID of adb, reading the raw sub databases with a cursor
+        instead of deserializing a Prefixer per entry.  Managed AIDs take precedence like in
+        Agency.lookup.
+
+        Returns:
+            int: number of routes loaded
+        """
+        with adb.env.begin(write=False, buffers=False) as txn:
+            for sub in (adb.ctrl, adb.aids):
+                cursor = txn.cursor(db=sub.sdb)
+                for key, val in cursor.iternext(keys=True, values=True):
+                    self._routes[key] = sys.intern(val.decode("utf-8"))
+
+        return len(self._routes)
+
+    def route(self, pre):
+        """Returns the qb64 controller AID of the agent of AID pre or None if not routed"""
+        return self._routes.get(pre.encode("utf-8"))
+
+    def add(self, pre, caid):
+        """Routes AID pre to the agent of controller AID caid"""
+        self._routes[pre.encode("utf-8")] = sys.intern(caid)
+
+    def remove(self, pre):
+        """Removes the route of AID pre if any"""
+        self._routes.pop(pre.encode("utf-8"), None)
+
+
+class AgencyStore(dbing.LMDBer):
+    """
+    Shared agency database holding the KERIA owned stores of every Agent tenant when the agency
+    runs in consolidated storage mode.  Tenants share one fixed set of named sub databases, one for
+    each sub database of the tenant stores, and every key is prefixed with the tenant's controller
+    AID, see TenantKeys.  One LMDB environment, reader table and memory map serves all tenants and
+    the number of named sub databases does not grow with the number of tenants.
+
+    Named sub databases are only opened under .lock, as LMDB does not allow opening them from
+    several threads at once, and are kept open for the life of the environment.
+
+    """
+
+    TailDirPath = "keri/ags"
+    AltTailDirPath = ".keri/ags"
+    TempPrefix = "keri_ags_"
+    # Distinct named sub databases of all tenants together, mostly the Seeker indexes of all schemas
+    MaxNamedDBs = 4096
+    MapSize = 64 * 1024 * 1024 * 1024
+
+    def __init__(self, headDirPath=None, perm=None, reopen=False, **kwa):
+        """
+        Setup shared agency database.
+
+        Inherited Parameters:
+            name is str directory path name differentiator for main database
+            temp is boolean, assign to .temp
+            headDirPath is optional str head directory pathname for main database
+            perm is numeric optional os dir permissions mode
+            reopen is boolean, IF True then database will be reopened by this init
+
+        """
+        if perm is None:
+            perm = self.Perm  # defaults to restricted permissions for non temp
+
+        self.lock = threading.RLock()
+
+        super(AgencyStore, self).__init__(
+            headDirPath=headDirPath, perm=perm, reopen=reopen, **kwa
+        )
+
+    def reopen(self, **kwa):
+        """
+        Open the shared environment with a memory map large enough for all tenants
+        """
+        self.opened = super(AgencyStore, self).reopen(**kwa)
+        if self.env is not None and self.env.info()["map_size"] < self.MapSize:
+            self.env.set_mapsize(self.MapSize)
+
+        return self.opened
+
+    @staticmethod
+    def prefix(tenant):
+        """Returns the bytes prefix of the keys of tenant"""
+        return f"{tenant}.".encode("utf-8")
+
+    def subdb(self, kind, **kwa):
+        """
+        Returns a kind sub database, such as a Suber or Komer, opening its named sub database under
+        .lock
+
+        Parameters:
+            kind (type): Suber or Komer class
+            kwa (dict): keyword arguments of kind
+        """
+        with self.lock:
+            return kind(**kwa)
+
+    def open(self, name, dupsort=False):
+        """Returns the named sub database name of the shared environment opened under .lock"""
+        with self.lock:
+            return self.env.open_db(key=name, dupsort=dupsort)
+
+    def count(self, tenant):
+        """
+        Returns the number of entries of tenant in all named sub databases
+
+        Parameters:
+            tenant (str): qb64 controller AID of the tenant
+
+        """
+        prefix = self.prefix(tenant)
+        count = 0
+        for name, dupsort in subdbNames(self.env, lock=self.lock):
+            sdb = self.open(name, dupsort=dupsort)
+            with self.env.begin(db=sdb, buffers=True) as txn:
+                cursor = txn.cursor()
+                if cursor.set_range(prefix):
+                    for key in cursor.iternext(values=False):
+                        if not bytes(key).startswith(prefix):
+                            break
+                        count += 1
+
+        return count
+
+    def drop(self, tenant):
+        """
+        Deletes all entries of tenant from every named sub database
+
+        Parameters:
+            tenant (str): qb64 controller AID of the tenant
+
+        Returns:
+            int: number of entries deleted
+        """
+        prefix = self.prefix(tenant)
+        count = 0
+        for name, dupsort in subdbNames(self.env, lock=self.lock):
+            sdb = self.open(name, dupsort=dupsort)
+            with self.env.begin(db=sdb, write=True) as txn:
+                count += clearPrefix(txn, sdb, prefix)
+
+        return count
+
+    def migrate(self, tenant, dber):
+        """
+        Copies every named sub database of the dedicated environment of a tenant store into the
+        shared sub database of the same name with keys prefixed by the tenant.  Existing entries
+        with the same keys are overwritten.
+
+        Parameters:
+            tenant (str): qb64 controller AID of the tenant
+            dber (LMDBer): opened dedicated environment of one of the tenant stores
+
+        Returns:
+            int: number of entries copied
+        """
+        prefix = self.prefix(tenant)
+        count = 0
+        for name, dupsort in subdbNames(dber.env):
+            src = dber.env.open_db(key=name, create=False)
+            dst = self.open(name, dupsort=dupsort)
+            with dber.env.begin(db=src, buffers=True) as rtxn:
+                with self.env.begin(db=dst, write=True) as wtxn:
+                    items = (
+                        (prefix + bytes(key), bytes(val))
+                        for key, val in rtxn.cursor().iternext()
+                    )
+                    consumed, _ = wtxn.cursor().putmulti(items, dupdata=dupsort)
+                    count += consumed
+
+        return count
+
+
+def subdbNames(env, prefix=b"", lock=None):
+    """
+    Returns the names of the named sub databases in env starting with prefix along with their
+    dupsort flag.  Named sub databases are recorded as keys in the main database of env.
+
+    Parameters:
+        env (lmdb.Environment): opened LMDB environment
+        prefix (bytes): name prefix to filter by
+        lock (threading.RLock | None): held while opening sub databases of a shared environment
+
+    Returns:
+        list: (name, dupsort) tuples
+    """
+    with env.begin() as txn:
+        cursor = txn.cursor()
+        keys = []
+        if cursor.set_range(prefix):
+            for key in cursor.iternext(values=False):
+                if not key.startswith(prefix):
+                    break
+                keys.append(bytes(key))
+
+    names = []
+    with lock if lock is not None else contextlib.nullcontext():
+        for key in keys:
+            try:  # flags of an existing sub database are read from the database itself
+                sdb = env.open_db(key=key, create=False)
+            except lmdb.IncompatibleError:  # plain key in main database
+                continue
+            with env.begin() as txn:
+                names.append((key, sdb.flags(txn)["dupsort"]))
+
+    return names
+
+
+def clearPrefix(txn, sdb, prefix):
+    """
+    Deletes every entry of sub database sdb whose key starts with prefix in write transaction txn
+
+    Returns:
+        int: number of keys deleted
+    """
+    cursor = txn.cursor(db=sdb)
+    count = 0
+    if cursor.set_range(prefix):
+        while bytes(cursor.key()).startswith(prefix):
+            count += 1
+            if not cursor.delete(dupdata=True):  # deleted the last key
+                break
+
+    return count
+
+
+class TenantKeys:
+    """
+    Mixin of Suber and Komer classes keeping the entries of a tenant store in a sub database of the
+    shared AgencyStore.  Every key is prefixed with the .keyspace of the tenant store, so reads,
+    writes and iteration, including over the whole sub database, only see the tenant's entries.
+
+    """
+
+    def _tokey(self, keys, topive=False):
+        return self.db.keyspace + super()._tokey(keys, topive=topive)
+
+    def _tokeys(self, key):
+        if isinstance(key, memoryview):
+            key = bytes(key)
+        if hasattr(key, "decode"):
+            key = key[len(self.db.keyspace) :]
+        return super()._tokeys(key)
+
+    def cntAll(self):
+        return sum(1 for _ in self.db.getTopItemIter(db=self.sdb, top=self.db.keyspace))
+
+
+@functools.cache
+def tenanted(kind):
+    """Returns the TenantKeys subclass of Suber or Komer class kind"""
+    return type(kind.__name__, (TenantKeys, kind), dict())
+
+
+class TenantLMDBer(dbing.LMDBer):
+    """
+    LMDBer for the KERIA owned stores of an Agent tenant.
+
+    By default the store is its own LMDB environment.  When a shared AgencyStore is provided the
+    store opens no environment of its own and keeps its entries in the shared sub databases of the
+    AgencyStore with every key prefixed by the tenant's controller AID, its .keyspace.  Sub
+    databases of tenant stores are created with .subdb so they work the same in both modes.
+
+    """
+
+    def __init__(self, store=None, tenant=None, **kwa):
+        """
+        Parameters:
+            store (AgencyStore | None): shared agency database, None means a dedicated environment
+            tenant (str | None): qb64 controller AID of the tenant, required with store
+
+        """
+        if store is not None and not tenant:
+            raise ValueError("tenant required to use a shared agency store")
+
+        self.store = store
+        self.tenant = tenant
+        # Prefix of every key of this store, empty in a dedicated environment
+        self.keyspace = store.prefix(tenant) if store is not None else b""
+
+        super(TenantLMDBer, self).__init__(**kwa)
+
+    def subdb(self, kind, subkey, **kwa):
+        """
+        Returns the kind sub database, a Suber or Komer class, named subkey of this store
+
+        Parameters:
+            kind (type): Suber or Komer class
+            subkey (str): name of the sub database
+            kwa (dict): other keyword arguments of kind, such as klas or schema
+        """
+        if self.store is None:
+            return kind(db=self, subkey=subkey, **kwa)
+        return self.store.subdb(tenanted(kind), db=self, subkey=subkey, **kwa)
+
+    def clearAll(self, txn, sdb):
+        """Deletes every entry of this store in sub database sdb in write transaction txn"""
+        if self.store is None:
+            txn.drop(sdb, delete=False)
+        else:
+            clearPrefix(txn, sdb, self.keyspace)
+
+    def reopen(self, **kwa):
+        if self.store is None:
+            return super(TenantLMDBer, self).reopen(**kwa)
+
+        if not self.store.opened:
+            self.store.reopen()
+
+        self.env = self.store.env
+        self.path = self.store.path
+        self.opened = True
+        return self.opened
+
+    def close(self, clear=False):
+        if self.store is None:
+            return super(TenantLMDBer, self).close(clear=clear)
+
+        # The shared environment stays open for the other tenants
+        if clear and self.store.opened:
+            self.store.drop(self.tenant)
+
+        self.env = None
+        self.opened = False
+
+
+class Seeker(TenantLMDBer):
     """
     Seeker indexes all credentials in the KERIpy `saved` Creder database.
 
@@ -152,6 +533,8 @@ class Seeker(dbing.LMDBer):
         self.db = db
         self.reger = reger
         self.indexes = dict()
+        # Compiled index plans keyed by schema SAID, see .plan
+        self.plans = dict()
 
         self.schIdx = None
         self.dynIdx = None
@@ -162,20 +545,17 @@ class Seeker(dbing.LMDBer):
 
     def reopen(self, **kwa):
         super(Seeker, self).reopen(**kwa)
+        self.plans = dict()
 
         # List of indexs for a given schema
-        self.schIdx = subing.IoSetSuber(db=self, subkey="schIdx.")
+        self.schIdx = self.subdb(subing.IoSetSuber, subkey="schIdx.")
         # List of dynamically created indexes to be recreated at load
-        self.dynIdx = koming.Komer(
-            db=self,
-            subkey="dynIdx.",
-            schema=IndexRecord,
-        )
+        self.dynIdx = self.subdb(koming.Komer, subkey="dynIdx.", schema=IndexRecord)
 
         for name, idx in self.dynIdx.getItemIter():
             key = ".".join(name)
-            self.indexes[key] = subing.CesrDupSuber(
-                db=self, subkey=idx.subkey, klas=coring.Saider
+            self.indexes[key] = self.subdb(
+                subing.CesrDupSuber, subkey=idx.subkey, klas=coring.Saider
             )
 
         # Create persistent Indexes if they don't already exist
@@ -202,53 +582,128 @@ class Seeker(dbing.LMDBer):
 
     def createIndex(self, key):
         if self.dynIdx.get(keys=(key,)) is None:
-            self.indexes[key] = subing.CesrDupSuber(
-                db=self, subkey=key, klas=coring.Saider
+            self.indexes[key] = self.subdb(
+                subing.CesrDupSuber, subkey=key, klas=coring.Saider
             )
             self.dynIdx.pin(keys=(key,), val=IndexRecord(subkey=key, paths=[key]))
 
-    def index(self, said):
-        if (saider := self.reger.saved.get(keys=(said,))) is None:
-            raise ValueError(f"{said} is not a verified credential")
+    def plan(self, schema, generate=True):
+        """
+        Returns the compiled index plan of a schema, a list of (sub database, resolvers) tuples,
+        one for each index of the schema with a resolver function for each of its paths.  Plans
+        are compiled once from schIdx and dynIdx and cached as the indexes of a schema never change.
 
-        creder = self.reger.creds.get(keys=(saider.qb64,))
-        saider = coring.Saider(qb64b=creder.saidb)
+        Parameters:
+            schema (str): SAID of the schema
+            generate (bool): True means generate the indexes of a schema not yet indexed
+
+        Returns:
+            list: index plan, empty if the schema is not indexed and generate is False
+        """
+        if (plan := self.plans.get(schema)) is not None:
+            return plan
 
         # Load schema index and if not indexed in schIdx, index it.
-        schemaSaid = creder.schema
-        if not (indexes := self.schIdx.get(keys=(schemaSaid,))):
-            indexes = self.generateIndexes(schemaSaid)
+        if not (indexes := self.schIdx.get(keys=(schema,))):
+            if not generate:
+                return []
+            indexes = self.generateIndexes(schema)
 
+        plan = []
         for index in indexes:
-            db = self.indexes[index]
             idx = self.dynIdx.get(keys=(index,))
-            values = []
-            for path in idx.paths:
-                pather = coring.Pather(qb64=path)
-                values.append(pather.resolve(creder.sad))
+            plan.append(
+                (self.indexes[index].sdb, tuple(resolver(path) for path in idx.paths))
+            )
 
-            value = "".join(values)
-            db.add(keys=(value,), val=saider)
+        self.plans[schema] = plan
+        return plan
+
+    @staticmethod
+    def entries(creder, plan):
+        """Returns the (sub database, key) tuple of each index entry of creder in index plan"""
+        sad = creder.sad
+        return [
+            (sdb, "".join([resolve(sad) for resolve in resolvers]).encode("utf-8"))
+            for sdb, resolvers in plan
+        ]
+
+    def write(self, items):
+        """Adds the (sub database, key, val) index entries of items in one write transaction"""
+        with self.env.begin(write=True, buffers=True) as txn:
+            for sdb, key, val in items:
+                try:
+                    txn.put(self.keyspace + key, val, db=sdb, dupdata=True)
+                except lmdb.BadValsizeError:
+                    raise KeyError(
+                        f"Key: `{key}` is either empty, too big (for lmdb), or wrong DUPFIXED size."
+                    )
+
+    def index(self, said):
+        if (saider := self.reger.saved.get(keys=(said,))) is None:
+            raise ValueError(f"{said} is not a verified credential")
+
+        creder = self.reger.creds.get(keys=(saider.qb64,))
+        entries = self.entries(creder, self.plan(creder.schema))
+
+        # One write transaction for all the indexes of the credential
+        self.write([(sdb, key, creder.saidb) for sdb, key in entries])
 
     def unindex(self, said):
         if (saider := self.reger.saved.get(keys=(said,))) is None:
             raise ValueError(f"{said} is not a verified credential")
 
         creder = self.reger.creds.get(keys=(saider.qb64,))
-        indexes = self.schIdx.get(keys=(creder.schema,))
-        if not indexes:
+        if not (plan := self.plan(creder.schema, generate=False)):
             raise ValueError(f"No known indexes for schema {creder.schema}")
 
-        for index in indexes:
-            db = self.indexes[index]
-            idx = self.dynIdx.get(keys=(index,))
-            values = []
-            for path in idx.paths:
-                pather = coring.Pather(qb64=path)
-                values.append(pather.resolve(creder.sad))
+        with self.env.begin(write=True, buffers=True) as txn:
+            for sdb, key in self.entries(creder, plan):
+                txn.delete(self.keyspace + key, creder.saidb, db=sdb)
 
-            value = "".join(values)
-            db.rem(keys=(value,), val=saider)
+    def reindex(self, batch=10000):
+        """
+        Drops and rebuilds every index from the saved credentials of the registry.  Schema index
+        lists are generated again so the indexes follow the current schemas, and the entries of
+        batch credentials are written per write transaction.
+
+        Parameters:
+            batch (int): number of credentials indexed per write transaction
+
+        Returns:
+            tuple: numbers of credentials indexed and of credentials that could not be indexed
+        """
+        with self.env.begin(write=True) as txn:
+            for db in self.indexes.values():
+                self.clearAll(txn, db.sdb)
+            self.clearAll(txn, self.schIdx.sdb)
+        self.plans = dict()
+
+        maxKeySize = self.env.max_key_size() - len(self.keyspace)
+        indexed = failed = 0
+        items = []
+        for _, saider in self.reger.saved.getItemIter():
+            try:
+                creder = self.reger.creds.get(keys=(saider.qb64,))
+                entries = self.entries(creder, self.plan(creder.schema))
+            except Exception:
+                failed += 1
+                continue
+
+            if any(not key or len(key) > maxKeySize for _, key in entries):
+                failed += 1
+                continue
+
+            items.extend((sdb, key, creder.saidb) for sdb, key in entries)
+            indexed += 1
+            if indexed % batch == 0:
+                self.write(items)
+                items = []
+
+        if items:
+            self.write(items)
+
+        return indexed, failed
 
     def generateIndexes(self, said):
         """Parse schema of said, create schIdx entry keyed to said of schema and the subkey indexes in
@@ -295,8 +750,8 @@ class Seeker(dbing.LMDBer):
 
             pather = coring.Pather(path=["a", p])
             if pather.qb64 not in self.indexes:
-                self.indexes[pather.qb64] = subing.CesrDupSuber(
-                    db=self, subkey=pather.qb64, klas=coring.Saider
+                self.indexes[pather.qb64] = self.subdb(
+                    subing.CesrDupSuber, subkey=pather.qb64, klas=coring.Saider
                 )
                 idx = IndexRecord(subkey=pather.qb64, paths=[pather.qb64])
                 self.dynIdx.pin(keys=(pather.qb64,), val=idx)
@@ -304,8 +759,8 @@ class Seeker(dbing.LMDBer):
 
             subkey = f"{SCHEMA_FIELD.qb64}.{pather.qb64}"
             if subkey not in self.indexes:
-                self.indexes[subkey] = subing.CesrDupSuber(
-                    db=self, subkey=subkey, klas=coring.Saider
+                self.indexes[subkey] = self.subdb(
+                    subing.CesrDupSuber, subkey=subkey, klas=coring.Saider
                 )
                 idx = IndexRecord(subkey=subkey, paths=[SCHEMA_FIELD.qb64, pather.qb64])
                 self.dynIdx.pin(keys=(subkey,), val=idx)
@@ -314,8 +769,8 @@ class Seeker(dbing.LMDBer):
             for field in (ISSUER_FIELD, ISSUEE_FIELD):
                 subkey = f"{field.qb64}.{pather.qb64}"
                 if subkey not in self.indexes:
-                    self.indexes[subkey] = subing.CesrDupSuber(
-                        db=self, subkey=subkey, klas=coring.Saider
+                    self.indexes[subkey] = self.subdb(
+                        subing.CesrDupSuber, subkey=subkey, klas=coring.Saider
                     )
                     idx = IndexRecord(subkey=subkey, paths=[field.qb64, pather.qb64])
                     self.dynIdx.pin(keys=(subkey,), val=idx)
@@ -324,8 +779,8 @@ class Seeker(dbing.LMDBer):
 
                 subkey = f"{field.qb64}.{SCHEMA_FIELD.qb64}.{pather.qb64}"
                 if subkey not in self.indexes:
-                    self.indexes[subkey] = subing.CesrDupSuber(
-                        db=self, subkey=subkey, klas=coring.Saider
+                    self.indexes[subkey] = self.subdb(
+                        subing.CesrDupSuber, subkey=subkey, klas=coring.Saider
                     )
                     idx = IndexRecord(
                         subkey=subkey,
@@ -337,11 +792,13 @@ class Seeker(dbing.LMDBer):
 
         return [index for index in self.schIdx.get(keys=(said,))]
 
-    def find(self, filtr, sort=None, skip=None, limit=None):
-        return Cursor(seeker=self, filtr=filtr, sort=sort, skip=skip, limit=limit)
+    def find(self, filtr, sort=None, skip=None, limit=None, after=None):
+        return Cursor(
+            seeker=self, filtr=filtr, sort=sort, skip=skip, limit=limit, after=after
+        )
 
 
-class ExnSeeker(dbing.LMDBer):
+class ExnSeeker(TenantLMDBer):
     """
     Seeker indexes all credentials in the KERIpy `saved` Creder database.
 
@@ -428,7 +885,9 @@ class ExnSeeker(dbing.LMDBer):
             yield said
 
     def createIndex(self, key):
-        self.indexes[key] = subing.CesrDupSuber(db=self, subkey=key, klas=coring.Saider)
+        self.indexes[key] = self.subdb(
+            subing.CesrDupSuber, subkey=key, klas=coring.Saider
+        )
 
     def index(self, said):
         if (serder := self.db.exns.get(keys=(said,))) is None:
@@ -452,12 +911,24 @@ class ExnSeeker(dbing.LMDBer):
 
             db.add(keys=(value,), val=saider)
 
-    def find(self, filtr, sort=None, skip=None, limit=None):
-        return Cursor(seeker=self, filtr=filtr, sort=sort, skip=skip, limit=limit)
+    def find(self, filtr, sort=None, skip=None, limit=None, after=None):
+        return Cursor(
+            seeker=self, filtr=filtr, sort=sort, skip=skip, limit=limit, after=after
+        )
 
 
 class Cursor:
-    def __init__(self, seeker, filtr=None, sort=None, skip=None, limit=None):
+    """
+    Lazy query over the credentials, or exchange messages, of a Seeker.  Results are streamed from
+    LMDB iterators of the table or the indexes and iteration stops after .limit results, so an
+    unsorted query holds no more than a page of SAIDs.  Queries are continued after the SAID of
+    the last result of a previous page with after instead of skipping over the previous pages.
+
+    """
+
+    def __init__(
+        self, seeker, filtr=None, sort=None, skip=None, limit=None, after=None
+    ):
         self.filtr = filtr
         self.operators = operators(self.filtr)
         self.names = [op.name for op in self.operators]
@@ -470,8 +941,8 @@ class Cursor:
         self._sort = sort
         self._skip = skip if skip is not None else 0
         self._limit = limit if limit is not None else 25
+        self._after = after
 
-        self.cur = None
         self.saids = None
 
     def __iter__(self):
@@ -479,14 +950,9 @@ class Cursor:
 
     def __next__(self):
         if self.saids is None:
-            self._query()
-
-        if self.cur >= len(self.saids):
-            raise StopIteration
+            self.saids = self._query()
 
-        said = self.saids[self.cur]
-        self.cur += 1
-        return said
+        return next(self.saids)
 
     def sort(self, sort):
         self._sort = sort
@@ -500,19 +966,52 @@ class Cursor:
         self._limit = limit
         return self
 
+    def after(self, after):
+        self._after = after
+        return self
+
     def _query(self):
-        self.cur = 0
-        if len(self.filtr) == 0:
-            self.saids = self.order(
-                [said for (said,), _ in self.seeker.table.getItemIter()]
-            )
-        elif (saids := self.indexSearch()) is not None:
-            self.saids = self.order(saids)
-        elif (saids := self.indexScan()) is not None:
-            self.saids = self.order(saids)
+        if len(self.filtr) == 0 and not self._sort:
+            # Table order is key order so continue by seeking to the key after the last result
+            saids = self.tableIter(after=self._after)
         else:
-            saids = self.fullTableScan()
-            self.saids = self.order(saids)
+            if len(self.filtr) == 0:
+                saids = None
+            elif (saids := self.indexSearch()) is not None:
+                pass
+            elif (saids := self.indexScan()) is not None:
+                pass
+            else:
+                saids = self.fullTableScan()
+
+            saids = self.resume(self.order(saids))
+
+        return itertools.islice(saids, self._skip, self._skip + self._limit)
+
+    def tableIter(self, after=None):
+        """Yields the SAIDs of the table in key order, after the SAID after if any, reading keys only"""
+        table = self.seeker.table
+        after = after.encode("utf-8") if after else b""
+        with table.db.env.begin(db=table.sdb, write=False, buffers=True) as txn:
+            cursor = txn.cursor()
+            if not cursor.set_range(after):
+                return
+
+            for key in cursor.iternext(values=False):
+                key = bytes(key)
+                if key == after:
+                    continue
+                yield key.decode("utf-8")
+
+    def resume(self, saids):
+        """Yields the SAIDs of saids that come after the .after SAID, or all of them without it"""
+        saids = iter(saids)
+        if self._after:
+            for said in saids:
+                if said == self._after:
+                    break
+
+        yield from saids
 
     def indexSearch(self):
         if len(self.operators) == 1 and self.operators[0].name in self.seeker.indexes:
@@ -526,7 +1025,7 @@ class Cursor:
 
         idx = self.seeker.indexes[index]
         val = "".join(self.values)
-        return [val.qb64 for val in idx.getIter(keys=(val,))]
+        return (val.qb64 for val in idx.getIter(keys=(val,)))
 
     def indexScan(self):
         use = []
@@ -554,25 +1053,23 @@ class Cursor:
         if len(scan) == 0:
             return list(saids)
         else:
-            return self.tableScan(list(saids), scan)
+            return self.tableScan(saids, scan)
 
     def fullTableScan(self):
-        saids = [saider.qb64 for _, saider in self.seeker.saidIter()]
+        saids = (saider.qb64 for _, saider in self.seeker.saidIter())
         return self.tableScan(saids, ops=self.operators)
 
     def tableScan(self, saids, ops):
-        res = []
         for said in saids:
             val = self.seeker.value(said)
             for op in ops:
                 if op(val):
-                    res.append(said)
-
-        return res
+                    yield said
 
     def order(self, saids):
+        """Returns saids in sort order, None saids means every SAID of the table"""
         if not self._sort:
-            return self.slice(saids)
+            return saids
 
         if (res := self.indexOrder(saids)) is not None:
             return res
@@ -584,33 +1081,14 @@ class Cursor:
         if index not in self.seeker.indexes:
             return None
 
+        # Membership of every match is needed to walk the sort index in order
+        saids = set(saids) if saids is not None else None
         idx = self.seeker.indexes[index]
-        ctx = idx.getItemIter()
-
-        # Run off the values before start
-        cur = 0
-        while cur < self._skip:
-            _, saider = next(ctx)
-            if saider.qb64 in saids:
-                cur += 1
-
-        # Load values in order until we get enough (based on limit)
-        res = []
-        for _, saider in ctx:
-            if saider.qb64 in saids:
-                res.append(saider.qb64)
-
-            if len(res) == self._limit:
-                break
-
-        return res
-
-    def slice(self, saids):
-        if self._skip >= len(saids):
-            return []
-
-        end = self._skip + self._limit
-        return saids[self._skip : end]
+        return (
+            saider.qb64
+            for _, saider in idx.getItemIter()
+            if saids is None or saider.qb64 in saids
+        )
 
     def tableScanOrder(self, saids):
         """Should we bother implementing table scan sort order
@@ -619,10 +1097,10 @@ class Cursor:
         only occur if multiple fields are selected for which we don't have a multi-column
         index.  In that case, perhaps we raise an exception.
 
-        For now, we'll just slice the results to honor skip and limit.
+        For now, we'll just return the results unordered to honor skip and limit.
 
         """
-        return self.slice(saids)
+        return saids if saids is not None else self.tableIter()
 
 
 def operators(filtr):
@@ -669,7 +1147,7 @@ class Eq:
         return self.pather.qb64
 
     def index(self, idx):
-        return [val.qb64 for val in idx.getIter(keys=(self.value,))]
+        return (val.qb64 for val in idx.getIter(keys=(self.value,)))
 
 
 class Begins:
@@ -694,7 +1172,7 @@ class Begins:
         return val.startswith(self.value)
 
     def index(self, idx):
-        return [val.qb64 for _, val in idx.getItemIter(keys=(self.value,))]
+        return (val.qb64 for _, val in idx.getItemIter(keys=(self.value,)))
 
     @property
     def name(self) -> str:
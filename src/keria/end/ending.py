@@ -85,7 +85,7 @@ class OOBIEnd:
 
             aid = self.default
 
-        agent = self.agency.lookup(pre=aid)
+        agent = self.agency.lookup(pre=aid, view=True)
         if agent is None:
             raise falcon.HTTPNotFound(description="AID not found for this OOBI")
 
@@ -11,6 +11,7 @@ import multiprocessing
 import os
 import shutil
 import signal
+import threading
 import time
 from base64 import b64encode
 
@@ -33,7 +34,7 @@ from keri.help import nowIso8601
 from keri.vdr import credentialing
 
 from keria.app import agenting, aiding
-from keria.core import longrunning, httping
+from keria.core import longrunning, httping, offloading
 from keria.testing.testing_helper import SCRIPTS_DIR
 
 
@@ -346,6 +347,174 @@ def test_agency():
         assert len(agent.doers) == 0
 
 
+def test_agency_views():
+    salt = b"0123456789vvvvvv"
+    salter = core.Salter(raw=salt)
+    base = "keria-views"
+
+    def cleanup():
+        for sub in (
+            "db",
+            "ks",
+            "adb",
+            "reg",
+            "opr",
+            "not",
+            "mbx",
+            "rks",
+            "seekdb",
+            "exndb",
+        ):
+            if os.path.exists(f"/usr/local/var/keri/{sub}/{base}"):
+                shutil.rmtree(f"/usr/local/var/keri/{sub}/{base}")
+
+    cleanup()
+    agency = agenting.Agency(name="agency", base=base, bran=None)
+    doist = doing.Doist(limit=1.0, tock=0.03125, real=True)
+    doist.enter(doers=[agency])
+
+    caid = "ELI7pg979AdhmvrjDeam2eAO2SR5niCgnjAJXJHtVose"
+    agent = agency.create(caid, salt=salter.qb64)
+    pre = agent.pre
+    agency.shut(agent)
+    assert caid not in agency.agents
+
+    # Unknown controllers have no view
+    assert agency.view("E987eerAdhmvrjDeam2eAO2SR5niCgnjAJXJHtJoe") is None
+
+    # Cold agents are served by a read-only view with no doers running
+    view = agency.view(caid)
+    assert isinstance(view, agenting.AgentView)
+    assert view.pre == pre
+    assert caid in agency.views
+    assert caid not in agency.agents
+    assert agency.view(caid) is view
+    assert agency.lookup(pre, view=True) is view
+
+    # Lazily opened stores are adopted by the agent on upgrade
+    seeker = view.seeker
+    agent = agency.get(caid)
+    assert isinstance(agent, agenting.Agent)
+    assert agent.seeker is seeker
+    assert agent.hby is view.hby
+    assert caid not in agency.views
+    assert agency.view(caid) is agent
+
+    # Views release without starting doers and upgrade transparently on write access
+    agency.shut(agent)
+    view = agency.view(caid)
+    agency.release(view)
+    assert caid not in agency.views
+
+    view = agency.view(caid)
+    monitor = view.monitor
+    assert caid in agency.agents
+    assert monitor is agency.agents[caid].monitor
+
+    # The upgraded view serves every store from the agent rather than opening its own
+    agent = agency.agents[caid]
+    assert view.seeker is agent.seeker
+    assert view.notifier is agent.notifier
+    assert view.rgy is agent.rgy
+    assert view._seeker is None
+
+    agency.shut(agency.agents[caid])
+    cleanup()
+
+
+class ViewReads:
+    """Offloaded responder reading the lazily opened stores of the agent it is authenticated to"""
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.started = threading.Barrier(2, timeout=5.0)
+        self.seekers = []
+        self.errors = []
+
+    @offloading.offload("views", stores=("rgy", "seeker"))
+    def on_get(self, req, rep):
+        agent = req.context.agent
+        self.started.wait()
+        self.gate.wait(5.0)
+        self.seekers.append(agent.seeker)
+        assert agent.rgy.reger.env is not None
+        for name in ("exnseeker", "monitor"):
+            try:
+                getattr(agent, name)
+            except RuntimeError as ex:
+                self.errors.append(str(ex))
+        rep.media = dict(count=agent.rgy.reger.saved.cntAll())
+
+
+def test_agency_view_offloaded_reads():
+    salter = core.Salter(raw=b"0123456789oooooo")
+    base = "keria-offload-views"
+
+    def cleanup():
+        for sub in ("db", "ks", "adb", "reg", "opr", "not", "mbx", "rks"):
+            if os.path.exists(f"/usr/local/var/keri/{sub}/{base}"):
+                shutil.rmtree(f"/usr/local/var/keri/{sub}/{base}")
+
+    cleanup()
+    agency = agenting.Agency(name="agency", base=base, bran=None, readWorkers=2)
+    doist = doing.Doist(limit=1.0, tock=0.03125, real=True)
+    doist.enter(doers=[agency])
+
+    caid = "ELI7pg979AdhmvrjDeam2eAO2SR5niCgnjAJXJHtVose"
+    agency.shut(agency.create(caid, salt=salter.qb64))
+    reads = ViewReads()
+
+    try:
+        # Two concurrent offloaded reads on a cold tenant
+        view = agency.view(caid)
+        assert view._seeker is None and view._rgy is None
+        streams = []
+        for _ in range(2):
+            req = testing.create_req(path="/views")
+            req.context.agent = agency.view(caid)
+            rep = falcon.Response()
+            reads.on_get(req, rep)
+            streams.append(rep.stream)
+
+        # The stores were opened once on the main loop before the reads were offloaded
+        seeker = view._seeker
+        assert seeker is not None and view._rgy is not None
+        assert agency.pins == {caid: 2}
+
+        # Neither the Releaser nor the agent cache closes a pinned view or agent
+        agency.idle.track(caid, timeout=0.0)
+        next(agenting.Releaser(agency).recur())
+        assert agency.views[caid] is view
+        assert caid in agency.idle
+
+        agency.pin("EAmhrcHz9Df7Ze3kPUGyYpqbGWMUKP2ZdP1YaxBbHKc7")
+        assert agency.pinned("EAmhrcHz9Df7Ze3kPUGyYpqbGWMUKP2ZdP1YaxBbHKc7")
+        agency.unpin("EAmhrcHz9Df7Ze3kPUGyYpqbGWMUKP2ZdP1YaxBbHKc7")
+
+        reads.gate.set()
+        bodies = [b"".join(stream) for stream in streams]
+        assert bodies == [b'{"count": 0}'] * 2
+        assert reads.seekers == [seeker, seeker]
+
+        # Stores not opened before offloading are never opened or upgraded from a read worker
+        assert len(reads.errors) == 4
+        assert all("off the main loop" in error for error in reads.errors)
+        assert view._exnseeker is None
+        assert caid not in agency.agents
+
+        # Released once their responses were sent
+        assert agency.pins == {}
+        agency.idle.track(caid, timeout=0.0)
+        next(agenting.Releaser(agency).recur())
+        assert caid not in agency.views
+    finally:
+        reads.gate.set()
+        agency.offloader.close()
+        agency.shutdownAgency()
+        agency.adb.close()
+        cleanup()
+
+
 def test_agency_without_config_file():
     salt = b"0123456789bbbbbb"
     salter = core.Salter(raw=salt)
@@ -453,6 +622,282 @@ def test_unprotected_boot_ends(helpers):
     }
 
 
+def test_async_boot_ends(helpers):
+    agency = agenting.Agency(name="agency", bran=None, temp=True, bootWorkers=1)
+    doist = doing.Doist(limit=1.0, tock=0.03125, real=True)
+    deeds = doist.enter(doers=[agency])
+
+    serder, sigers = helpers.controller()
+    caid = serder.pre
+
+    app = falcon.App()
+    client = testing.TestClient(app)
+
+    bootEnd = agenting.BootEnd(agency)
+    app.add_route("/boot", bootEnd)
+    app.add_route("/boot/{caid}", bootEnd, suffix="status")
+
+    rep = client.simulate_get(f"/boot/{caid}")
+    assert rep.status_code == 404
+
+    body = dict(
+        icp=serder.ked,
+        sig=sigers[0].qb64,
+        salty=dict(
+            stem="signify:aid",
+            pidx=0,
+            tier="low",
+            sxlt="OBXYZ",
+            icodes=[MtrDex.Ed25519_Seed],
+            ncodes=[MtrDex.Ed25519_Seed],
+        ),
+    )
+
+    rep = client.simulate_post(
+        "/boot",
+        body=json.dumps(body).encode("utf-8"),
+        headers={"Prefer": "respond-async"},
+    )
+    assert rep.status_code == 202
+    assert rep.headers["Preference-Applied"] == "respond-async"
+    assert rep.headers["Location"] == f"/boot/{caid}"
+    assert rep.json["name"] == f"boot.{caid}"
+    assert rep.json["done"] is False
+
+    boot = agency.boots[caid]
+    agent = boot.future.result(timeout=30)
+    assert caid not in agency.agents  # installed from the main loop only
+
+    rep = client.simulate_post(
+        "/boot",
+        body=json.dumps(body).encode("utf-8"),
+        headers={"Prefer": "respond-async"},
+    )
+    assert rep.status_code == 409
+
+    doist.recur(deeds=deeds)
+    assert boot.done
+    assert agency.agents[caid] is agent
+    assert agency.adb.agnt.get(keys=(caid,)).qb64 == agent.pre
+
+    rep = client.simulate_get(f"/boot/{caid}")
+    assert rep.status_code == 200
+    assert rep.json["done"] is True
+    assert rep.json["response"]["i"] == agent.pre
+
+    # Invalid inception fails the operation and leaves no agent behind
+    serder, _ = helpers.controller(bran=b"abcdefghijk0123456789")
+    body["icp"] = serder.ked
+    rep = client.simulate_post(
+        "/boot",
+        body=json.dumps(body).encode("utf-8"),
+        headers={"Prefer": "respond-async"},
+    )
+    assert rep.status_code == 202
+
+    boot = agency.boots[serder.pre]
+    with pytest.raises(falcon.HTTPBadRequest):
+        boot.future.result(timeout=30)
+    doist.recur(deeds=deeds)
+
+    rep = client.simulate_get(f"/boot/{serder.pre}")
+    assert rep.status_code == 200
+    assert rep.json["done"] is True
+    assert rep.json["error"]["code"] == 400
+    assert serder.pre not in agency.agents
+    assert agency.adb.agnt.get(keys=(serder.pre,)) is None
+
+
+def test_agency_keystore_pool(helpers):
+    agency = agenting.Agency(name="agency", bran=None, temp=True, keystorePool=1)
+    doist = doing.Doist(limit=1.0, tock=0.03125, real=True)
+    deeds = doist.enter(doers=[agency])
+
+    doist.recur(deeds=deeds)
+    assert agency.keystores.stats()["depth"] == 1
+    keystore = agency.keystores.keystores[0]
+
+    salter = core.Salter(raw=b"0123456789abcdef")
+    agent = agency.create(
+        "ELI7pg979AdhmvrjDeam2eAO2SR5niCgnjAJXJHtVose", salt=salter.qb64
+    )
+    assert agent.hby.ks is keystore.ks
+    assert agent.hby.db is keystore.db
+    assert agency.keystores.hits == 1
+
+    # Refilled in the background
+    doist.recur(deeds=deeds)
+    assert agency.keystores.stats()["depth"] == 1
+
+    app = falcon.App()
+    client = testing.TestClient(app)
+    app.add_route("/metrics", agenting.MetricsEnd(agency))
+
+    rep = client.simulate_get("/metrics")
+    assert rep.status_code == 200
+    assert rep.json["keystores"]["depth"] == 1
+    assert rep.json["keystores"]["hits"] == 1
+
+
+def test_agency_release_timeouts(helpers):
+    agency = agenting.Agency(name="agency", bran=None, temp=True)
+    doist = doing.Doist(limit=1.0, tock=0.03125, real=True)
+    doist.enter(doers=[agency])
+    assert agency.releaseTimeout == 86400
+
+    archived = "EAmhrcHz9Df7Ze3kPUGyYpqbGWMUKP2ZdP1YaxBbHKc7"
+    agency.releaseTimeouts = dict(
+        classes=dict(archive=300), tenants={archived: "archive"}
+    )
+    assert agency.releaseTimeoutFor(archived) == 300
+    assert agency.releaseTimeoutFor(helpers.controllerAID) == 86400
+
+    now = [0.0]
+    agency.idle.clock = lambda: now[0]
+
+    salter = core.Salter(raw=b"0123456789abcdef")
+    agency.create(archived, salt=salter.qb64)
+    agency.create("ELI7pg979AdhmvrjDeam2eAO2SR5niCgnjAJXJHtVose", salt=salter.qb64)
+    assert len(agency.idle) == 2
+
+    releaser = agenting.Releaser(agency)
+    dog = releaser.recur()
+
+    now[0] = 301.0
+    next(dog)
+    assert archived not in agency.agents
+    assert "ELI7pg979AdhmvrjDeam2eAO2SR5niCgnjAJXJHtVose" in agency.agents
+    assert len(agency.idle) == 1
+
+
+def test_agency_max_agents(helpers):
+    agency = agenting.Agency(name="agency", bran=None, temp=True, maxAgents=1)
+    doist = doing.Doist(limit=1.0, tock=0.03125, real=True)
+    doist.enter(doers=[agency])
+
+    salter = core.Salter(raw=b"0123456789abcdef")
+    first = agency.create(
+        "ELI7pg979AdhmvrjDeam2eAO2SR5niCgnjAJXJHtVose", salt=salter.qb64
+    )
+    assert len(agency.agents) == 1
+
+    second = agency.create(
+        "EAmhrcHz9Df7Ze3kPUGyYpqbGWMUKP2ZdP1YaxBbHKc7", salt=salter.qb64
+    )
+    assert len(agency.agents) == 1
+    assert first.caid not in agency.agents
+    assert agency.get(second.caid) is second
+    assert first.hby.db.opened is False
+
+    app = falcon.App()
+    client = testing.TestClient(app)
+    app.add_route("/metrics", agenting.MetricsEnd(agency))
+
+    rep = client.simulate_get("/metrics")
+    assert rep.status_code == 200
+    assert rep.json["agents"]["size"] == 1
+    assert rep.json["agents"]["maxAgents"] == 1
+    assert rep.json["agents"]["hits"] == 1
+    assert rep.json["agents"]["evictions"] == 1
+    assert rep.json["views"] == 0
+
+
+def test_escrower(helpers):
+    with helpers.openKeria() as (agency, agent, app, client):
+        escrower = agent.escrower
+        assert escrower in agent.doers
+
+        escrows = {escrow.name: escrow for escrow in escrower.escrows}
+        for name in ("kevery", "revery", "exchanger", "credentialer"):
+            assert escrows[name].tracked
+
+        # Escrows waiting on in-memory witness cues are never skipped
+        assert not escrows["registrar"].tracked
+
+        # TEL and credential escrows also watch the KEL database for their anchors
+        for name in ("regery", "verifier"):
+            assert escrows[name].deps == [agent.hby.db]
+
+        # Empty escrows are skipped
+        escrower.recur(tyme=0.0)
+        for escrow in escrower.escrows:
+            if escrow.tracked:
+                assert escrow.runs == 0
+                assert escrow.skips == 1
+
+        reger = agent.rgy.reger
+
+        # Escrows with a sub database missing from keripy are always processed
+        assert agenting.Escrow.subdbs(reger, "cmse", "missing") is None
+        partial = agenting.Escrow(
+            "partial", lambda: None, agenting.Escrow.subdbs(reger, "cmse", "missing")
+        )
+        assert not partial.tracked
+        escrower.escrows = [partial]
+        escrower.recur(tyme=0.5)
+        assert partial.runs == 1
+        assert partial.skips == 0
+
+        calls = []
+        escrow = agenting.Escrow(
+            "test", lambda: calls.append(1), agenting.Escrow.subdbs(reger, "cmse")
+        )
+        escrower.escrows = [escrow]
+        escrower.maxBackoff = 0.1
+        sdb = escrow.dbs[0][1]
+        reger.putVal(sdb, b"first", b"waiting")
+        assert escrow.size() == 1
+
+        # No progress backs off
+        escrower.recur(tyme=1.0)
+        assert len(calls) == 1
+        assert escrow.backoff == escrower.backoff
+
+        escrower.recur(tyme=1.01)
+        assert len(calls) == 1
+        assert escrow.deferrals == 1
+
+        escrower.recur(tyme=1.05)
+        assert len(calls) == 2
+        assert escrow.backoff == escrower.backoff * 2
+
+        # New input is processed right away
+        reger.putVal(sdb, b"second", b"waiting")
+        escrower.recur(tyme=1.06)
+        assert len(calls) == 3
+        assert escrow.entries == 2
+
+        escrower.recur(tyme=2.0)
+        escrower.recur(tyme=3.0)
+        assert escrow.backoff == 0.1
+
+        # Writes to an environment the escrow depends on are new input too
+        escrow.deps = [agent.hby.db]
+        escrower.recur(tyme=3.2)
+        assert len(calls) == 6
+        escrower.recur(tyme=3.25)
+        assert len(calls) == 6
+        agent.hby.db.putVal(agent.hby.db.evts, b"other", b"event")
+        escrower.recur(tyme=3.26)
+        assert len(calls) == 7
+        escrow.deps = []
+
+        # Emptied escrows are skipped and stop backing off
+        reger.delVal(sdb, b"first")
+        reger.delVal(sdb, b"second")
+        escrower.recur(tyme=4.0)
+        assert len(calls) == 7
+        assert escrow.skips == 1
+        assert escrow.backoff == 0.0
+
+        assert escrower.stats()["test"]["runs"] == 7
+
+        # Disabling the backoff processes every escrow every time
+        escrower.maxBackoff = 0.0
+        escrower.recur(tyme=5.0)
+        assert len(calls) == 8
+
+
 def test_protected_boot_ends(helpers):
     credentials = [
         dict(bran=b"0123456789aaaaaaghija", username="user", password="secret"),
@@ -939,13 +1384,14 @@ def test_query_ends(helpers):
 
 
 class MockServerTls:
-    def __init__(self, certify, keypath, certpath, cafilepath, port):
-        pass
+    def __init__(self, certify, keypath, certpath, cafilepath, port, host=""):
+        self.host = host
 
 
 class MockHttpServer:
-    def __init__(self, port, app, servant=None):
+    def __init__(self, port, app, servant=None, host=""):
         self.servant = servant
+        self.host = host
 
 
 def test_createHttpServer(monkeypatch):
@@ -954,6 +1400,11 @@ def test_createHttpServer(monkeypatch):
     server = httping.createHttpServer(port, app)
     assert isinstance(server, http.Server)
 
+    server = httping.createHttpServer(port, app, host="127.0.0.1")
+    assert server.reopen()
+    assert server.servant.ss.getsockname() == ("127.0.0.1", port)
+    server.close()
+
     monkeypatch.setattr(hio.core.tcp, "ServerTls", MockServerTls)
     monkeypatch.setattr(hio.core.http, "Server", MockHttpServer)
 
@@ -964,6 +1415,17 @@ def test_createHttpServer(monkeypatch):
     assert isinstance(server, MockHttpServer)
     assert isinstance(server.servant, MockServerTls)
 
+    server = httping.createHttpServer(
+        port,
+        app,
+        keypath="keypath",
+        certpath="certpath",
+        cafilepath="cafilepath",
+        host="127.0.0.1",
+    )
+    assert server.host == "127.0.0.1"
+    assert server.servant.host == "127.0.0.1"
+
 
 def test_seeker_doer(helpers):
     with helpers.openKeria() as (agency, agent, app, client):
@@ -1081,6 +1081,8 @@ def test_identifier_collection_end(helpers):
         app.add_route("/identifiers/{name}/events", resend)
         eventsEnd = agenting.KeyEventCollectionEnd()
         app.add_route("/events", eventsEnd)
+        statesEnd = agenting.KeyStateCollectionEnd()
+        app.add_route("/states", statesEnd)
 
         client = testing.TestClient(app)
 
@@ -1168,6 +1170,33 @@ def test_identifier_collection_end(helpers):
         assert len(events) == 2
         assert events[1]["ked"] == serder.ked
 
+        # Unchanged resources are answered with a 304 for their current ETag
+        etag = res.headers["ETag"]
+        res = client.simulate_get(
+            path=f"/events?pre={pre}", headers={"If-None-Match": etag}
+        )
+        assert res.status_code == 304
+        assert res.content == b""
+        res = client.simulate_get(
+            path=f"/events?pre={pre}",
+            headers={"If-None-Match": etag, "Accept": "application/cesr"},
+        )
+        assert res.status_code == 200
+        res = client.simulate_get(path=f"/states?pre={pre}")
+        assert res.status_code == 200
+        stag = res.headers["ETag"]
+        res = client.simulate_get(
+            path=f"/states?pre={pre}", headers={"If-None-Match": stag}
+        )
+        assert res.status_code == 304
+        res = client.simulate_get(path="/identifiers/randy1")
+        assert res.status_code == 200
+        itag = res.headers["ETag"]
+        res = client.simulate_get(
+            path="/identifiers/randy1", headers={"If-None-Match": itag}
+        )
+        assert res.status_code == 304
+
         serder = eventing.interact(pre=pre, dig=serder.said, sn=len(events), data=[pre])
         sigers = [signer.sign(ser=serder.raw, index=0).qb64 for signer in signers]
         body = {"ixn": serder.ked, "sigs": sigers}
@@ -1182,6 +1211,89 @@ def test_identifier_collection_end(helpers):
         events = res.json
         assert len(events) == 3
         assert events[2]["ked"] == serder.ked
+        assert res.headers["ETag"] != etag
+
+        # A new event changes the tags of the KEL, key state and identifier
+        res = client.simulate_get(
+            path=f"/events?pre={pre}", headers={"If-None-Match": etag}
+        )
+        assert res.status_code == 200
+        res = client.simulate_get(
+            path=f"/states?pre={pre}", headers={"If-None-Match": stag}
+        )
+        assert res.status_code == 200
+        assert res.json[0]["s"] == "2"
+        res = client.simulate_get(
+            path="/identifiers/randy1", headers={"If-None-Match": itag}
+        )
+        assert res.status_code == 200
+        assert res.headers["ETag"] != itag
+
+        # Page through the KEL by sequence number or first seen ordinal
+        res = client.simulate_get(path=f"/events?pre={pre}&sn=1&limit=1")
+        assert res.status_code == 200
+        assert [event["ked"]["s"] for event in res.json] == ["1"]
+        res = client.simulate_get(path=f"/events?pre={pre}&fn=2")
+        assert res.json == events[2:]
+        res = client.simulate_get(path=f"/events?pre={pre}&limit=0")
+        assert res.json == []
+
+        res = client.simulate_get(
+            path=f"/events?pre={pre}", headers={"Accept": "application/x-ndjson"}
+        )
+        assert res.status_code == 200
+        assert res.headers["Content-Type"] == "application/x-ndjson"
+        lines = res.text.splitlines()
+        assert [json.loads(line) for line in lines] == events
+
+        # The raw CESR form copies the stored event messages as they are
+        res = client.simulate_get(
+            path=f"/events?pre={pre}", headers={"Accept": "application/cesr"}
+        )
+        assert res.status_code == 200
+        assert res.headers["Content-Type"] == "application/cesr"
+        assert res.content == b"".join(agent.hby.db.clonePreIter(pre=pre))
+        res = client.simulate_get(
+            path=f"/events?pre={pre}&sn=2", headers={"Accept": "application/cesr"}
+        )
+        assert res.content == b"".join(agent.hby.db.clonePreIter(pre=pre, fn=2))
+
+        # Tiny chunks stream the same KEL
+        chunks = list(
+            agenting.KeyEventCollectionEnd.stream(
+                agent.hby.db, pre.encode("utf-8"), size=1
+            )
+        )
+        assert len(chunks) == 4
+        assert json.loads(b"".join(chunks)) == events
+
+        # A missing event fails the request before any of the body is sent, later it cuts the
+        # body short without closing the array
+        clone = agent.hby.db.cloneEvtMsg
+
+        def missing(pre, fn, dig):
+            if fn >= 2:
+                raise kering.MissingEntryError(f"missing event {fn}")
+            return clone(pre=pre, fn=fn, dig=dig)
+
+        agent.hby.db.cloneEvtMsg = missing
+        try:
+            res = client.simulate_get(path=f"/events?pre={pre}")
+            assert res.status_code == 500
+
+            chunks = []
+            with pytest.raises(kering.MissingEntryError):
+                for chunk in agenting.KeyEventCollectionEnd.stream(
+                    agent.hby.db, pre.encode("utf-8"), size=1
+                ):
+                    chunks.append(chunk)
+            assert len(chunks) == 2
+            assert not b"".join(chunks).endswith(b"]")
+        finally:
+            del agent.hby.db.cloneEvtMsg
+
+        res = client.simulate_get(path=f"/events?pre={pre}&fn=-1")
+        assert res.status_code == 400
 
         # Bad interactions
         res = client.simulate_post(
@@ -10,10 +10,11 @@ import random
 
 import pytest
 from keri.app import habbing, signing
-from keri.core import parsing
+from keri.core import coring, parsing
 from keri.peer import exchanging
 from keri.vc import protocoling
 
+from keria.core import longrunning
 from keria.db import basing
 
 QVI_SAID = "EFgnk_c08WmZGgv9_mpldibRuqFMTQN-rAgtD-TCOwbs"
@@ -127,6 +128,11 @@ def test_seeker(helpers, seeder, mockHelpingNowUTC):
             qvisaid = issuer.issueQVIvLEI("issuer", issuerHab, issueeHab.pre, LEI)
             seeker.index(qvisaid)
 
+        # The index plan of the schema is compiled once for all its credentials
+        plan = seeker.plans[QVI_SAID]
+        assert len(plan) == len(seeker.schIdx.get(keys=(QVI_SAID,)))
+        assert seeker.plan(QVI_SAID) is plan
+
         saids = seeker.find({})
         assert len(list(saids)) == 25
 
@@ -166,6 +172,20 @@ def test_seeker(helpers, seeder, mockHelpingNowUTC):
             "EF7vDsfikOf_rEX2Lc_LFQoQSSxJxUr1Xkxlj9XeMu_l",
         ]
 
+        # Pages continue after the last SAID of the previous page without skipping
+        saids = seeker.find({}, after="EF7vDsfikOf_rEX2Lc_LFQoQSSxJxUr1Xkxlj9XeMu_l")
+        saids = saids.sort(["-a-LEI"]).limit(5)
+        assert list(saids) == list(seeker.find({}).sort(["-a-LEI"]).skip(15).limit(5))
+
+        page = list(seeker.find({}).limit(10))
+        assert page == sorted(page)
+        saids = seeker.find({}, after=page[4]).limit(5)
+        assert list(saids) == page[5:]
+
+        page = list(seeker.find({"-s": QVI_SAID}).limit(10))
+        saids = seeker.find({"-s": QVI_SAID}, after=page[4]).limit(5)
+        assert list(saids) == page[5:]
+
         saids = seeker.find({"-a-LEI": {"$begins": "Q"}}).sort(["-a-LEI"])
         assert list(saids) == [
             "EJCprDNJIkHzDkMm__X1zcz65YBMtaBhjugIPXN0R2iC",
@@ -219,6 +239,45 @@ def test_seeker(helpers, seeder, mockHelpingNowUTC):
         ).sort(["-a-LEI"])
         assert list(saids) == []
 
+        # Rebuilding every index from the saved credentials restores the unindexed one
+        assert seeker.reindex(batch=7) == (len(LEIs), 0)
+        assert seeker.plans[QVI_SAID] is not plan
+        assert len(seeker.schIdx.get(keys=(QVI_SAID,))) == len(plan)
+        assert seeker.schIdx.get(keys=(LE_SAID,)) == []
+
+        saids = seeker.find({"-a-LEI": "ZUQA6QTJDNYPF3DLP9NH"})
+        assert list(saids) == [qvisaid]
+
+        saids = seeker.find({"-s": QVI_SAID}).limit(100)
+        assert len(list(saids)) == len(LEIs)
+
+        # Seekers of tenants of the shared agency store index in their own keyspace
+        store = basing.AgencyStore(name="TheAgency", reopen=True, temp=True)
+        shared, other = (
+            basing.Seeker(
+                db=issuerHby.db,
+                reger=issuer.rgy.reger,
+                reopen=True,
+                temp=True,
+                store=store,
+                tenant=tenant,
+            )
+            for tenant in ("EAAA", "EBBB")
+        )
+        assert shared.reindex(batch=7) == (len(LEIs), 0)
+        saids = shared.find({"-a-LEI": "ZUQA6QTJDNYPF3DLP9NH"})
+        assert list(saids) == [qvisaid]
+        saids = shared.find({"-s": QVI_SAID}).limit(100)
+        assert len(list(saids)) == len(LEIs)
+        assert list(other.find({"-s": QVI_SAID})) == []
+
+        shared.unindex(qvisaid)
+        assert list(shared.find({"-a-LEI": "ZUQA6QTJDNYPF3DLP9NH"})) == []
+        assert shared.reindex(batch=7) == (len(LEIs), 0)
+        saids = shared.find({"-s": QVI_SAID}).limit(100)
+        assert len(list(saids)) == len(LEIs)
+        store.close(clear=True)
+
 
 def randomLEI():
     values = "0123456789ABCDEFGHIJKLNMOPQRTUVXZY"
@@ -283,6 +342,21 @@ LEIs = [
 ]
 
 
+def test_resolver():
+    sad = dict(
+        s="EFgnk", a=dict(LEI="OKB9487U4IDOG92KVVFN", n=dict(x=1)), e=[dict(d="E0")]
+    )
+
+    resolve = basing.resolver(coring.Pather(path=["a", "LEI"]).qb64)
+    assert resolve(sad) == "OKB9487U4IDOG92KVVFN"
+    assert resolve(sad) == "OKB9487U4IDOG92KVVFN"
+    assert basing.resolver(basing.SCHEMA_FIELD.qb64)(sad) == "EFgnk"
+    assert basing.resolver(coring.Pather(path=["e", "0", "d"]).qb64)(sad) == "E0"
+
+    with pytest.raises(KeyError):
+        resolve(dict(a=dict()))
+
+
 def test_exnseeker(helpers, seeder, mockHelpingNowUTC):
     salt = b"0123456789abcdef"
 
@@ -387,3 +461,91 @@ def test_exnseeker(helpers, seeder, mockHelpingNowUTC):
 
         saids = seeker.find({"-a-i": {"$eq": issueeHab.pre}})
         assert list(saids) == [grant.said, apply.said]
+
+
+def test_agency_store():
+    store = basing.AgencyStore(name="TheAgency", reopen=True, temp=True)
+
+    first = longrunning.Operator(name="a", temp=True, store=store, tenant="EAAA")
+    second = longrunning.Operator(name="b", temp=True, store=store, tenant="EBBB")
+    assert first.env is store.env
+    assert second.env is store.env
+
+    op = longrunning.Op(oid="oid", type="oobi", start="now", metadata={})
+    first.ops.pin(keys=("oobi.oid",), val=op)
+    assert first.ops.get(keys=("oobi.oid",)) == op
+    assert second.ops.get(keys=("oobi.oid",)) is None
+
+    second.ops.pin(keys=("oobi.oid",), val=op)
+    second.ops.pin(keys=("oobi.other",), val=op)
+    assert store.count("EAAA") == 1
+    assert store.count("EBBB") == 2
+
+    # Tenants share the named sub databases, each only seeing its own keys
+    names = basing.subdbNames(store.env)
+    assert [name for name, _ in names] == [b"opr.", b"opre.", b"oprp.", b"oprs."]
+    assert [keys for keys, _ in first.ops.getItemIter()] == [("oobi", "oid")]
+    assert first.ops.cntAll() == 1
+    assert list(first.find(type="oobi")) == ["oobi.oid"]
+    assert list(second.find()) == ["oobi.oid", "oobi.other"]
+
+    third = longrunning.Operator(name="d", temp=True, store=store, tenant="EDDD")
+    assert basing.subdbNames(store.env) == names
+    third.close(clear=True)
+
+    # Closing a tenant store leaves the shared environment open
+    second.close()
+    assert second.env is None
+    assert store.env is not None
+    assert first.ops.get(keys=("oobi.oid",)) == op
+
+    # Clearing a tenant store deletes only its keys
+    first.close(clear=True)
+    assert store.count("EAAA") == 0
+    assert store.count("EBBB") == 2
+
+    # Migrate from a dedicated environment
+    with pytest.raises(ValueError):
+        longrunning.Operator(name="c", temp=True, store=store)
+
+    dedicated = longrunning.Operator(name="c", temp=True)
+    dedicated.ops.pin(keys=("oobi.oid",), val=op)
+    assert store.migrate("ECCC", dedicated) == 1
+    dedicated.close(clear=True)
+
+    third = longrunning.Operator(name="c", temp=True, store=store, tenant="ECCC")
+    assert third.ops.get(keys=("oobi.oid",)) == op
+
+    store.close(clear=True)
+
+
+def test_routing_index():
+    caid = "EK35JRNdfVkO4JwhXaSTdV4qzB_ibk_tGJmSVcY4pZqx"
+    agent = "EI7AkI40M11MS7lkTCb10JC9-nDt-tXwQh44OHAFlv_9"
+    managed = [
+        "EHgwVwQT15OJvilVvW57HE4w0-GPs_Stj2OFoAHZSysY",
+        "EAmhrcHz9Df7Ze3kPUGyYpqbGWMUKP2ZdP1YaxBbHKc7",
+    ]
+
+    adb = basing.AgencyBaser(name="agency", temp=True, reopen=True)
+    adb.ctrl.pin(keys=(agent,), val=coring.Prefixer(qb64=caid))
+    for pre in managed:
+        adb.aids.pin(keys=(pre,), val=coring.Prefixer(qb64=caid))
+
+    routes = basing.RoutingIndex(adb)
+    assert len(routes) == 3
+    assert routes.route(agent) == caid
+    assert routes.route(managed[0]) == caid
+    assert routes.route(caid) is None
+
+    # All the AIDs of an agent share one controller AID string
+    assert routes.route(managed[0]) is routes.route(managed[1])
+
+    routes.add("ELI7pg979AdhmvrjDeam2eAO2SR5niCgnjAJXJHtVose", caid)
+    assert "ELI7pg979AdhmvrjDeam2eAO2SR5niCgnjAJXJHtVose" in routes
+    routes.remove(agent)
+    routes.remove(agent)
+    assert routes.route(agent) is None
+    assert len(routes) == 3
+
+    adb.close(clear=True)
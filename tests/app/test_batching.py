@@ -0,0 +1,138 @@
+# -*- encoding: utf-8 -*-
+"""
+KERIA
+keria.app.batching module
+
+Testing the batched admin request endpoint
+"""
+
+import base64
+import threading
+
+from keria.app import batching, notifying
+from keria.core import offloading
+
+
+def test_load_ends(helpers):
+    with helpers.openKeria() as (agency, agent, app, client):
+        batching.loadEnds(app=app)
+
+        (end, *_) = app._router.find("/batch")
+        assert isinstance(end, batching.BatchEnd)
+
+
+def test_batch(helpers):
+    with helpers.openKeria() as (agency, agent, app, client):
+        notifying.loadEnds(app=app)
+        batching.loadEnds(app=app)
+
+        assert agent.notifier.add(attrs=dict(a=1)) is True
+        assert agent.notifier.add(attrs=dict(a=2)) is True
+        notes = client.simulate_get(path="/notifications").json
+        said = notes[0]["i"]
+
+        body = dict(
+            requests=[
+                dict(path="/notifications", headers={"Range": "notes=0-0"}),
+                dict(method="PUT", path=f"/notifications/{said}"),
+                dict(path="/notifications"),
+                dict(method="DELETE", path="/notifications/unknown"),
+                dict(path="/missing"),
+            ]
+        )
+        res = client.simulate_post(path="/batch", json=body)
+        assert res.status_code == 200
+        responses = res.json["responses"]
+        assert len(responses) == 5
+
+        assert responses[0]["status"] == 200
+        assert responses[0]["headers"]["content-range"] == "notes 0-0/2"
+        assert [note["a"] for note in responses[0]["body"]] == [dict(a=1)]
+
+        # Sub-requests run in order so the read sees the earlier write
+        assert responses[1]["status"] == 202
+        assert responses[2]["status"] == 200
+        assert responses[2]["body"][0]["r"] is True
+        assert responses[2]["body"][1]["r"] is False
+
+        assert responses[3]["status"] == 404
+        assert responses[3]["body"] == "no notification to delete for unknown"
+        assert responses[4]["status"] == 404
+        assert responses[4]["body"]["description"] == "/missing not found"
+
+        res = client.simulate_post(path="/batch", json=dict())
+        assert res.status_code == 400
+
+        res = client.simulate_post(path="/batch", json=dict(requests=dict()))
+        assert res.status_code == 400
+
+        res = client.simulate_post(
+            path="/batch", json=dict(requests=[dict(method="GET")])
+        )
+        assert res.status_code == 400
+
+        res = client.simulate_post(
+            path="/batch", json=dict(requests=[dict(path="/batch")])
+        )
+        assert res.status_code == 400
+        assert res.json["description"] == "batches can not be nested"
+
+        # Percent encoded paths are routed decoded, so are nested batches too
+        for path in ("/%62atch", "/%62%61tch/?a=1"):
+            res = client.simulate_post(
+                path="/batch", json=dict(requests=[dict(method="POST", path=path)])
+            )
+            assert res.status_code == 400
+            assert res.json["description"] == "batches can not be nested"
+
+        requests = [dict(path="/notifications")] * (batching.BatchEnd.MaxRequests + 1)
+        res = client.simulate_post(path="/batch", json=dict(requests=requests))
+        assert res.status_code == 400
+
+
+class Reads:
+    """Offloadable read and binary responders batched in the tests"""
+
+    def __init__(self):
+        self.threads = []
+
+    @offloading.offload("reads")
+    def on_get(self, req, rep, name):
+        self.threads.append(threading.current_thread().name)
+        rep.media = dict(name=name)
+
+    @staticmethod
+    def on_post(req, rep, name):
+        rep.content_type = "application/octet-stream"
+        rep.data = b"\xff\x00" + name.encode("utf-8")
+
+
+def test_batch_offloaded_and_binary(helpers):
+    with helpers.openKeria() as (agency, agent, app, client):
+        batching.loadEnds(app=app)
+        reads = Reads()
+        app.add_route("/reads/{name}", reads)
+
+        offloader = agency.offloader
+        agency.offloader = offloading.Offloader(workers=1, limits=dict(reads=1))
+        try:
+            # More offloadable reads than the route limit all complete, run inline in the batch
+            requests = [dict(path=f"/reads/{i}") for i in range(5)]
+            requests.append(dict(method="POST", path="/reads/bin"))
+            res = client.simulate_post(path="/batch", json=dict(requests=requests))
+            assert res.status_code == 200
+            responses = res.json["responses"]
+            assert [sub["status"] for sub in responses] == [200] * 6
+            assert [sub["body"] for sub in responses[:5]] == [
+                dict(name=str(i)) for i in range(5)
+            ]
+            assert not any(name.startswith("keria-read") for name in reads.threads)
+            assert agency.offloader.refused == 0
+            assert "encoding" not in responses[0]
+
+            # Bodies that are not UTF-8 text are base64 encoded
+            assert responses[5]["encoding"] == "base64"
+            assert base64.b64decode(responses[5]["body"]) == b"\xff\x00bin"
+        finally:
+            agency.offloader.close()
+            agency.offloader = offloader
@@ -209,6 +209,15 @@ def test_registry_end(helpers, seeder):
             "title": "404 Not Found",
         }
 
+        # Registry state is served with an ETag for conditional requests
+        result = client.simulate_get(path="/identifiers/test/registries/test")
+        assert result.status == falcon.HTTP_200
+        etag = result.headers["ETag"]
+        result = client.simulate_get(
+            path="/identifiers/test/registries/test", headers={"If-None-Match": etag}
+        )
+        assert result.status == falcon.HTTP_304
+
         # Try with bad identifier name
         body = b'{"name": "new-name"}'
         result = client.simulate_put(
@@ -226,6 +235,14 @@ def test_registry_end(helpers, seeder):
         assert result.status == falcon.HTTP_200
         regk = result.json["regk"]
 
+        # The renamed registry has a new ETag
+        result = client.simulate_get(
+            path="/identifiers/test/registries/new-name",
+            headers={"If-None-Match": etag},
+        )
+        assert result.status == falcon.HTTP_200
+        assert result.headers["ETag"] != etag
+
         # Try to rename a the now used name
         result = client.simulate_put(
             path="/identifiers/test/registries/new-name", body=b"{}"
@@ -579,6 +596,14 @@ def test_credentialing_ends(helpers, seeder):
         res = client.simulate_get(f"/credentials/{saids[0]}", headers=headers)
         assert res.status_code == 200
         assert res.headers["content-type"] == "application/json+cesr"
+        stream = res.content
+
+        # The raw CESR form is the same stream of stored messages
+        headers = {"Accept": "application/cesr"}
+        res = client.simulate_get(f"/credentials/{saids[0]}", headers=headers)
+        assert res.status_code == 200
+        assert res.headers["content-type"] == "application/cesr"
+        assert res.content == stream
 
         res = client.simulate_get(f"/registries/{registry.regk}/{saids[0]}")
         assert res.status_code == 200
@@ -0,0 +1,230 @@
+# -*- encoding: utf-8 -*-
+"""
+KERIA
+keria.app.serving module
+
+Testing the idle-aware run loop
+"""
+
+import selectors
+import socket
+import threading
+import time
+
+from hio.base import doing
+from hio.core.http import clienting
+
+from keria.app import serving
+
+
+def test_waker():
+    waker = serving.Waker()
+    assert not waker.pending
+
+    # Waking before anything waits on the waker is only a flag
+    waker.wake()
+    assert waker.pending
+    assert waker._rsock is None
+
+    # Pending wakeups are readable once the socket pair is opened
+    waker.fileno()
+    assert waker._rsock.recv(16) == b"\x00"
+    waker.drain()
+    assert not waker.pending
+
+    # Repeated wakeups write a single byte until drained
+    waker.wake()
+    waker.wake()
+    assert waker._rsock.recv(16) == b"\x00"
+    waker.drain()
+
+    deck = serving.WakingDeck(waker=waker)
+    deck.push(dict(msg="cue"))
+    assert waker.pending
+    assert deck.pull() == dict(msg="cue")
+    waker.drain()
+    deck.extend([1, 2])
+    assert waker.pending
+    assert len(deck) == 2
+
+    waker.close()
+    assert waker._rsock is None
+
+
+class Server:
+    """Stands in for a hio HTTP server with a listen socket and no connections"""
+
+    def __init__(self, ss):
+        self.servant = type("Servant", (), dict(ss=ss, ixes=dict()))()
+        self.reps = dict()
+
+
+def test_idle_doist():
+    waker = serving.Waker()
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    server = Server(ss=listener)
+    doist = serving.IdleDoist(
+        waker=waker, servers=[server], idle=5.0, linger=0.0, tock=0.03125, real=True
+    )
+
+    try:
+        assert doist.sockets() == [listener]
+        assert not doist.busy()
+
+        # Idle waits time out without activity
+        start = time.monotonic()
+        assert not doist.wait(0.05)
+        assert time.monotonic() - start >= 0.04
+
+        # A wakeup from another thread ends the wait right away
+        timer = threading.Timer(0.05, waker.wake)
+        timer.start()
+        start = time.monotonic()
+        assert doist.wait(5.0)
+        assert time.monotonic() - start < 1.0
+        waker.drain()
+
+        # An incoming connection ends the wait right away
+        client = socket.create_connection(listener.getsockname())
+        assert doist.wait(5.0)
+        client.close()
+
+        server.reps["rep"] = object()
+        assert doist.busy()
+        server.reps.clear()
+
+        # Streams waiting on events are woken by the waker instead of keeping the loop cycling
+        iterator = type("Events", (), dict(waiting=True))()
+        server.reps["rep"] = type(
+            "Responder", (), dict(ended=False, iterator=iterator)
+        )()
+        assert not doist.busy()
+        iterator.waiting = False
+        assert doist.busy()
+        server.reps.clear()
+
+        # Runs doers to completion, waking on work queued by another doer instead of cycling
+        deck = serving.WakingDeck(waker=waker)
+        seen = []
+
+        def producer(tymth=None, tock=0.0, **opts):
+            yield tock
+            deck.push("work")
+            return True
+
+        def consumer(tymth=None, tock=0.0, **opts):
+            while not seen:
+                if msg := deck.pull(emptive=True):
+                    seen.append(msg)
+                yield tock
+            return True
+
+        doist.idle = 0.1
+        start = time.monotonic()
+        doist.do(doers=[doing.doify(producer), doing.doify(consumer)], limit=5.0)
+        assert seen == ["work"]
+        assert doist.done
+        assert time.monotonic() - start < 1.0
+    finally:
+        listener.close()
+        waker.close()
+
+
+def test_idle_doist_selector():
+    waker = serving.Waker()
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    server = Server(ss=listener)
+    doist = serving.IdleDoist(
+        waker=waker, servers=[server], idle=0.05, linger=0.0, tock=0.01, real=True
+    )
+    walks = []
+    clients = doist.clients
+    doist.clients = lambda: walks.append(1) or clients()
+
+    conn = None
+    try:
+        doist.enter(doers=[])
+        assert not doist.wait(0.01)
+        selector = doist.selector
+        assert doist.watched == {listener: selectors.EVENT_READ}
+
+        # Connections are registered and unregistered on the same selector as they come and go
+        client = socket.create_connection(listener.getsockname())
+        conn, _ = listener.accept()
+        server.servant.ixes["conn"] = type("Remoter", (), dict(cs=conn))()
+        assert not doist.wait(0.01, clients=False)
+        assert doist.selector is selector
+        assert set(doist.watched) == {listener, conn}
+
+        del server.servant.ixes["conn"]
+        conn.close()
+        client.close()
+        assert not doist.wait(0.01, clients=False)
+        assert doist.watched == {listener: selectors.EVENT_READ}
+        assert len(selector.get_map()) == 2
+
+        # The doer tree is only walked for outbound clients before idle waits
+        walks.clear()
+        doist.active = time.monotonic()
+        doist.linger = 5.0
+        doist.recur()
+        assert walks == []
+        doist.linger = 0.0
+        doist.recur()
+        assert walks == [1]
+    finally:
+        doist.exit()
+        assert doist.selector is None
+        listener.close()
+        waker.close()
+
+
+def test_idle_doist_clients():
+    waker = serving.Waker()
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    host, port = listener.getsockname()
+    doist = serving.IdleDoist(
+        waker=waker, idle=5.0, linger=0.0, tock=0.03125, real=True
+    )
+
+    client = clienting.Client(hostname=host, port=port)
+    doist.doers = [doing.DoDoer(doers=[clienting.ClientDoer(client=client)])]
+    conn = None
+    try:
+        doist.enter()
+        assert doist.clients() == []
+
+        # Writable while connecting and sending the request
+        client.request(method="GET", path="/")
+        assert doist.clients() == [(client.connector.cs, selectors.EVENT_WRITE)]
+        while client.requests or client.connector.txbs:
+            client.service()
+        conn, _ = listener.accept()
+
+        # Readable only while awaiting the response
+        assert doist.clients() == [(client.connector.cs, selectors.EVENT_READ)]
+
+        # The response ends an idle wait right away
+        response = b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok"
+        timer = threading.Timer(0.05, conn.sendall, args=(response,))
+        timer.start()
+        start = time.monotonic()
+        assert doist.wait(5.0)
+        assert time.monotonic() - start < 1.0
+
+        while not client.responses:
+            client.service()
+        assert client.responses.popleft()["body"] == bytearray(b"ok")
+        assert doist.clients() == []
+    finally:
+        doist.exit()
+        if conn is not None:
+            conn.close()
+        listener.close()
+        waker.close()
@@ -0,0 +1,90 @@
+# -*- encoding: utf-8 -*-
+"""
+KERIA
+keria.app.sharding module
+
+Testing the sharded multi-process Agency routing
+"""
+
+import json
+
+import pytest
+from keri.core import coring
+
+from keria.app import agenting, sharding
+from keria.db import basing
+
+CAIDS = [
+    "EK35JRNdfVkO4JwhXaSTdV4qzB_ibk_tGJmSVcY4pZqx",
+    "ELI7pg979AdhmvrjDeam2eAO2SR5niCgnjAJXJHtVose",
+    "EAmhrcHz9Df7Ze3kPUGyYpqbGWMUKP2ZdP1YaxBbHKc7",
+]
+
+
+def test_shard_ring():
+    with pytest.raises(ValueError):
+        sharding.ShardRing(0)
+
+    ring = sharding.ShardRing(4)
+    keys = [f"E{idx:043d}" for idx in range(2000)]
+    owners = [ring.shard(key) for key in keys]
+
+    # Deterministic across instances, so every process agrees on the owner
+    assert owners == [sharding.ShardRing(4).shard(key) for key in keys]
+
+    counts = ring.assign(keys)
+    assert sum(counts) == len(keys)
+    assert min(counts) > 200
+
+    # Adding a worker only moves keys to the new worker
+    grown = sharding.ShardRing(5)
+    for key, owner in zip(keys, owners):
+        assert grown.shard(key) in (owner, 4)
+
+
+def test_worker_config():
+    config = agenting.KERIAServerConfig(
+        keyPath="key.pem", certPath="cert.pem", workers=3
+    )
+    worker = sharding.workerConfig(config, 1)
+    assert worker.adminPort == config.adminPort + 20
+    assert worker.bootPort == config.bootPort + 20
+    assert worker.httpPort == config.httpPort + 20
+    assert worker.keyPath is None
+    assert worker.certPath is None
+    assert worker.workers == 1
+    assert config.host == ""
+    assert worker.host == "127.0.0.1"
+
+    # Worker servers only accept connections from the front router on the same host
+    servers = agenting.setupServers(agency=None, config=worker)
+    assert [server.host for server in servers] == ["127.0.0.1"] * 3
+
+
+def test_router():
+    adb = basing.AgencyBaser(name="TheAgency", reopen=True, temp=True)
+    ring = sharding.ShardRing(3)
+    router = sharding.Router(ring=ring, adb=adb)
+
+    caid = CAIDS[0]
+    agent = CAIDS[1]
+    managed = CAIDS[2]
+    adb.ctrl.pin(keys=(agent,), val=coring.Prefixer(qb64=caid))
+    adb.aids.pin(keys=(managed,), val=coring.Prefixer(qb64=caid))
+
+    shard = ring.shard(caid)
+    assert router.resolve("GET", "/identifiers", {"Signify-Resource": caid}) == shard
+    assert router.resolve("POST", "/", {"CESR-DESTINATION": managed}) == shard
+    assert router.resolve("PUT", "/", {"CESR-DESTINATION": agent}) == shard
+    assert router.resolve("GET", f"/oobi/{managed}/agent/{agent}", {}) == shard
+    assert router.resolve("GET", f"/oobi/{agent}", {}) == shard
+
+    body = json.dumps(dict(icp=dict(i=caid))).encode("utf-8")
+    assert router.resolve("POST", "/boot", {}, body) == shard
+    assert router.resolve("GET", f"/boot/{caid}", {}) == shard
+
+    # No tenant goes to the first worker
+    assert router.resolve("GET", "/health", {}) == 0
+    assert router.resolve("POST", "/boot", {}, b"not json") == 0
+
+    adb.close(clear=True)
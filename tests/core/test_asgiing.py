@@ -0,0 +1,173 @@
+# -*- encoding: utf-8 -*-
+"""
+KERIA
+keria.core.asgiing module
+
+Testing the asyncio server mode
+"""
+
+import asyncio
+
+import falcon
+from hio.base import doing
+
+from keria.core import asgiing
+
+
+class Echo:
+    def on_get(self, req, rep, name):
+        rep.set_header("X-Name", name)
+        rep.media = dict(name=name, q=req.params.get("q"))
+
+    def on_post(self, req, rep, name):
+        rep.status = falcon.HTTP_201
+        rep.media = dict(name=name, body=req.get_media())
+
+
+class Stream:
+    def on_get(self, req, rep):
+        def chunks():
+            yield b""
+            yield b"first,"
+            yield b""
+            yield b"second"
+
+        rep.content_type = "text/plain"
+        rep.stream = chunks()
+
+
+def app():
+    app = falcon.App()
+    app.add_route("/echo/{name}", Echo())
+    app.add_route("/stream", Stream())
+    return app
+
+
+async def read(reader):
+    """Reads one response with a content length or chunked body"""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    headers = {
+        name.lower(): value.strip()
+        for name, _, value in (line.partition(":") for line in lines[1:] if line)
+    }
+    if headers.get("transfer-encoding") == "chunked":
+        body = bytearray()
+        while size := int(await reader.readline(), 16):
+            body.extend(await reader.readexactly(size))
+            await reader.readline()
+        await reader.readline()
+        return status, headers, bytes(body)
+    return status, headers, await reader.readexactly(int(headers["content-length"]))
+
+
+def test_asgi_server():
+    async def run():
+        server = asgiing.AsgiServer(
+            app=asgiing.WsgiAsgi(app()), host="127.0.0.1", port=0
+        )
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+
+            # Pipelined requests are answered in order on the kept alive connection
+            writer.write(
+                b"GET /echo/one?q=a HTTP/1.1\r\nHost: localhost\r\n\r\n"
+                b"POST /echo/two HTTP/1.1\r\nHost: localhost\r\n"
+                b"Content-Type: application/json\r\nContent-Length: 7\r\n\r\n[1, 2]\n"
+            )
+            status, headers, body = await read(reader)
+            assert status == 200
+            assert headers["x-name"] == "one"
+            assert body == b'{"name": "one", "q": "a"}'
+
+            status, headers, body = await read(reader)
+            assert status == 201
+            assert body == b'{"name": "two", "body": [1, 2]}'
+
+            # Bodies yielding empty chunks are streamed chunked once they have content
+            writer.write(b"GET /stream HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            status, headers, body = await read(reader)
+            assert status == 200
+            assert body == b"first,second"
+
+            writer.write(b"GET /missing HTTP/1.1\r\nConnection: close\r\n\r\n")
+            status, headers, body = await read(reader)
+            assert status == 404
+            assert headers["connection"] == "close"
+            assert await reader.read() == b""
+            writer.close()
+
+            assert server.requests == 4
+        finally:
+            await server.close()
+
+    asyncio.run(run())
+
+
+def test_asgi_server_limits():
+    async def run():
+        server = asgiing.AsgiServer(
+            app=asgiing.WsgiAsgi(app()), host="127.0.0.1", port=0, timeout=0.1
+        )
+        await server.start()
+        try:
+            # Requests with both a content length and a chunked transfer coding are refused
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            writer.write(
+                b"POST /echo/two HTTP/1.1\r\nHost: localhost\r\n"
+                b"Content-Length: 7\r\nTransfer-Encoding: chunked\r\n\r\n"
+                b"7\r\n[1, 2]\n\r\n0\r\n\r\n"
+            )
+            status, headers, body = await read(reader)
+            assert status == 400
+            assert await reader.read() == b""
+            writer.close()
+
+            # Headers and bodies sent too slowly time out
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            writer.write(b"GET /echo/one HTTP/1.1\r\nHost: localhost\r\n")
+            status, headers, body = await asyncio.wait_for(read(reader), 5.0)
+            assert status == 408
+            assert await reader.read() == b""
+            writer.close()
+
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            writer.write(
+                b"POST /echo/two HTTP/1.1\r\nHost: localhost\r\n"
+                b"Content-Length: 7\r\n\r\n[1"
+            )
+            status, headers, body = await asyncio.wait_for(read(reader), 5.0)
+            assert status == 408
+            assert await reader.read() == b""
+            writer.close()
+
+            assert server.requests == 0
+        finally:
+            await server.close()
+
+    asyncio.run(run())
+
+
+def test_run_doist():
+    cycles = []
+
+    def counter(tymth=None, tock=0.0, **opts):
+        while len(cycles) < 3:
+            cycles.append(tymth())
+            yield tock
+        return True
+
+    async def run():
+        server = asgiing.AsgiServer(
+            app=asgiing.WsgiAsgi(app()), host="127.0.0.1", port=0
+        )
+        doist = doing.Doist(tock=0.01, real=True, doers=[doing.doify(counter)])
+        await asgiing.serve(doist, [server])
+        assert doist.done
+        assert server.server is None
+
+    asyncio.run(run())
+    assert len(cycles) == 3
+    assert cycles[0] <= cycles[1] < cycles[2]
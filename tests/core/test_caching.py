@@ -0,0 +1,156 @@
+# -*- encoding: utf-8 -*-
+"""
+KERIA
+keria.core.caching module
+
+Testing the bounded agent cache
+"""
+
+from dataclasses import dataclass
+
+from keri.db import dbing
+
+from keria.core import caching
+
+
+@dataclass
+class Resident:
+    caid: str
+    cost: int = 10
+
+
+def test_agent_cache_lru():
+    evicted = []
+    cache = caching.AgentCache(
+        maxAgents=2, evict=evicted.append, cost=lambda agent: agent.cost
+    )
+
+    a, b, c = Resident("a"), Resident("b"), Resident("c")
+    cache["a"] = a
+    cache["b"] = b
+    assert len(cache) == 2
+    assert cache.memory == 20
+
+    assert cache.lookup("a") is a
+    assert cache.lookup("z") is None
+    assert list(cache) == ["b", "a"]
+    assert cache.oldest() is b
+
+    # b is least recently used
+    cache["c"] = c
+    assert evicted == [b]
+    assert list(cache) == ["a", "c"]
+    assert cache.memory == 20
+
+    del cache["a"]
+    assert "a" not in cache
+    assert cache.pop("a") is None
+    assert cache.memory == 10
+
+    assert cache.stats() == dict(
+        size=1,
+        maxAgents=2,
+        memory=10,
+        maxMemory=0,
+        hits=1,
+        misses=1,
+        evictions=1,
+    )
+
+
+def test_agent_cache_memory_budget():
+    evicted = []
+    cache = caching.AgentCache(
+        maxMemory=100, evict=evicted.append, cost=lambda agent: agent.cost
+    )
+
+    cache["a"] = Resident("a", cost=40)
+    cache["b"] = Resident("b", cost=40)
+    cache["c"] = Resident("c", cost=40)
+    assert [agent.caid for agent in evicted] == ["a"]
+    assert cache.memory == 80
+
+    # Never evicts the agent just loaded even if it alone is over budget
+    cache["d"] = Resident("d", cost=500)
+    assert [agent.caid for agent in evicted] == ["a", "b", "c"]
+    assert list(cache) == ["d"]
+    assert cache.evictions == 3
+
+    # Replacing an entry updates its cost
+    cache["d"] = Resident("d", cost=5)
+    assert cache.memory == 5
+    assert len(cache) == 1
+
+
+def test_agent_cache_pinned():
+    evicted = []
+    pins = {"a"}
+    cache = caching.AgentCache(
+        maxAgents=2,
+        evict=evicted.append,
+        cost=lambda agent: agent.cost,
+        pinned=lambda caid: caid in pins,
+    )
+
+    cache["a"] = Resident("a")
+    cache["b"] = Resident("b")
+    cache["c"] = Resident("c")
+    assert [agent.caid for agent in evicted] == ["b"]
+    assert list(cache) == ["a", "c"]
+
+    # Stays over its bounds rather than evict a pinned agent
+    pins.add("c")
+    cache["d"] = Resident("d")
+    assert [agent.caid for agent in evicted] == ["b"]
+    assert list(cache) == ["a", "c", "d"]
+
+    pins.clear()
+    cache["e"] = Resident("e")
+    assert [agent.caid for agent in evicted] == ["b", "a", "c"]
+    assert list(cache) == ["d", "e"]
+
+
+def test_footprint():
+    with dbing.openLMDB(name="test-footprint") as dber:
+        size = caching.footprint([dber, None])
+        assert size > 0
+        assert size % dber.env.stat()["psize"] == 0
+
+    # Closed environments are skipped
+    assert caching.footprint([dber]) == 0
+
+
+def test_idle_timer():
+    now = [0.0]
+    timer = caching.IdleTimer(timeout=10.0, clock=lambda: now[0])
+
+    timer.track("a")
+    timer.track("b", timeout=5.0)
+    timer.track("c")
+    assert len(timer) == 3
+    assert timer.expired() == []
+
+    now[0] = 4.0
+    timer.touch("b")
+    timer.touch("c")
+    timer.discard("a")
+
+    # b was touched so its deadline moved out, a is no longer tracked
+    now[0] = 8.0
+    assert timer.expired() == []
+    now[0] = 9.0
+    assert timer.expired() == ["b"]
+    assert "b" not in timer
+
+    now[0] = 13.0
+    assert timer.expired() == []
+    now[0] = 14.0
+    assert timer.expired() == ["c"]
+    assert len(timer) == 0
+
+    # Tracking again replaces the previous deadline
+    timer.track("d", timeout=1.0)
+    timer.track("d", timeout=100.0)
+    now[0] = 20.0
+    assert timer.expired() == []
+    assert "d" in timer
@@ -0,0 +1,180 @@
+# -*- encoding: utf-8 -*-
+"""
+KERIA
+keria.core.compressing module
+
+Testing response compression negotiation
+"""
+
+import gzip
+import json
+from concurrent.futures import Future
+
+import falcon
+from falcon import testing
+
+from keria.core import compressing, offloading
+from keria.core.authing import AuthMode
+
+
+class Records:
+    def on_get(self, req, rep):
+        rep.etag = "abc"
+        rep.media = [dict(d=f"E{i:043d}", s=i) for i in range(100)]
+
+
+class Small:
+    def on_get(self, req, rep):
+        rep.media = dict(ok=True)
+
+
+class Stream:
+    def on_get(self, req, rep):
+        def chunks():
+            yield b""
+            yield b'{"first": 1}\n' * 100
+            yield b'{"second": 2}\n' * 100
+
+        rep.content_type = "application/x-ndjson"
+        rep.stream = chunks()
+
+
+class Wrapped:
+    def on_get(self, req, rep):
+        req.context.mode = AuthMode.ESSR
+        rep.content_type = "application/octet-stream"
+        rep.data = b"\x00" * 2048
+
+
+def app():
+    app = falcon.App(middleware=[compressing.CompressionMiddleware(minSize=256)])
+    app.add_route("/records", Records())
+    app.add_route("/small", Small())
+    app.add_route("/stream", Stream())
+    app.add_route("/wrapped", Wrapped())
+    return app
+
+
+def test_negotiate():
+    assert compressing.negotiate(None) is None
+    assert compressing.negotiate("") is None
+    assert compressing.negotiate("gzip") == "gzip"
+    assert compressing.negotiate("deflate, gzip;q=0.5") == "gzip"
+    assert compressing.negotiate("gzip;q=0") is None
+    assert compressing.negotiate("*") == compressing.codings()[0]
+    assert compressing.negotiate("*, gzip;q=0") == (
+        "zstd" if compressing.zstandard is not None else None
+    )
+    assert compressing.negotiate("identity") is None
+
+
+def test_compression_middleware():
+    client = testing.TestClient(app())
+
+    res = client.simulate_get("/records")
+    assert res.status_code == 200
+    assert "Content-Encoding" not in res.headers
+    assert res.headers["Vary"] == "Accept-Encoding"
+    records = res.json
+
+    res = client.simulate_get("/records", headers={"Accept-Encoding": "gzip"})
+    assert res.headers["Content-Encoding"] == "gzip"
+    assert res.headers["ETag"] == 'W/"abc"'
+    assert int(res.headers["Content-Length"]) == len(res.content)
+    assert len(res.content) < len(json.dumps(records))
+    assert json.loads(gzip.decompress(res.content)) == records
+
+    # Bodies under the threshold are sent as they are
+    res = client.simulate_get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in res.headers
+    assert res.json == dict(ok=True)
+
+    # Streamed bodies are compressed chunk by chunk
+    res = client.simulate_get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert res.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(res.content) == b'{"first": 1}\n' * 100 + (
+        b'{"second": 2}\n' * 100
+    )
+
+    # ESSR responses are never compressed
+    res = client.simulate_get("/wrapped", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in res.headers
+    assert res.content == b"\x00" * 2048
+
+
+def test_compressed_stream_attributes():
+    class Body:
+        _status = "503 Service Unavailable"
+        _headers = {"retry-after": "1"}
+
+        def __init__(self):
+            self.closed = False
+
+        def __iter__(self):
+            return iter([b"", b"x" * 1000])
+
+        def close(self):
+            self.closed = True
+
+    body = Body()
+    stream = compressing.Compressed(body, compressing.compressor("gzip", -1))
+    assert stream._status == "503 Service Unavailable"
+    assert stream._headers == {"retry-after": "1"}
+    chunks = list(stream)
+    assert chunks[0] == b""
+    assert gzip.decompress(b"".join(chunks)) == b"x" * 1000
+    stream.close()
+    assert body.closed
+
+
+def test_compressed_deferred():
+    middleware = compressing.CompressionMiddleware(minSize=256)
+
+    def deferred(handler):
+        """Returns the request and response of an offloaded handler run after the middleware"""
+        req = testing.create_req(headers={"Accept-Encoding": "gzip"})
+        rep = falcon.Response()
+        inner = falcon.Response()
+        future = Future()
+        rep.stream = offloading.Deferred(future, inner)
+        middleware.process_response(req, rep, None, True)
+        assert rep.get_header("Content-Encoding") is None
+        assert rep.get_header("Vary") == "Accept-Encoding"
+
+        stream = rep.stream
+        assert next(stream) == b""
+        assert "content-encoding" not in stream._headers
+
+        handler(inner)
+        future.set_result(None)
+        return stream
+
+    def records(rep):
+        rep.etag = "abc"
+        rep.media = [dict(d=f"E{i:043d}", s=i) for i in range(100)]
+
+    stream = deferred(records)
+    body = b"".join(stream)
+    assert stream._status == "200 OK"
+    assert stream._headers["content-encoding"] == "gzip"
+    assert stream._headers["etag"] == 'W/"abc"'
+    assert json.loads(gzip.decompress(body))[0]["s"] == 0
+
+    # Not modified and incompressible responses of the handler are sent as they are
+    def unchanged(rep):
+        rep.etag = "abc"
+        rep.status = falcon.HTTP_304
+
+    stream = deferred(unchanged)
+    assert b"".join(stream) == b""
+    assert stream._status == "304 Not Modified"
+    assert "content-encoding" not in stream._headers
+    assert stream._headers["etag"] == '"abc"'
+
+    def binary(rep):
+        rep.content_type = "application/octet-stream"
+        rep.data = b"\x00" * 2048
+
+    stream = deferred(binary)
+    assert b"".join(stream) == b"\x00" * 2048
+    assert "content-encoding" not in stream._headers
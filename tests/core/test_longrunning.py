@@ -1,9 +1,19 @@
+import json
+import socket
+import time
+
+from hio.core import http
 from keri.help import helping
 
+import falcon
 import pytest
-from keria.app import aiding
+from falcon import testing
+from keri.app.oobiing import Result
+from keri.db import basing
+from keria.app import agenting, aiding
 from keri.kering import ValidationError
 from keria.core import longrunning
+from keria.core.authing import AuthMode
 
 
 def test_operations(helpers):
@@ -477,3 +487,358 @@ def test_error(helpers):
             "title": "long running operation "
             "'query.EBfdlu8R27Fbx-ehrqwImnK-8Cm79sqbAQ4MmvEAYqao' not found"
         }
+
+
+def test_operation_events(helpers):
+    with helpers.openKeria() as (agency, agent, app, client):
+        url = "http://127.0.0.1:5642/oobi/EBfdlu8R27Fbx-ehrqwImnK-8Cm79sqbAQ4MmvEAYqao"
+        op = agent.monitor.submit("1", longrunning.OpTypes.oobi, dict(oobi=url))
+        assert op.done is False
+
+        req = testing.create_req(path="/operations/events")
+        req.context.agent = agent
+        rep = falcon.Response()
+        longrunning.OperationEventsEnd.on_get(req, rep)
+        assert rep.content_type == "text/event-stream"
+        events = rep.stream
+        assert agent.monitor.subscribers == [events.deck]
+
+        # Current states come first
+        head = next(events).decode("utf-8")
+        assert head.startswith("retry: 3000\n\n")
+        assert f'"name": "{op.name}"' in head
+        assert next(events) == b""
+        assert events.waiting
+
+        assert agent.monitor.watch(0.0) == []
+        assert list(agent.monitor.pending) == [op.name]
+        assert agent.monitor.watch(1.0) == []  # nothing written since
+
+        # Resolving the OOBI completes the operation on the next watch
+        agent.hby.db.roobi.pin(
+            keys=(url,), val=basing.OobiRecord(state=Result.resolved)
+        )
+        (done,) = agent.monitor.watch(1.0)
+        assert done.name == op.name
+        assert agent.monitor.pending == {}
+        assert not events.waiting
+        event = next(events).decode("utf-8")
+        assert event.startswith(f"id: {agent.monitor.sn}\nevent: operation\ndata: ")
+        data = json.loads(event.splitlines()[2][len("data: ") :])
+        assert data["name"] == op.name
+        assert data["done"] is True
+        assert data["response"] == dict(oobi=url)
+
+        # New operations are pushed as they are submitted
+        agent.monitor.submit("2", longrunning.OpTypes.done, dict(response={}))
+        assert '"name": "done.2"' in next(events).decode("utf-8")
+
+        # Type filtered streams skip other operations
+        filtered = longrunning.OperationEvents(
+            monitor=agent.monitor, deck=agent.monitor.subscribe(), type="oobi"
+        )
+        agent.monitor.submit("3", longrunning.OpTypes.done, dict(response={}))
+        assert next(filtered) == b""
+        filtered.close()
+        assert '"name": "done.3"' in next(events).decode("utf-8")
+
+        # Keep-alive comments keep idle streams open
+        events.keepalive = 0.0
+        assert next(events) == b": keep-alive\n\n"
+
+        # Agent shutdown ends the stream, closing it unsubscribes
+        agent.monitor.close()
+        with pytest.raises(StopIteration):
+            next(events)
+        events.close()
+        assert agent.monitor.subscribers == []
+        assert agent.monitor.watch(2.0) == []
+        assert agent.monitor.pending is None
+
+        req.context.mode = AuthMode.ESSR
+        with pytest.raises(falcon.HTTPBadRequest):
+            longrunning.OperationEventsEnd.on_get(req, falcon.Response())
+
+
+class Events:
+    """Operation event stream endpoint of agent without authentication"""
+
+    def __init__(self, agent):
+        self.agent = agent
+
+    def on_get(self, req, rep):
+        req.context.agent = self.agent
+        longrunning.OperationEventsEnd.on_get(req, rep)
+
+
+def test_operation_events_disconnect(helpers, monkeypatch):
+    monkeypatch.setattr(longrunning.OperationEvents, "KeepAlive", 0.05)
+    with helpers.openKeria() as (agency, agent, app, client):
+        monitor = agent.monitor
+        app.add_route("/operations/events", Events(agent))
+        server = http.Server(host="127.0.0.1", port=5649, app=app)
+        assert server.reopen()
+        sock = socket.create_connection(("127.0.0.1", 5649))
+        try:
+            sock.sendall(b"GET /operations/events HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            sock.settimeout(0.01)
+            received = b""
+            while b"retry: 3000" not in received:
+                server.service()
+                try:
+                    received += sock.recv(4096)
+                except socket.timeout:
+                    pass
+            (deck,) = monitor.subscribers
+
+            # Read every cycle while the client is connected
+            end = time.monotonic() + 0.3
+            while time.monotonic() < end:
+                server.service()
+                monitor.watch(0.0)
+            assert monitor.subscribers == [deck]
+
+            # The server drops the stream of a disconnected client without closing it
+            sock.close()
+            end = time.monotonic() + 0.3
+            while time.monotonic() < end:
+                server.service()
+            assert monitor.subscribers == [deck]
+            assert monitor.watch(1.0) == []
+            assert monitor.subscribers == []
+            assert list(deck) == [None]
+            assert monitor.pending is None
+        finally:
+            sock.close()
+            server.close()
+
+
+def test_operation_frozen(helpers):
+    with helpers.openKeria() as (agency, agent, app, client):
+        url = "http://127.0.0.1:5642/oobi/EBfdlu8R27Fbx-ehrqwImnK-8Cm79sqbAQ4MmvEAYqao"
+        op = agent.monitor.submit("1", longrunning.OpTypes.oobi, dict(oobi=url))
+        assert op.done is False
+        assert agent.monitor.opr.ops.get(keys=(op.name,)).result is None
+
+        agent.hby.db.roobi.pin(
+            keys=(url,), val=basing.OobiRecord(state=Result.resolved)
+        )
+        op = agent.monitor.get(op.name)
+        assert op.done is True
+        assert agent.monitor.opr.ops.get(keys=(op.name,)).result == dict(
+            response=dict(oobi=url)
+        )
+
+        # Done operations are never checked again
+        agent.hby.db.roobi.pin(keys=(url,), val=basing.OobiRecord(state=Result.failed))
+        (listed,) = agent.monitor.getOperations(type="oobi")
+        assert listed == op
+        assert isinstance(listed, longrunning.CompletedOperation)
+
+        # Operations done on submit are frozen when stored
+        done = agent.monitor.submit(
+            "2", longrunning.OpTypes.done, dict(response=dict(d="x"))
+        )
+        assert agent.monitor.opr.ops.get(keys=(done.name,)).result == dict(
+            response=dict(d="x")
+        )
+
+        failed = agent.monitor.submit("3", longrunning.OpTypes.boot)
+        assert failed.done is True
+        stored = agent.monitor.opr.ops.get(keys=(failed.name,))
+        assert stored.result == dict(error=failed.error.to_dict())
+        assert agent.monitor.get(failed.name) == failed
+
+        # Resubmitting resets the operation
+        op = agent.monitor.submit("1", longrunning.OpTypes.oobi, dict(oobi=url))
+        assert op.done is True
+        assert op.error.code == 500
+
+
+def test_operation_collect(helpers):
+    with helpers.openKeria() as (agency, agent, app, client):
+        monitor = agent.monitor
+        url = "http://127.0.0.1:5642/oobi/EBfdlu8R27Fbx-ehrqwImnK-8Cm79sqbAQ4MmvEAYqao"
+        monitor.submit("1", longrunning.OpTypes.done, dict(response={}))
+        monitor.submit("2", longrunning.OpTypes.done, dict(response={}))
+        monitor.submit("3", longrunning.OpTypes.oobi, dict(oobi=url))
+        assert len(list(monitor.opr.ends.getItemIter())) == 2
+
+        assert monitor.collect(ttl=3600) == 0
+        assert monitor.collect(ttl=0, limit=1) == 1
+        assert [op.name for op in monitor.getOperations()] == ["done.2", "oobi.3"]
+
+        # Pending operations are only collected once done
+        collector = agenting.OperationCollector(monitor=monitor, ttl=0, interval=60.0)
+        collector.recur(tyme=0.0)
+        assert collector.reclaimed == 1
+        assert collector.expired == 0
+        assert [op.name for op in monitor.getOperations()] == ["oobi.3"]
+
+        agent.hby.db.roobi.pin(
+            keys=(url,), val=basing.OobiRecord(state=Result.resolved)
+        )
+        assert monitor.get("oobi.3").done is True
+        collector.recur(tyme=30.0)
+        assert collector.reclaimed == 1
+        collector.recur(tyme=60.0)
+        assert collector.reclaimed == 2
+        assert monitor.getOperations() == []
+
+        # Stale index entries of operations submitted again or deleted are dropped
+        monitor.submit("4", longrunning.OpTypes.done, dict(response={}))
+        monitor.submit("4", longrunning.OpTypes.done, dict(response={}))
+        monitor.submit("5", longrunning.OpTypes.done, dict(response={}))
+        monitor.rem("done.5")
+        assert len(list(monitor.opr.ends.getItemIter())) == 3
+        assert monitor.collect(ttl=0) == 1
+        assert list(monitor.opr.ends.getItemIter()) == []
+        assert monitor.getOperations() == []
+
+
+def test_operation_expire(helpers):
+    with helpers.openKeria() as (agency, agent, app, client):
+        monitor = agent.monitor
+        for i in range(3):
+            op = longrunning.Op(
+                oid=f"{i}",
+                type=longrunning.OpTypes.oobi,
+                start="2025-01-01T00:00:00.000000+00:00"
+                if i < 2
+                else helping.nowIso8601(),
+                metadata=dict(oobi=f"http://127.0.0.1:5642/oobi/{i}"),
+            )
+            monitor.opr.ops.pin(keys=(f"oobi.{i}",), val=op)
+            monitor.opr.index(f"oobi.{i}", op)
+
+        deck = monitor.subscribe()
+        assert monitor.watch(tyme=0.0) == []
+        assert [name for _, name in monitor.opr.starts.getItemIter()] == [
+            "oobi.0",
+            "oobi.1",
+            "oobi.2",
+        ]
+
+        # Pending operations never time out unless enabled
+        collector = agenting.OperationCollector(monitor=monitor, ttl=3600)
+        collector.recur(tyme=0.0)
+        assert collector.expired == 0
+        assert len(list(monitor.opr.find(state="pending"))) == 3
+
+        # Stale pending operations found done are frozen, those still pending time out
+        agent.hby.db.roobi.pin(
+            keys=("http://127.0.0.1:5642/oobi/0",),
+            val=basing.OobiRecord(state=Result.resolved),
+        )
+        collector = agenting.OperationCollector(
+            monitor=monitor, ttl=3600, pendingTtl=3600, interval=60.0
+        )
+        collector.recur(tyme=0.0)
+        assert collector.expired == 1
+        assert collector.reclaimed == 0
+        assert list(monitor.opr.find(state="pending")) == ["oobi.2"]
+        assert list(monitor.opr.find(state="done")) == ["oobi.0", "oobi.1"]
+
+        assert monitor.get("oobi.0").done is True
+        assert monitor.get("oobi.0").response is not None
+        failed = monitor.get("oobi.1")
+        assert failed.done is True
+        assert failed.error.code == 408
+        assert [operation.name for _, operation in deck] == ["oobi.0", "oobi.1"]
+        assert list(monitor.pending) == ["oobi.2"]
+        assert [name for _, name in monitor.opr.starts.getItemIter()] == ["oobi.2"]
+
+        # Timed out operations are collected a time to live after they were failed
+        assert monitor.collect(ttl=0) == 2
+        assert [op.name for op in monitor.getOperations()] == ["oobi.2"]
+
+
+def test_operation_listing(helpers):
+    with helpers.openKeria() as (agency, agent, app, client):
+        app.add_route("/operations", longrunning.OperationCollectionEnd())
+        monitor = agent.monitor
+
+        starts = [
+            "2025-01-01T00:00:00.000000+00:00",
+            "2025-01-01T01:00:00.000000+00:00",
+            "2025-01-01T02:00:00.000000+00:00",
+        ]
+        for i, start in enumerate(starts):
+            op = longrunning.Op(
+                oid=f"{i}",
+                type=longrunning.OpTypes.oobi,
+                start=start,
+                metadata=dict(oobi=f"http://127.0.0.1:5642/oobi/{i}"),
+            )
+            monitor.opr.ops.pin(keys=(f"oobi.{i}",), val=op)
+            monitor.opr.index(f"oobi.{i}", op)
+        monitor.submit("3", longrunning.OpTypes.done, dict(response={}))
+
+        assert list(monitor.opr.find()) == ["done.3", "oobi.0", "oobi.1", "oobi.2"]
+        assert list(monitor.opr.find(type="done")) == ["done.3"]
+        assert list(monitor.opr.find(state="pending")) == ["oobi.0", "oobi.1", "oobi.2"]
+        assert list(
+            monitor.opr.find(type="oobi", state="pending", since=starts[1])
+        ) == ["oobi.1", "oobi.2"]
+        assert list(monitor.opr.find(since=starts[2])) == ["oobi.2", "done.3"]
+        assert monitor.count(state="pending") == 3
+
+        res = client.simulate_get(path="/operations", params=dict(state="done"))
+        assert res.status_code == 200
+        assert [op["name"] for op in res.json] == ["done.3"]
+
+        # Pending operations found done move to the done operations
+        agent.hby.db.roobi.pin(
+            keys=("http://127.0.0.1:5642/oobi/1",),
+            val=basing.OobiRecord(state=Result.resolved),
+        )
+        res = client.simulate_get(path="/operations", params=dict(state="pending"))
+        assert [op["name"] for op in res.json] == ["oobi.0", "oobi.2"]
+        res = client.simulate_get(path="/operations", params=dict(state="done"))
+        assert [op["name"] for op in res.json] == ["done.3", "oobi.1"]
+
+        # Pending operations found done are moved before paging and counting
+        agent.hby.db.roobi.pin(
+            keys=("http://127.0.0.1:5642/oobi/0",),
+            val=basing.OobiRecord(state=Result.resolved),
+        )
+        assert monitor.count(state="pending") == 1
+        res = client.simulate_get(
+            path="/operations",
+            params=dict(state="pending"),
+            headers={"Range": "operations=0-0"},
+        )
+        assert [op["name"] for op in res.json] == ["oobi.2"]
+        assert res.headers["Content-Range"] == "operations 0-0/1"
+        res = client.simulate_get(path="/operations", params=dict(state="done"))
+        assert [op["name"] for op in res.json] == ["done.3", "oobi.0", "oobi.1"]
+
+        res = client.simulate_get(
+            path="/operations",
+            params=dict(state="pending", since="2025-01-01T02:30:00+01:00"),
+        )
+        assert [op["name"] for op in res.json] == ["oobi.2"]
+
+        res = client.simulate_get(
+            path="/operations", headers={"Range": "operations=1-2"}
+        )
+        assert res.status_code == 206
+        assert [op["name"] for op in res.json] == ["oobi.0", "oobi.1"]
+        assert res.headers["Accept-Ranges"] == "operations"
+        assert res.headers["Content-Range"] == "operations 1-2/4"
+
+        res = client.simulate_get(path="/operations", params=dict(state="running"))
+        assert res.status_code == 400
+        res = client.simulate_get(path="/operations", params=dict(since="yesterday"))
+        assert res.status_code == 400
+
+        # Removed and resubmitted operations are reindexed
+        monitor.rem("oobi.0")
+        monitor.submit(
+            "2",
+            longrunning.OpTypes.oobi,
+            dict(oobi="http://127.0.0.1:5642/oobi/2"),
+        )
+        assert list(monitor.opr.find(state="pending")) == ["oobi.2"]
+        assert list(monitor.opr.find(state="pending", since=starts[2])) == ["oobi.2"]
+        assert len(list(monitor.opr.stas.getItemIter())) == 3
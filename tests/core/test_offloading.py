@@ -0,0 +1,136 @@
+# -*- encoding: utf-8 -*-
+"""
+KERIA
+keria.core.offloading module
+
+Testing running read-only handlers on the offloader thread pool
+"""
+
+import threading
+from types import SimpleNamespace
+
+import falcon
+import pytest
+from falcon import testing
+
+from keria.core import offloading
+
+
+class Events:
+    """Offloaded responders of the test app"""
+
+    def __init__(self):
+        self.threads = []
+        self.gate = threading.Event()
+
+    @offloading.offload("events")
+    def on_get(self, req, rep, pre):
+        self.threads.append(threading.current_thread().name)
+        self.gate.wait(5.0)
+        if pre == "missing":
+            raise falcon.HTTPNotFound(description=f"{pre} not found")
+
+        rep.status = falcon.HTTP_202
+        rep.set_header("X-Pre", pre)
+        rep.media = dict(pre=pre)
+
+    @staticmethod
+    @offloading.offload("export")
+    def on_post(req, rep, pre):
+        rep.content_type = "application/json+cesr"
+        rep.data = pre.encode("utf-8")
+
+
+class Agency:
+    """Stands in for the agency holding the offloader and the pins of offloaded requests"""
+
+    def __init__(self, offloader):
+        self.offloader = offloader
+        self.pins = []
+
+    def pin(self, caid):
+        self.pins.append(caid)
+
+    def unpin(self, caid):
+        self.pins.remove(caid)
+
+
+class Context:
+    def __init__(self, offloader):
+        self.agent = SimpleNamespace(caid="EAbc", agency=Agency(offloader))
+
+    def process_request(self, req, rep):
+        req.context.agent = self.agent
+
+
+def test_offloader():
+    offloader = offloading.Offloader(workers=2, limits=dict(events=1))
+    events = Events()
+    app = falcon.App(middleware=[Context(offloader)])
+    app.add_route("/events/{pre}", events)
+
+    try:
+        client = testing.TestClient(app)
+        events.gate.set()
+        rep = client.simulate_get("/events/EAbc")
+        assert rep.json == dict(pre="EAbc")
+        assert events.threads[0].startswith("keria-read")
+
+        rep = client.simulate_post("/events/EAbc")
+        assert rep.text == "EAbc"
+        assert offloader.offloaded == 2
+
+        # The status and headers of the handler are sent from the body iterator
+        events.gate.clear()
+        rep = falcon.Response()
+        req = testing.create_req(path="/events/EAbc")
+        req.context.agent = Context(offloader).agent
+        events.on_get(req, rep, pre="EAbc")
+        deferred = rep.stream
+        assert isinstance(deferred, offloading.Deferred)
+        assert next(deferred) == b""
+        agency = req.context.agent.agency
+        assert agency.pins == ["EAbc"]
+
+        # Routes at their limit are refused until a request finishes
+        other = falcon.Response()
+        with pytest.raises(falcon.HTTPServiceUnavailable) as ex:
+            events.on_get(req, other, pre="EAbc")
+        assert ex.value.headers["Retry-After"] == "1"
+        assert offloader.refused == 1
+        assert agency.pins == ["EAbc"]
+
+        events.gate.set()
+        deferred.future.result()
+        assert next(deferred) == b'{"pre": "EAbc"}'
+        # The agent stays pinned until the body has been sent
+        assert agency.pins == ["EAbc"]
+        with pytest.raises(StopIteration):
+            next(deferred)
+        assert agency.pins == []
+        deferred.close()
+        assert agency.pins == []
+        assert deferred._status == "202 Accepted"
+        assert deferred._headers["x-pre"] == "EAbc"
+        assert deferred._headers["content-type"] == falcon.MEDIA_JSON
+
+        # Errors raised by the handler become the response
+        rep = falcon.Response()
+        events.on_get(req, rep, pre="missing")
+        chunks = [chunk for chunk in rep.stream if chunk]
+        assert rep.stream._status == "404 Not Found"
+        assert b"missing not found" in chunks[0]
+
+        assert offloader.stats() == dict(workers=2, offloaded=4, refused=1)
+    finally:
+        events.gate.set()
+        offloader.close()
+
+    # Without workers responders run inline
+    inline = offloading.Offloader(workers=0)
+    rep = falcon.Response()
+    req = testing.create_req(path="/events/EAbc")
+    req.context.agent = Context(inline).agent
+    events.on_get(req, rep, pre="EAbc")
+    assert rep.media == dict(pre="EAbc")
+    assert rep.stream is None
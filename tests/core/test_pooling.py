@@ -0,0 +1,119 @@
+# -*- encoding: utf-8 -*-
+"""
+KERIA
+keria.core.pooling module
+
+Testing the warm keystore pool
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from keri.app import keeping
+from keri.db import basing
+
+from keria.core import pooling
+
+
+def test_keystore_pool():
+    pool = pooling.KeystorePool(size=2, temp=True)
+    assert pool.take() is None
+    assert pool.misses == 1
+
+    # Without an executor one keystore is created per tick
+    pool.recur()
+    assert len(pool.keystores) == 1
+    pool.recur()
+    pool.recur()
+    assert pool.stats() == dict(size=2, depth=2, refilling=0, hits=0, misses=1)
+
+    keystore = pool.take()
+    assert keystore.name.startswith(pooling.PoolPrefix)
+    assert keystore.ks.opened and keystore.db.opened
+    assert pool.hits == 1
+
+    ks, db = keystore.bind("EAmhrcHz9Df7Ze3kPUGyYpqbGWMUKP2ZdP1YaxBbHKc7")
+    assert ks is keystore.ks and db is keystore.db
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pool.executor = executor
+        pool.recur()
+        assert len(pool.futures) == 1
+        pool.futures[0].result()
+        pool.recur()
+        assert pool.stats()["depth"] == 2
+
+    pool.close()
+    assert len(pool.keystores) == 0
+    keystore.close(clear=True)
+
+
+def test_keystore_bind():
+    caid = "ELI7pg979AdhmvrjDeam2eAO2SR5niCgnjAJXJHtVose"
+    base = "test_keystore_bind"
+
+    keystore = pooling.Keystore(name=f"{pooling.PoolPrefix}bind", base=base)
+    ks = db = None
+    try:
+        pools = (keystore.ks.path, keystore.db.path)
+        assert os.path.exists(keystore.lockpath)
+        lockpath = keystore.lockpath
+        ks, db = keystore.bind(caid)
+        assert ks.opened and db.opened
+        assert ks.path == os.path.join(os.path.dirname(pools[0]), caid)
+        assert db.path == os.path.join(os.path.dirname(pools[1]), caid)
+        assert not any(os.path.exists(path) for path in pools)
+        assert not os.path.exists(lockpath)
+
+        # The keystore of an existing agent is never overwritten
+        other = pooling.Keystore(name=f"{pooling.PoolPrefix}other", base=base)
+        path = other.ks.path
+        assert other.bind(caid) is None
+        assert not other.ks.opened
+        assert not os.path.exists(path)
+    finally:
+        if ks is None:
+            keystore.close(clear=True)
+        else:
+            ks.close(clear=True)
+            db.close(clear=True)
+
+
+def test_keystore_reclaim():
+    base = "test_keystore_reclaim"
+
+    # Left behind by a previous run, a whole keystore and a Baser whose bind was interrupted
+    whole = pooling.Keystore(name=f"{pooling.PoolPrefix}whole", base=base)
+    whole.close()
+    partial = basing.Baser(name=f"{pooling.PoolPrefix}partial", base=base, reopen=True)
+    partial.close()
+    extra = pooling.Keystore(name=f"{pooling.PoolPrefix}extra", base=base)
+    extra.close()
+    # Still pooled by another running agency process
+    live = pooling.Keystore(name=f"{pooling.PoolPrefix}live", base=base)
+
+    pool = pooling.KeystorePool(size=1, base=base)
+    try:
+        pool.enter()
+        assert len(pool.keystores) == 1
+        keystore = pool.keystores[0]
+        assert keystore.name == f"{pooling.PoolPrefix}extra"
+        assert keystore.ks.opened and keystore.db.opened
+
+        kss = pooling.orphans(keeping.Keeper, base)
+        dbs = pooling.orphans(basing.Baser, base)
+        assert sorted(kss) == [
+            f"{pooling.PoolPrefix}extra",
+            f"{pooling.PoolPrefix}live",
+        ]
+        assert sorted(dbs) == sorted(kss)
+        assert live.ks.opened and live.db.opened
+
+        # A reclaimed keystore is locked by its new pool
+        assert pooling.acquire(keystore.lockpath) is None
+    finally:
+        pool.close()
+        live.close(clear=True)
+
+    assert pooling.orphans(keeping.Keeper, base) == {}
+    assert pooling.orphans(basing.Baser, base) == {}
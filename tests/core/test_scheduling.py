@@ -0,0 +1,94 @@
+# -*- encoding: utf-8 -*-
+"""
+KERIA
+keria.core.scheduling module
+
+Testing the fair scheduler
+"""
+
+import time
+
+from hio.base import doing
+
+from keria.core import scheduling
+
+
+class Busy(doing.Doer):
+    """Doer spinning for .cost seconds every time it runs"""
+
+    def __init__(self, name, cost=0.0, **kwa):
+        self.name = name
+        self.cost = cost
+        self.runs = 0
+        self.requested = None
+        super(Busy, self).__init__(**kwa)
+
+    def recur(self, tyme, tock=0.0, **opts):
+        self.runs += 1
+        end = time.perf_counter() + self.cost
+        while time.perf_counter() < end:
+            pass
+        return False
+
+
+def test_fair_scheduler_round_robin():
+    doers = [Busy(f"busy{idx}", cost=0.004) for idx in range(5)]
+    dodoer = doing.DoDoer(doers=doers)
+    doist = doing.Doist(tock=0.03125, doers=[dodoer])
+    doist.enter()
+
+    scheduler = scheduling.FairScheduler(budget=0.01, quantum=1.0)
+    for _ in range(10):
+        scheduler.cycle(dodoer, tyme=doist.tyme)
+
+    # Every doer gets its turn in spite of only ~3 fitting in each tick
+    runs = [doer.runs for doer in doers]
+    assert min(runs) > 0
+    assert max(runs) - min(runs) <= 2
+    assert scheduler.deferrals > 0
+
+    # Rotation keeps the order of the deeds
+    names = [deed[2].name for deed in dodoer.deeds]
+    assert sorted(names) == [doer.name for doer in doers]
+
+
+def test_fair_scheduler_noisy_neighbor():
+    noisy = Busy("noisy", cost=0.02)
+    quiet = [Busy(f"quiet{idx}") for idx in range(3)]
+    dodoer = doing.DoDoer(doers=[noisy, *quiet])
+    doist = doing.Doist(tock=0.03125, doers=[dodoer])
+    doist.enter()
+
+    scheduler = scheduling.FairScheduler(budget=0.05, quantum=0.005)
+    for _ in range(20):
+        scheduler.cycle(dodoer, tyme=doist.tyme)
+
+    # The noisy doer sits out ticks to pay off its debt while the quiet ones run every tick
+    assert noisy.runs < 10
+    assert all(doer.runs == 20 for doer in quiet)
+    assert scheduler.throttles > 0
+
+    # Admin requested doers run every tick regardless of credit
+    noisy.requested = time.monotonic()
+    runs = noisy.runs
+    for _ in range(5):
+        scheduler.cycle(dodoer, tyme=doist.tyme)
+    assert noisy.runs == runs + 5
+
+    assert scheduler.stats()["throttles"] == scheduler.throttles
+
+
+def test_fair_scheduler_done():
+    def once(tymth=None, tock=0.0, **opts):
+        yield tock
+        return True
+
+    doer = doing.doify(once)
+    dodoer = doing.DoDoer(doers=[doer])
+    doist = doing.Doist(tock=0.03125, doers=[dodoer])
+    doist.enter()
+
+    scheduler = scheduling.FairScheduler(budget=1.0)
+    scheduler.cycle(dodoer, tyme=doist.tyme)
+    assert len(dodoer.deeds) == 0
+    assert doer.done is True